@@ -0,0 +1,29 @@
+"""
+ASGI config for fast_health_api.
+
+Requests served through this entry point are routed to
+settings.RECIPES_ASGI_URLCONF, where the recipe read endpoints are async
+views. Run it with any ASGI server, e.g.:
+
+    WEB_CONCURRENCY=4 uvicorn fast_health_api.asgi:application
+
+Set the worker count through WEB_CONCURRENCY rather than --workers: the
+app refuses to start several workers on process-local caches
+(recipes.checks) and reads the count from there.
+"""
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fast_health_api.settings')
+
+application = get_asgi_application()
+
+from recipes.checks import require_shared_caches  # noqa: E402
+
+require_shared_caches()
+
+# Build the autocomplete index now rather than on the first keystroke
+from recipes.autocomplete import autocomplete_index  # noqa: E402
+
+autocomplete_index.warm()
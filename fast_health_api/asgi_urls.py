@@ -0,0 +1,17 @@
+from django.contrib import admin
+from django.urls import path, include
+from django.conf import settings
+from django.conf.urls.static import static
+
+from recipes import views as recipe_views
+
+# Same routes as fast_health_api.urls, with the async recipe read views
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('metrics', recipe_views.metrics, name='metrics'),
+    path('api/', include('recipes.async_urls')),
+]
+
+# Serve media files during development
+if settings.DEBUG:
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
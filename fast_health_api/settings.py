@@ -26,6 +26,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'recipes.middleware.InstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -34,6 +35,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'recipes.middleware.AsgiUrlconfMiddleware',
+    'recipes.middleware.ReadReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'fast_health_api.urls'
@@ -55,15 +58,97 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'fast_health_api.wsgi.application'
+ASGI_APPLICATION = 'fast_health_api.asgi.application'
+
+# URLconf for requests arriving through ASGI; its recipe read views are async
+RECIPES_ASGI_URLCONF = 'fast_health_api.asgi_urls'
 
 # Database
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Applied to every new SQLite connection by recipes.db.configure_sqlite.
+# WAL lets readers run alongside a writer; busy_timeout makes writers wait
+# for each other instead of failing with "database is locked".
+RECIPES_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # negative means KiB
+    'busy_timeout': 5000,
+}
+
+# Read-only replicas of the primary, refreshed with `manage.py snapshot_replicas`, e.g.
+# RECIPES_SQLITE_REPLICAS=/var/lib/recipes/replica-1.sqlite3,/var/lib/recipes/replica-2.sqlite3
+RECIPES_READ_REPLICAS = []
+for index, path in enumerate(filter(None, os.environ.get('RECIPES_SQLITE_REPLICAS', '').split(',')), 1):
+    alias = f'replica_{index}'
+    DATABASES[alias] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f'file:{path.strip()}?mode=ro',
+        'CONN_MAX_AGE': DATABASES['default']['CONN_MAX_AGE'],
+        'CONN_HEALTH_CHECKS': True,
+        'TEST': {'MIRROR': 'default'},
+    }
+    RECIPES_READ_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['recipes.db.ReadReplicaRouter']
+
+# Safe requests under these paths read from a replica when any are configured
+RECIPES_READ_REPLICA_PATHS = ['/api/']
+
+# Caches
+# Both caches are pluggable through the environment, e.g.
+# API_CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache API_CACHE_LOCATION=/var/tmp/recipes-api
+# API_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache API_CACHE_LOCATION=redis://127.0.0.1:6379
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache CACHE_LOCATION=redis://127.0.0.1:6379/1
+# 'default' holds the versions of the per-process in-memory indexes and
+# 'api' the cached responses with the catalog version that expires them.
+# With more than one worker both must be shared between the workers, or a
+# write in one would leave the others serving stale data; the
+# recipes.E001/E002 checks refuse to start otherwise.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    },
+    'api': {
+        'BACKEND': os.environ.get('API_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('API_CACHE_LOCATION', 'recipes-api'),
+    },
+}
+
+# Worker processes serving the app; WEB_CONCURRENCY also sets the worker count of gunicorn and uvicorn
+RECIPES_WORKERS = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+RECIPES_API_CACHE = 'api'
+RECIPES_API_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Meal planning runs in a bounded process pool with a per-plan time budget (seconds);
+# past MAX_PENDING queued or running plans per process, requests get a 503
+RECIPES_MEAL_PLAN_WORKERS = None  # defaults to min(4, CPU count)
+RECIPES_MEAL_PLAN_MAX_PENDING = None  # defaults to twice the workers
+RECIPES_MEAL_PLAN_TIME_BUDGET = 0.25
+RECIPES_MEAL_PLAN_QUEUE_TIMEOUT = 2.0
+
+# Requests slower than this (milliseconds) log their SQL and call stacks; unset disables the log
+RECIPES_SLOW_REQUEST_MS = int(os.environ['SLOW_REQUEST_MS']) if os.environ.get('SLOW_REQUEST_MS') else None
+
+# /metrics is only routed with DEBUG or METRICS_ENABLED=true; with METRICS_TOKEN set,
+# scrapers must also send "Authorization: Bearer <token>"
+RECIPES_METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '').lower() == 'true'
+RECIPES_METRICS_TOKEN = os.environ.get('METRICS_TOKEN') or None
+
+# Change feed: how far behind the clock it reads (seconds) and how long delete tombstones are kept (days)
+RECIPES_SYNC_SETTLE_SECONDS = 2
+RECIPES_TOMBSTONE_RETENTION_DAYS = 90
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -99,10 +184,14 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework settings
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'recipes.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
-        'django_filters.backends.DjangoFilterBackend',
+        'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
@@ -3,11 +3,17 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from recipes import views as recipe_views
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('recipes.urls')),
 ]
 
+# Request metrics name every route and its traffic, so they are opt-in outside development
+if settings.DEBUG or getattr(settings, 'RECIPES_METRICS_ENABLED', False):
+    urlpatterns.append(path('metrics', recipe_views.metrics, name='metrics'))
+
 # Serve media files during development
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
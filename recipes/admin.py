@@ -1,5 +1,17 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from .bulk import recategorize, set_featured
 from .models import Category, Ingredient, Recipe, RecipeIngredient, RecipeStep, RecipeTag, Recipe_Tag
+from .pagination import EstimatedCountPaginator
+
+
+def usage_count(model, field):
+    """Correlated COUNT of the link rows pointing at each row; only runs for the rows on the page"""
+    links = model.objects.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(n=Count('pk')).values('n')
+    return Coalesce(Subquery(links, output_field=IntegerField()), 0)
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -9,13 +21,26 @@ class CategoryAdmin(admin.ModelAdmin):
 
 @admin.register(Ingredient)
 class IngredientAdmin(admin.ModelAdmin):
-    list_display = ['name', 'emoji', 'created_at']
+    list_display = ['name', 'emoji', 'recipe_uses', 'created_at']
     search_fields = ['name']
     readonly_fields = ['created_at']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(recipe_uses=usage_count(RecipeIngredient, 'ingredient'))
+    
+    @admin.display(description='Recipes', ordering='recipe_uses')
+    def recipe_uses(self, obj):
+        return obj.recipe_uses
 
 class RecipeIngredientInline(admin.TabularInline):
     model = RecipeIngredient
     extra = 1
+    fields = ['ingredient', 'quantity', 'amount', 'unit', 'notes']
+    readonly_fields = ['amount', 'unit']
+    # A search box instead of a <select> listing every ingredient per row
+    autocomplete_fields = ['ingredient']
 
 class RecipeStepInline(admin.TabularInline):
     model = RecipeStep
@@ -24,15 +49,26 @@ class RecipeStepInline(admin.TabularInline):
 class RecipeTagInline(admin.TabularInline):
     model = Recipe_Tag
     extra = 1
+    autocomplete_fields = ['tag']
+
+class RecipeActionForm(ActionForm):
+    category = forms.ModelChoiceField(Category.objects.all(), required=False, help_text='Target of "Move to category"')
 
 @admin.register(Recipe)
 class RecipeAdmin(admin.ModelAdmin):
     list_display = ['name', 'category', 'total_time', 'difficulty', 'calories_per_serving', 'is_featured', 'created_at']
     list_filter = ['category', 'difficulty', 'is_vegetarian', 'is_vegan', 'is_gluten_free', 'is_featured']
+    list_select_related = ['category']
     search_fields = ['name', 'description']
     prepopulated_fields = {'slug': ('name',)}
     readonly_fields = ['created_at', 'updated_at']
+    autocomplete_fields = ['category']
     inlines = [RecipeIngredientInline, RecipeStepInline, RecipeTagInline]
+    # No exact COUNT(*) of the whole table on every changelist load
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    action_form = RecipeActionForm
+    actions = ['feature', 'unfeature', 'move_to_category']
     
     fieldsets = (
         ('Basic Information', {
@@ -51,8 +87,34 @@ class RecipeAdmin(admin.ModelAdmin):
             'fields': ('is_featured', 'created_at', 'updated_at')
         }),
     )
+    
+    @admin.action(description='Feature selected recipes')
+    def feature(self, request, queryset):
+        changed = set_featured(queryset, True)
+        self.message_user(request, f'{changed} recipes featured.', messages.SUCCESS)
+    
+    @admin.action(description='Unfeature selected recipes')
+    def unfeature(self, request, queryset):
+        changed = set_featured(queryset, False)
+        self.message_user(request, f'{changed} recipes unfeatured.', messages.SUCCESS)
+    
+    @admin.action(description='Move selected recipes to category')
+    def move_to_category(self, request, queryset):
+        category = Category.objects.filter(pk=request.POST.get('category') or None).first()
+        if category is None:
+            self.message_user(request, 'Pick the category to move the recipes to.', messages.ERROR)
+            return
+        changed = recategorize(queryset, category)
+        self.message_user(request, f'{changed} recipes moved to {category.name}.', messages.SUCCESS)
 
 @admin.register(RecipeTag)
 class RecipeTagAdmin(admin.ModelAdmin):
-    list_display = ['name', 'color']
-    search_fields = ['name']
\ No newline at end of file
+    list_display = ['name', 'color', 'recipe_uses']
+    search_fields = ['name']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(recipe_uses=usage_count(Recipe_Tag, 'tag'))
+    
+    @admin.display(description='Recipes', ordering='recipe_uses')
+    def recipe_uses(self, obj):
+        return obj.recipe_uses
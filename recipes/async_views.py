@@ -0,0 +1,103 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import APIException, MethodNotAllowed
+from rest_framework.views import exception_handler
+
+from .documents import astored_document, document_response
+from .models import Recipe
+from .renderers import FastJSONRenderer
+from .response_cache import cache_api_response
+from .serializers import RecipeDetailSerializer, RecipeListSerializer
+from .stats import aget_stats
+from .views import RecipeListView, sparse_queryset
+
+
+def json_response(data, status=200):
+    """Render data the way DRF's JSONRenderer answers a JSON client"""
+    response = HttpResponse(FastJSONRenderer().render(data), content_type='application/json', status=status)
+    patch_vary_headers(response, ['Accept'])
+    return response
+
+
+def async_api_view(methods):
+    """
+    Give an async view the parts of DRF's request cycle the read API relies on.
+
+    Only `methods` are served, and APIException / Http404 are turned into
+    the same JSON error bodies as the sync views. Responses are always
+    JSON; the browsable API stays on the sync views.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                if request.method not in methods:
+                    raise MethodNotAllowed(request.method)
+                response = await view_func(request, *args, **kwargs)
+            except (APIException, Http404) as exc:
+                error = exception_handler(exc, {'request': request})
+                response = json_response(error.data, status=error.status_code)
+                # Headers the handler added, such as Retry-After; not its default text/html type
+                for header, value in error.items():
+                    if header.lower() != 'content-type':
+                        response[header] = value
+            response['Allow'] = ', '.join(list(methods) + ['OPTIONS'])
+            return response
+        return wrapper
+    return decorator
+
+
+@cache_api_response
+@async_api_view(['GET', 'HEAD'])
+async def recipe_list(request):
+    """Async RecipeListView: same filters, ordering, search and pagination"""
+    view = RecipeListView(args=(), kwargs={}, format_kwarg=None)
+    view.request = view.initialize_request(request)
+
+    # Building the queryset can warm the in-memory ingredient index and
+    # probe the FTS table, so it runs off the event loop; the page itself
+    # is fetched with the async ORM
+    queryset = await sync_to_async(lambda: view.filter_queryset(view.get_queryset()))()
+    paginator = view.paginator
+    page = await paginator.apaginate_queryset(queryset, view.request, view=view)
+    context = {'request': view.request}
+    if page is None:
+        return json_response(RecipeListSerializer([obj async for obj in queryset], many=True, context=context).data)
+    data = RecipeListSerializer(page, many=True, context=context).data
+    return json_response(paginator.get_paginated_response(data).data)
+
+
+@cache_api_response
+@async_api_view(['GET', 'HEAD'])
+async def recipe_detail(request, slug):
+    """Async RecipeDetailView, serving the stored document when there is one"""
+    fields = RecipeDetailSerializer.sparse_fields(request.GET)
+    if fields is None:
+        document = await astored_document(slug)
+        if document is not None:
+            return document_response(request, *document)
+    queryset = sparse_queryset(Recipe.objects.with_detail_relations(fields), RecipeDetailSerializer, fields)
+    recipe = await queryset.filter(slug=slug).afirst()
+    if recipe is None:
+        raise Http404(f'No {Recipe._meta.object_name} matches the given query.')
+    return json_response(RecipeDetailSerializer(recipe, context={'request': request}).data)
+
+
+@cache_api_response
+@async_api_view(['GET'])
+async def recipe_stats(request):
+    """Get overall recipe statistics"""
+    return json_response(await aget_stats())
+
+
+@cache_api_response
+@async_api_view(['GET'])
+async def featured_recipes(request):
+    """Get featured recipes"""
+    fields = RecipeListSerializer.sparse_fields(request.GET)
+    queryset = sparse_queryset(Recipe.objects.with_list_relations(fields), RecipeListSerializer, fields)
+    recipes = [recipe async for recipe in queryset.filter(is_featured=True)[:8]]
+    return json_response(RecipeListSerializer(recipes, many=True, context={'request': request}).data)
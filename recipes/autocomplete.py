@@ -0,0 +1,251 @@
+import heapq
+import logging
+import unicodedata
+from bisect import bisect_left
+
+from django.db import DatabaseError
+from django.db.models import Count
+
+from .memory_index import SharedMemoryIndex
+from .models import Category, Ingredient, Recipe, RecipeTag
+
+logger = logging.getLogger(__name__)
+
+AUTOCOMPLETE_VERSION_KEY = 'recipes:autocomplete_index:version'
+
+MAX_RESULTS = 20
+
+# Prefix ranges with more keys than this answer from precomputed results
+MATERIALIZE_THRESHOLD = 256
+
+# Ranking: a match at the start of the name beats one on a later word,
+# and a featured recipe beats a newer one
+NAME_START_BONUS = 1e11
+FEATURED_BONUS = 1e10
+
+# Sorts after every character a normalized key can contain
+LAST_CHAR = '\U0010ffff'
+
+
+def normalize(value):
+    """Casefold, strip accents and collapse whitespace, so "Jalapeño  Poppers" matches "jalapeno p" """
+    value = unicodedata.normalize('NFKD', (value or '').casefold())
+    return ' '.join(''.join(char for char in value if not unicodedata.combining(char)).split())
+
+
+def word_keys(name):
+    """The name from each word start on: "quinoa stir-fry", "stir-fry", "fry" """
+    return [
+        name[index:] for index, char in enumerate(name)
+        if char.isalnum() and (index == 0 or not name[index - 1].isalnum())
+    ] or [name]
+
+
+def recipe_rows(ids=None):
+    """(pk, name, score, payload) per recipe; newer recipes score higher"""
+    queryset = Recipe.objects.all() if ids is None else Recipe.objects.filter(pk__in=ids)
+    rows = queryset.values_list('pk', 'name', 'slug', 'image', 'is_featured', 'created_at')
+    for pk, name, slug, image, is_featured, created_at in rows.iterator():
+        score = created_at.timestamp() + (FEATURED_BONUS if is_featured else 0)
+        yield pk, name, score, {'id': pk, 'name': name, 'slug': slug, 'image': image}
+
+
+def ingredient_rows(ids=None):
+    """(pk, name, score, payload) per ingredient; ingredients used by more recipes score higher"""
+    queryset = Ingredient.objects.all() if ids is None else Ingredient.objects.filter(pk__in=ids)
+    rows = queryset.annotate(uses=Count('recipeingredient')).values_list('pk', 'name', 'emoji', 'uses')
+    for pk, name, emoji, uses in rows.iterator():
+        yield pk, name, uses, {'id': pk, 'name': name, 'emoji': emoji}
+
+
+def category_rows(ids=None):
+    queryset = Category.objects.all() if ids is None else Category.objects.filter(pk__in=ids)
+    for pk, name, emoji, recipe_count in queryset.values_list('pk', 'name', 'emoji', 'recipe_count').iterator():
+        yield pk, name, recipe_count, {'id': pk, 'name': name, 'emoji': emoji}
+
+
+def tag_rows(ids=None):
+    queryset = RecipeTag.objects.all() if ids is None else RecipeTag.objects.filter(pk__in=ids)
+    rows = queryset.annotate(uses=Count('recipe_tag')).values_list('pk', 'name', 'color', 'uses')
+    for pk, name, color, uses in rows.iterator():
+        yield pk, name, uses, {'id': pk, 'name': name, 'color': color}
+
+
+# Response section -> row source
+SOURCES = {
+    'recipes': recipe_rows,
+    'ingredients': ingredient_rows,
+    'categories': category_rows,
+    'tags': tag_rows,
+}
+
+
+class PrefixTable:
+    """
+    Sorted (key, pk) pairs for one kind of name, with a rank per pair.
+
+    Every name is stored once per word start (see word_keys), so a prefix
+    query is two bisects. Small ranges are ranked on the spot; ranges
+    larger than MATERIALIZE_THRESHOLD, i.e. short prefixes and common
+    words, keep their best MAX_RESULTS entries in `tops`. Writes drop the
+    `tops` of the prefixes they touch and the next query recomputes them.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.ranks = []
+        self.entries = {}
+        self.names = {}
+        self.tops = {}
+
+    @classmethod
+    def from_rows(cls, rows):
+        table = cls()
+        pairs = []
+        for pk, name, score, payload in rows:
+            normalized = normalize(name)
+            table.entries[pk] = payload
+            table.names[pk] = normalized
+            pairs += [((key, pk), score + (NAME_START_BONUS if key == normalized else 0))
+                      for key in word_keys(normalized)]
+        pairs.sort()
+        table.keys = [pair for pair, _ in pairs]
+        table.ranks = [rank for _, rank in pairs]
+        table.warm()
+        return table
+
+    def range(self, prefix):
+        return bisect_left(self.keys, (prefix,)), bisect_left(self.keys, (prefix + LAST_CHAR,))
+
+    def add(self, pk, name, score, payload):
+        normalized = normalize(name)
+        self.entries[pk] = payload
+        self.names[pk] = normalized
+        for key in word_keys(normalized):
+            position = bisect_left(self.keys, (key, pk))
+            self.keys.insert(position, (key, pk))
+            self.ranks.insert(position, score + (NAME_START_BONUS if key == normalized else 0))
+            self._drop_tops(key)
+
+    def remove(self, pk):
+        self.entries.pop(pk, None)
+        normalized = self.names.pop(pk, None)
+        if normalized is None:
+            return
+        for key in word_keys(normalized):
+            position = bisect_left(self.keys, (key, pk))
+            if position < len(self.keys) and self.keys[position] == (key, pk):
+                del self.keys[position]
+                del self.ranks[position]
+            self._drop_tops(key)
+
+    def _drop_tops(self, key):
+        for length in range(1, len(key) + 1):
+            self.tops.pop(key[:length], None)
+
+    def best(self, lo, hi, limit):
+        """Distinct pks of the best ranked pairs in keys[lo:hi], best first"""
+        wanted = limit
+        while True:
+            positions = heapq.nlargest(wanted, range(lo, hi), key=self.ranks.__getitem__)
+            pks = list(dict.fromkeys(self.keys[position][1] for position in positions))
+            # A name matching on two of its words takes two positions
+            if len(pks) >= limit or len(positions) == hi - lo:
+                return pks[:limit]
+            wanted *= 2
+
+    def top(self, prefix, limit):
+        lo, hi = self.range(prefix)
+        if hi - lo <= MATERIALIZE_THRESHOLD:
+            return self.best(lo, hi, limit)
+        pks = self.tops.get(prefix)
+        if pks is None:
+            pks = self.tops[prefix] = self.best(lo, hi, MAX_RESULTS)
+        return pks[:limit]
+
+    def warm(self):
+        """Precompute `tops` for every prefix whose range is over the threshold"""
+        pending = ['']
+        while pending:
+            prefix = pending.pop()
+            lo, hi = self.range(prefix)
+            if hi - lo <= MATERIALIZE_THRESHOLD:
+                continue
+            if prefix:
+                self.tops[prefix] = self.best(lo, hi, MAX_RESULTS)
+            # Visit each one-character-longer prefix in the range
+            position = lo
+            while position < hi:
+                key = self.keys[position][0]
+                if len(key) == len(prefix):
+                    position += 1
+                    continue
+                child = key[:len(prefix) + 1]
+                pending.append(child)
+                position = bisect_left(self.keys, (child + LAST_CHAR,), position, hi)
+
+
+class AutocompleteIndex(SharedMemoryIndex):
+    """
+    Prefix index over recipe, ingredient, category and tag names.
+
+    Each kind has its own PrefixTable. Recipes rank by recency (featured
+    first), ingredients and tags by how many recipes use them and
+    categories by recipe_count, always after names that start with the
+    query. Signal handlers refresh single entries as rows change.
+    """
+    version_key = AUTOCOMPLETE_VERSION_KEY
+
+    def __init__(self):
+        super().__init__()
+        self._tables = {kind: PrefixTable() for kind in SOURCES}
+
+    def load(self):
+        tables = {kind: PrefixTable.from_rows(source()) for kind, source in SOURCES.items()}
+        with self._lock:
+            self._tables = tables
+
+    def warm(self):
+        """Build at worker start so the first keystroke does not pay for it"""
+        try:
+            self.ensure_built()
+        except DatabaseError:
+            logger.warning('Autocomplete index not built at startup; it will be built on first use', exc_info=True)
+
+    def refresh(self, kind, ids):
+        """Re-read the given rows of one kind; ids that no longer exist are dropped"""
+        if not self._built:
+            self._bump_version()
+            return
+        rows = {row[0]: row for row in SOURCES[kind](ids)}
+        with self._lock:
+            table = self._tables[kind]
+            for pk in ids:
+                table.remove(pk)
+                if pk in rows:
+                    table.add(*rows[pk])
+        self._bump_version()
+
+    def remove(self, kind, ids):
+        if not self._built:
+            self._bump_version()
+            return
+        with self._lock:
+            for pk in ids:
+                self._tables[kind].remove(pk)
+        self._bump_version()
+
+    def suggest(self, query, kinds=None, limit=5):
+        """Map each requested kind to the payloads of its best matches for query"""
+        self.ensure_built()
+        prefix = normalize(query)
+        kinds = kinds or list(SOURCES)
+        limit = max(1, min(limit, MAX_RESULTS))
+        with self._lock:
+            return {
+                kind: [self._tables[kind].entries[pk] for pk in self._tables[kind].top(prefix, limit)] if prefix else []
+                for kind in kinds
+            }
+
+
+autocomplete_index = AutocompleteIndex()
@@ -0,0 +1,67 @@
+from django.db import transaction
+from django.utils import timezone
+
+from . import documents, search, stats
+from .autocomplete import autocomplete_index
+from .response_cache import bump_catalog_version
+
+# Above this many recipes the autocomplete index is rebuilt rather than patched
+AUTOCOMPLETE_REFRESH_LIMIT = 1000
+
+
+def refresh_autocomplete_recipes(recipe_ids):
+    if len(recipe_ids) > AUTOCOMPLETE_REFRESH_LIMIT:
+        autocomplete_index.invalidate()
+    else:
+        autocomplete_index.refresh('recipes', recipe_ids)
+
+
+def set_featured(queryset, featured):
+    """
+    Feature or unfeature the recipes in queryset with one UPDATE.
+
+    QuerySet.update() skips the model signals, so the derived data they
+    would refresh (documents, autocomplete ranking, cached responses) is
+    refreshed here. Returns how many recipes changed.
+    """
+    with transaction.atomic():
+        changed = queryset.exclude(is_featured=featured)
+        recipe_ids = list(changed.values_list('pk', flat=True))
+        if not recipe_ids:
+            return 0
+        # updated_at carries the change to the change feed
+        changed.update(is_featured=featured, updated_at=timezone.now())
+
+        def refresh():
+            documents.build_documents(recipe_ids)
+            refresh_autocomplete_recipes(recipe_ids)
+            bump_catalog_version()
+        transaction.on_commit(refresh)
+    return len(recipe_ids)
+
+
+def recategorize(queryset, category):
+    """
+    Move the recipes in queryset to category with one UPDATE.
+
+    Besides the documents and search rows of the moved recipes, the stored
+    category counters are recounted, as the signals would have moved them
+    one recipe at a time. Returns how many recipes changed.
+    """
+    with transaction.atomic():
+        changed = queryset.exclude(category=category)
+        recipe_ids = list(changed.values_list('pk', flat=True))
+        if not recipe_ids:
+            return 0
+        category_ids = set(changed.order_by().values_list('category_id', flat=True).distinct())
+        category_ids.add(category.pk)
+        changed.update(category=category, updated_at=timezone.now())
+        stats.recount_categories()
+
+        def refresh():
+            search.index_recipes(recipe_ids)
+            documents.build_documents(recipe_ids)
+            autocomplete_index.refresh('categories', list(category_ids))
+            bump_catalog_version()
+        transaction.on_commit(refresh)
+    return len(recipe_ids)
@@ -0,0 +1,134 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .db import use_primary
+from .models import Category, Ingredient, Recipe, RecipeTag, Tombstone
+from .serializers import CategorySerializer, IngredientSerializer, RecipeListSerializer, RecipeTagSerializer
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+# Feed section -> (model, serializer, Tombstone kind); recipes are paged separately
+SECTIONS = {
+    'categories': (Category, CategorySerializer, 'category'),
+    'ingredients': (Ingredient, IngredientSerializer, 'ingredient'),
+    'tags': (RecipeTag, RecipeTagSerializer, 'tag'),
+}
+
+
+class InvalidSyncToken(Exception):
+    pass
+
+
+class SyncTokenExpired(Exception):
+    pass
+
+
+def settle_delay():
+    """How far behind the clock the feed reads, so rows stamped by still-open transactions are not skipped"""
+    return timedelta(seconds=getattr(settings, 'RECIPES_SYNC_SETTLE_SECONDS', 2))
+
+
+def tombstone_retention():
+    return timedelta(days=getattr(settings, 'RECIPES_TOMBSTONE_RETENTION_DAYS', 90))
+
+
+def encode_token(moment, recipe_id=None):
+    """
+    Opaque sync token for a feed position.
+
+    The position is a timestamp plus, when a page stopped between recipes
+    stamped with the same time, the id of the last recipe sent. Positions
+    only ever move forward.
+    """
+    payload = {'t': (moment - EPOCH) // timedelta(microseconds=1)}
+    if recipe_id is not None:
+        payload['id'] = recipe_id
+    return urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_token(token):
+    """Return the (datetime, recipe id or None) position of a sync token"""
+    try:
+        payload = json.loads(urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode('utf-8'))
+        moment = EPOCH + timedelta(microseconds=int(payload['t']))
+        recipe_id = payload.get('id')
+        return moment, int(recipe_id) if recipe_id is not None else None
+    except (TypeError, ValueError, KeyError, OverflowError, AttributeError):
+        raise InvalidSyncToken(token)
+
+
+def change_feed(since=None, since_id=None, limit=DEFAULT_LIMIT):
+    """
+    Everything in the catalog that changed after a feed position.
+
+    Recipes come in (updated_at, id) order, at most `limit` per call, as
+    RecipeListSerializer data; categories, ingredients and tags changed up
+    to the last recipe sent come along in full, and `deleted` lists the ids
+    removed in the same window. When `has_more` is true the caller asks
+    again with the returned token. Without `since` the whole catalog is
+    sent, still page by page.
+
+    Reads always go to the primary: a replica snapshot older than the
+    window would make the client skip changes for good.
+    """
+    now = timezone.now()
+    if since is not None and since < now - tombstone_retention():
+        raise SyncTokenExpired()
+    until = now - settle_delay()
+    if since is not None:
+        until = max(until, since)
+
+    with use_primary():
+        recipes = Recipe.objects.with_list_relations().filter(updated_at__lte=until).order_by('updated_at', 'id')
+        if since is not None:
+            after = Q(updated_at__gt=since)
+            if since_id is not None:
+                after |= Q(updated_at=since, id__gt=since_id)
+            recipes = recipes.filter(after)
+        page = list(recipes[:limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit]
+
+        # A partial page ends the window at its last recipe so the other
+        # sections never run ahead of the token
+        if has_more:
+            upper, upper_id = page[-1].updated_at, page[-1].pk
+        else:
+            upper, upper_id = until, None
+        window = {'updated_at__lte': upper}
+        if since is not None:
+            window['updated_at__gt'] = since
+
+        feed = {
+            'sync_token': encode_token(upper, upper_id),
+            'has_more': has_more,
+            'recipes': RecipeListSerializer(page, many=True).data,
+        }
+        for section, (model, serializer_class, _) in SECTIONS.items():
+            feed[section] = serializer_class(model.objects.filter(**window), many=True).data
+
+        deleted = {'recipes': [], **{section: [] for section in SECTIONS}}
+        if since is not None:
+            sections = {'recipe': 'recipes', **{kind: section for section, (_, _, kind) in SECTIONS.items()}}
+            tombstones = (Tombstone.objects
+                          .filter(deleted_at__gt=since, deleted_at__lte=upper)
+                          .order_by('deleted_at', 'id')
+                          .values_list('kind', 'object_id'))
+            for kind, object_id in tombstones:
+                deleted[sections[kind]].append(object_id)
+        feed['deleted'] = deleted
+    return feed
+
+
+def prune_tombstones():
+    """Delete tombstones older than the retention period; returns how many went"""
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - tombstone_retention()).delete()
+    return deleted
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+from django.core.exceptions import ImproperlyConfigured
+
+# Backends keeping their data inside one process
+PROCESS_LOCAL_BACKENDS = {'django.core.cache.backends.locmem.LocMemCache'}
+
+
+def shared_caches():
+    """(alias, what it carries, check id) of the caches through which one worker's writes reach the others"""
+    return [
+        ('default', 'the in-memory index versions (recipes.memory_index)', 'recipes.E001'),
+        (getattr(settings, 'RECIPES_API_CACHE', 'default'),
+         'the cached API responses and the catalog version expiring them (recipes.response_cache)', 'recipes.E002'),
+    ]
+
+
+@register(Tags.caches)
+def check_shared_caches(app_configs=None, **kwargs):
+    """With more than one worker, every cache in shared_caches() must be shared between processes"""
+    workers = getattr(settings, 'RECIPES_WORKERS', 1)
+    if workers <= 1:
+        return []
+    errors = []
+    for alias, purpose, check_id in shared_caches():
+        backend = settings.CACHES.get(alias, {}).get('BACKEND')
+        if backend in PROCESS_LOCAL_BACKENDS:
+            errors.append(Error(
+                f'CACHES[{alias!r}] uses {backend}, which is local to each process, '
+                f'but RECIPES_WORKERS is {workers}. It carries {purpose}, so writes '
+                'in one worker would never reach the others.',
+                hint='Point it at Redis, Memcached or the database cache, or run a single worker.',
+                id=check_id,
+            ))
+    return errors
+
+
+@register(Tags.caches, deploy=True)
+def check_caches_reach_commands(app_configs=None, **kwargs):
+    """Even one worker misses writes made by management commands through process-local caches"""
+    if getattr(settings, 'RECIPES_WORKERS', 1) > 1:
+        return []
+    return [
+        Warning(
+            f'CACHES[{alias!r}] is local to the server process. Writes made by management '
+            'commands (import_recipes, generate_catalog, backfill_quantities) will not '
+            f'invalidate {purpose} until the server restarts.',
+            hint='Use a shared cache backend in production.',
+            id=check_id.replace('.E', '.W'),
+        )
+        for alias, purpose, check_id in shared_caches()
+        if settings.CACHES.get(alias, {}).get('BACKEND') in PROCESS_LOCAL_BACKENDS
+    ]
+
+
+def require_shared_caches():
+    """Refuse to start a server whose workers could not see each other's writes"""
+    errors = check_shared_caches()
+    if errors:
+        raise ImproperlyConfigured('\n'.join(error.msg for error in errors))
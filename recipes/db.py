@@ -0,0 +1,97 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# PRAGMAs that write to the database file; read-only replicas skip them
+WRITE_PRAGMAS = {'journal_mode', 'synchronous'}
+
+# Alias of the replica the current request reads from, or None for the primary
+_read_alias = ContextVar('recipes_read_alias', default=None)
+
+
+def read_replicas():
+    return list(getattr(settings, 'RECIPES_READ_REPLICAS', []))
+
+
+def replica_path(alias):
+    """Filesystem path of a replica, whose NAME is a read-only file: URI"""
+    name = str(connections.databases[alias]['NAME'])
+    return urlparse(name).path if name.startswith('file:') else name
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply settings.RECIPES_SQLITE_PRAGMAS to every new SQLite connection"""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'RECIPES_SQLITE_PRAGMAS', {})
+    read_only = connection.alias in read_replicas()
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            if read_only and name in WRITE_PRAGMAS:
+                continue
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@contextmanager
+def read_from_replica(enabled=True):
+    """Send recipes reads in this block to one randomly picked replica, when any are configured"""
+    replicas = read_replicas()
+    token = _read_alias.set(random.choice(replicas) if enabled and replicas else None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Read from the primary inside this block, e.g. to rebuild derived data"""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReadReplicaRouter:
+    """
+    Route `recipes` reads to a read-only replica and every write to the primary.
+
+    Reads only leave the primary inside read_from_replica(), which
+    ReadReplicaMiddleware enters for safe API requests. Signal handlers,
+    management commands and anything inside a transaction keep reading
+    the primary, so derived data is never rebuilt from a stale snapshot.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or model._meta.app_label != 'recipes':
+            return None
+        if connections['default'].in_atomic_block:
+            return 'default'
+        return alias
+
+    def db_for_write(self, model, **hints):
+        # Objects read from a replica would otherwise be saved back to it
+        if model._meta.app_label == 'recipes':
+            return 'default'
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *read_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas are copies of the primary made by snapshot_replicas
+        if db in read_replicas():
+            return False
+        return None
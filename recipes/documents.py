@@ -0,0 +1,125 @@
+import gzip
+import hashlib
+from functools import lru_cache
+
+from django.http import HttpResponse
+from rest_framework import serializers
+
+from .models import Recipe, RecipeDocument
+from .renderers import FastJSONRenderer
+from .serializers import RecipeDetailSerializer
+
+CHUNK_SIZE = 500
+
+
+# Bump when the output changes without the fields changing, e.g. a
+# SerializerMethodField or to_representation() rewrite
+DOCUMENT_SCHEMA = 1
+
+
+def describe_field(field):
+    """Type of a serializer field; nested serializers and list children are described recursively"""
+    if isinstance(field, (serializers.ListSerializer, serializers.ListField)):
+        return [type(field).__name__, describe_field(field.child)]
+    if isinstance(field, serializers.Serializer):
+        return [type(field).__name__, [
+            (name, child.source, describe_field(child)) for name, child in field.fields.items()
+        ]]
+    return type(field).__name__
+
+
+@lru_cache(maxsize=None)
+def schema_version():
+    """Fingerprint of RecipeDetailSerializer's field tree; stored documents from another schema count as missing"""
+    description = repr([DOCUMENT_SCHEMA, describe_field(RecipeDetailSerializer())])
+    return hashlib.sha1(description.encode('utf-8')).hexdigest()
+
+
+def render_json(recipe):
+    """Render a recipe exactly as the detail endpoint would"""
+    return FastJSONRenderer().render(RecipeDetailSerializer(recipe).data)
+
+
+def render_document(recipe):
+    """Return (json bytes, gzip bytes) for a recipe"""
+    content = render_json(recipe)
+    return content, gzip.compress(content, mtime=0)
+
+
+def build_documents(recipe_ids):
+    """Materialize the detail documents of the given recipes; returns how many were written"""
+    recipe_ids = list(recipe_ids)
+    written = 0
+    for start in range(0, len(recipe_ids), CHUNK_SIZE):
+        chunk = recipe_ids[start:start + CHUNK_SIZE]
+        documents = []
+        for recipe in Recipe.objects.with_detail_relations().filter(pk__in=chunk):
+            content, content_gzip = render_document(recipe)
+            documents.append(RecipeDocument(
+                recipe=recipe, content=content, content_gzip=content_gzip, schema_version=schema_version(),
+            ))
+        RecipeDocument.objects.bulk_create(
+            documents, update_conflicts=True, unique_fields=['recipe'],
+            update_fields=['content', 'content_gzip', 'schema_version', 'updated_at'],
+        )
+        written += len(documents)
+    return written
+
+
+def stored_document_query(slug):
+    return (RecipeDocument.objects
+            .filter(recipe__slug=slug, schema_version=schema_version())
+            .values_list('content', 'content_gzip'))
+
+
+def stored_document(slug):
+    """Fetch (json bytes, gzip bytes) for a recipe slug, or None when missing or stale"""
+    row = stored_document_query(slug).first()
+    if row is None:
+        return None
+    return bytes(row[0]), bytes(row[1])
+
+
+async def astored_document(slug):
+    row = await stored_document_query(slug).afirst()
+    if row is None:
+        return None
+    return bytes(row[0]), bytes(row[1])
+
+
+def load_documents(lookup, values):
+    """
+    Map each slug or pk in values to its detail JSON bytes.
+
+    Stored documents are read in one query and only the recipes without a
+    current document are serialized, with the shared detail prefetches.
+    Values that match no recipe are left out.
+    """
+    rows = (RecipeDocument.objects
+            .filter(**{f'recipe__{lookup}__in': values}, schema_version=schema_version())
+            .values_list(f'recipe__{lookup}', 'content'))
+    found = {key: bytes(content) for key, content in rows}
+    missing = [value for value in values if value not in found]
+    if missing:
+        for recipe in Recipe.objects.with_detail_relations().filter(**{f'{lookup}__in': missing}):
+            found[getattr(recipe, lookup)] = render_json(recipe)
+    return found
+
+
+def accepts_gzip(request):
+    for coding in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        name, _, params = coding.strip().partition(';')
+        if name.strip() in ('gzip', '*'):
+            return params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+def document_response(request, content, content_gzip):
+    """Send stored document bytes, compressed when the client allows it"""
+    if accepts_gzip(request):
+        response = HttpResponse(content_gzip, content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(content, content_type='application/json')
+    response['Vary'] = 'Accept-Encoding'
+    return response
@@ -0,0 +1,59 @@
+import zlib
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .documents import load_documents
+from .models import Recipe
+
+CHUNK_SIZE = 500
+
+
+def parse_updated_since(value):
+    """An ISO 8601 datetime with a time zone, or None; naive values are ambiguous against updated_at"""
+    try:
+        value = parse_datetime(value)
+    except ValueError:
+        # Well formed but out of range, like month 13
+        return None
+    if value is None or value.tzinfo is None:
+        return None
+    return value
+
+
+def iter_documents(updated_since=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield one NDJSON line per recipe, walking the catalog in primary-key order.
+
+    Each chunk is a keyset range (`pk > last`) so memory stays flat. Stored
+    detail documents are reused as-is, and only recipes without a current
+    document go through RecipeDetailSerializer. `updated_since` also
+    catches recipes whose ingredients, steps or tags changed, because
+    those writes rebuild the document.
+    """
+    recipes = Recipe.objects.order_by('pk')
+    if updated_since is not None:
+        recipes = recipes.filter(Q(updated_at__gte=updated_since) | Q(document__updated_at__gte=updated_since))
+
+    last_pk = 0
+    while True:
+        pks = list(recipes.filter(pk__gt=last_pk).values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            return
+        last_pk = pks[-1]
+
+        documents = load_documents('pk', pks)
+        for pk in pks:
+            # Skip rows deleted between the two queries
+            if pk in documents:
+                yield documents[pk] + b'\n'
+
+
+def gzip_stream(chunks):
+    """Compress an iterable of byte strings into a gzip stream"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,85 @@
+from django.db.models import Case, Count, IntegerField, Value, When
+
+from .models import DIETARY_BITS, Recipe
+
+# max_time values offered by the filter sidebar; each bucket counts every
+# recipe that fits in it, like the max_time filter itself
+TIME_BUCKETS = [15, 30, 45, 60, 120]
+
+
+def time_bucket():
+    """SQL expression for the smallest TIME_BUCKETS bound a recipe fits in, NULL above them all"""
+    return Case(
+        *(When(total_time__lte=bound, then=Value(bound)) for bound in TIME_BUCKETS),
+        default=None, output_field=IntegerField(),
+    )
+
+
+# Facet -> the columns its counts are grouped on; "bucket" is time_bucket()
+FACET_FIELDS = {
+    'category': ('category_id', 'category__name'),
+    'difficulty': ('difficulty',),
+    'dietary': ('dietary_flags',),
+    'max_time': ('bucket',),
+}
+
+
+def _groups(queryset, fields):
+    """Recipe counts of queryset grouped on fields"""
+    expressions = {'bucket': time_bucket()} if 'bucket' in fields else {}
+    columns = [field for field in fields if field != 'bucket']
+    return queryset.order_by().values(*columns, **expressions).annotate(count=Count('pk'))
+
+
+def _tally(groups, fields):
+    counts = {}
+    for group in groups:
+        key = tuple(group[field] for field in fields)
+        counts[key] = counts.get(key, 0) + group['count']
+    return counts
+
+
+def facet_counts(queryset, dietary, unfiltered=None):
+    """
+    Every facet of the recipes in queryset.
+
+    One GROUP BY query on (category, difficulty, dietary_flags, time
+    bucket) gives the total and every facet, so the result has at most
+    categories x difficulties x flag combinations x buckets rows however
+    many recipes match. Facets are disjunctive: `unfiltered` maps a facet
+    name to the recipes matched by every filter but that facet's own, and
+    that facet is counted from one more grouped query on it, so a picked
+    category still shows the counts of the others. `dietary` maps the
+    list's query params to Recipe flags; those flags combine with AND, so
+    their counts from the filtered recipes are already what picking one
+    more flag would give.
+    """
+    groups = list(_groups(queryset, sum(FACET_FIELDS.values(), ())))
+    counts = {name: _tally(groups, fields) for name, fields in FACET_FIELDS.items()}
+    for name, recipes in (unfiltered or {}).items():
+        counts[name] = _tally(_groups(recipes, FACET_FIELDS[name]), FACET_FIELDS[name])
+
+    fitting = 0
+    max_time = []
+    for bound in TIME_BUCKETS:
+        fitting += counts['max_time'].get((bound,), 0)
+        max_time.append({'value': bound, 'count': fitting})
+
+    return {
+        'total': sum(group['count'] for group in groups),
+        'categories': sorted(
+            ({'id': pk, 'name': name, 'count': count} for (pk, name), count in counts['category'].items()),
+            key=lambda entry: (-entry['count'], entry['name']),
+        ),
+        'difficulty': [
+            {'value': value, 'label': label, 'count': counts['difficulty'].get((value,), 0)}
+            for value, label in Recipe.DIFFICULTY_CHOICES
+        ],
+        'dietary': [
+            {'value': param, 'count': sum(
+                count for (packed,), count in counts['dietary'].items() if packed & DIETARY_BITS[field]
+            )}
+            for param, field in dietary.items()
+        ],
+        'max_time': max_time,
+    }
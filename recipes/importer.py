@@ -0,0 +1,202 @@
+import csv
+import json
+import time
+from itertools import islice
+
+from django.db import connection, transaction
+from django.utils.text import slugify
+
+from . import documents, search, similarity, stats
+from .autocomplete import autocomplete_index
+from .ingredient_index import ingredient_index
+from .nutrition import nutrition_engine
+from .quantities import parse_quantity
+from .models import (
+    Category, Ingredient, Recipe, RecipeIngredient, RecipeStep, RecipeTag, Recipe_Tag, pack_dietary_flags,
+)
+from .response_cache import bump_catalog_version
+
+RECIPE_FIELDS = [
+    'description', 'image', 'prep_time', 'cook_time', 'total_time', 'difficulty', 'servings',
+    'calories_per_serving', 'protein_grams', 'carbs_grams', 'fat_grams', 'fiber_grams',
+    'is_vegetarian', 'is_vegan', 'is_gluten_free', 'is_dairy_free', 'is_featured',
+]
+
+BOOLEAN_FIELDS = {'is_vegetarian', 'is_vegan', 'is_gluten_free', 'is_dairy_free', 'is_featured'}
+
+# CSV cells holding nested data are JSON encoded
+NESTED_FIELDS = ['ingredients', 'steps', 'tags']
+
+
+def read_jsonl(path):
+    with open(path, encoding='utf-8') as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as handle:
+        for row in csv.DictReader(handle):
+            for field in NESTED_FIELDS:
+                row[field] = json.loads(row[field]) if row.get(field) else []
+            for field in BOOLEAN_FIELDS:
+                if field in row:
+                    row[field] = row[field].strip().lower() in ('1', 'true', 'yes')
+            yield {key: value for key, value in row.items() if value != ''}
+
+
+def insert_rows(model, columns, rows):
+    """Plain executemany INSERT for simple link tables"""
+    if not rows:
+        return
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote(model._meta.db_table),
+        ', '.join(quote(model._meta.get_field(name).column) for name in columns),
+        ', '.join(['%s'] * len(columns)),
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class RecipeImporter:
+    """
+    Bulk loader for recipe records shaped like populate_recipes' data.
+
+    Categories, ingredients and tags are resolved through in-memory
+    name -> id maps. Recipes are written with bulk_create and the link
+    tables with a plain executemany, inside one transaction per chunk. Recipes whose name is already in the
+    database are skipped, so re-running an import is a no-op. Bulk
+    inserts bypass the model signals, so the derived data (counters,
+    stats, search rows, detail documents, caches) is refreshed here.
+    """
+
+    def __init__(self, batch_size=1000, refresh_derived=True, log=None):
+        self.batch_size = batch_size
+        self.refresh_derived = refresh_derived
+        self.log = log or (lambda message: None)
+        self.categories = dict(Category.objects.values_list('name', 'pk'))
+        self.ingredients = dict(Ingredient.objects.values_list('name', 'pk'))
+        self.tags = dict(RecipeTag.objects.values_list('name', 'pk'))
+        self.names = set(Recipe.objects.values_list('name', flat=True).iterator())
+        self.slugs = set(Recipe.objects.values_list('slug', flat=True).iterator())
+        self.created = 0
+        self.skipped = 0
+
+    def run(self, records):
+        started = time.perf_counter()
+        try:
+            for chunk in chunked(records, self.batch_size):
+                self.import_chunk(chunk)
+                elapsed = time.perf_counter() - started
+                self.log(f'{self.created} recipes imported, {self.skipped} skipped '
+                         f'({self.created / elapsed if elapsed else 0:.0f} recipes/s)')
+        finally:
+            # Chunks committed before a failure still need their aggregates
+            if self.created:
+                self.finish()
+        return time.perf_counter() - started
+
+    def unique_slug(self, record):
+        base = slugify(record.get('slug') or record['name'])[:200] or 'recipe'
+        slug, suffix = base, 2
+        while slug in self.slugs:
+            slug = f'{base}-{suffix}'
+            suffix += 1
+        self.slugs.add(slug)
+        return slug
+
+    def resolve(self, model, mapping, names, defaults):
+        """Make sure every name exists and is in mapping"""
+        missing = {name for name in names if name not in mapping}
+        if not missing:
+            return
+        model.objects.bulk_create(
+            [model(name=name, **defaults.get(name, {})) for name in missing],
+            ignore_conflicts=True,
+        )
+        mapping.update(model.objects.filter(name__in=missing).values_list('name', 'pk'))
+
+    def import_chunk(self, chunk):
+        records = []
+        for record in chunk:
+            if record['name'] in self.names:
+                self.skipped += 1
+                continue
+            self.names.add(record['name'])
+            records.append(record)
+        if not records:
+            return
+
+        with transaction.atomic():
+            self.resolve(Category, self.categories, {r['category'] for r in records}, {})
+            ingredient_defaults = {
+                ing['name']: {'emoji': ing['emoji']}
+                for r in records for ing in r.get('ingredients', []) if ing.get('emoji')
+            }
+            self.resolve(Ingredient, self.ingredients,
+                         {ing['name'] for r in records for ing in r.get('ingredients', [])},
+                         ingredient_defaults)
+            self.resolve(RecipeTag, self.tags, {tag for r in records for tag in r.get('tags', [])}, {})
+
+            recipes = []
+            for record in records:
+                values = {field: record[field] for field in RECIPE_FIELDS if field in record}
+                if not values.get('total_time'):
+                    values['total_time'] = int(record['prep_time']) + int(record.get('cook_time', 0))
+                # bulk_create skips save(), so pack the flags here
+                recipes.append(Recipe(
+                    name=record['name'], slug=self.unique_slug(record),
+                    category_id=self.categories[record['category']],
+                    dietary_flags=pack_dietary_flags(values), **values,
+                ))
+            Recipe.objects.bulk_create(recipes, batch_size=self.batch_size)
+
+            # Child rows carry no defaults or signals worth the ORM's per-row cost
+            recipe_ingredients, steps, recipe_tags = [], [], []
+            for recipe, record in zip(recipes, records):
+                seen = set()
+                for ing in record.get('ingredients', []):
+                    ingredient_id = self.ingredients[ing['name']]
+                    if ingredient_id in seen:
+                        continue
+                    seen.add(ingredient_id)
+                    quantity = ing.get('quantity', '')
+                    recipe_ingredients.append(
+                        (recipe.pk, ingredient_id, quantity, ing.get('notes', ''), *parse_quantity(quantity))
+                    )
+                for number, step in enumerate(record.get('steps', []), 1):
+                    if isinstance(step, str):
+                        step = {'instruction': step}
+                    steps.append((recipe.pk, number, step['instruction'], step.get('time_minutes', 0)))
+                for tag_id in {self.tags[tag] for tag in record.get('tags', [])}:
+                    recipe_tags.append((recipe.pk, tag_id))
+            insert_rows(RecipeIngredient, ['recipe', 'ingredient', 'quantity', 'notes', 'amount', 'unit'], recipe_ingredients)
+            insert_rows(RecipeStep, ['recipe', 'step_number', 'instruction', 'time_minutes'], steps)
+            insert_rows(Recipe_Tag, ['recipe', 'tag'], recipe_tags)
+
+        recipe_ids = [recipe.pk for recipe in recipes]
+        if self.refresh_derived:
+            search.index_recipes(recipe_ids)
+            documents.build_documents(recipe_ids)
+            similarity.update_signatures(recipe_ids)
+        self.created += len(recipes)
+
+    def finish(self):
+        """Bring the aggregates the signals would have maintained back in line"""
+        stats.recount_categories()
+        stats.recompute()
+        ingredient_index.invalidate()
+        nutrition_engine.invalidate()
+        autocomplete_index.invalidate()
+        bump_catalog_version()
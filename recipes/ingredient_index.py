@@ -0,0 +1,218 @@
+import json
+import re
+from array import array
+from bisect import bisect_left, insort
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .memory_index import SharedMemoryIndex
+from .models import Recipe, RecipeIngredient
+
+INDEX_VERSION_KEY = 'recipes:ingredient_index:version'
+
+WORD_RE = re.compile(r'\w+')
+
+# Sorts after every character a normalized key can contain
+LAST_CHAR = '\U0010ffff'
+
+
+def normalize(value):
+    return value.lower()
+
+
+def tokenize(*values):
+    """Split recipe text into the words a single-word search term can fall into"""
+    return {word for value in values for word in WORD_RE.findall(normalize(value or ''))}
+
+
+class SuffixTable:
+    """
+    Sorted (suffix, key) pairs for every suffix of a set of keys.
+
+    A key contains a term exactly when one of its suffixes starts with
+    it, so the keys containing a term are one bisect range instead of a
+    scan of the whole vocabulary.
+    """
+
+    def __init__(self, keys=()):
+        self.suffixes = sorted((key[start:], key) for key in keys for start in range(len(key)))
+
+    def add(self, key):
+        for start in range(len(key)):
+            insort(self.suffixes, (key[start:], key))
+
+    def remove(self, key):
+        for start in range(len(key)):
+            position = bisect_left(self.suffixes, (key[start:], key))
+            if position < len(self.suffixes) and self.suffixes[position] == (key[start:], key):
+                del self.suffixes[position]
+
+    def containing(self, term):
+        start = bisect_left(self.suffixes, (term,))
+        end = bisect_left(self.suffixes, (term + LAST_CHAR,), start)
+        return {key for _, key in self.suffixes[start:end]}
+
+
+def _add(postings, keys, term, recipe_id):
+    ids = postings.get(term)
+    if ids is None:
+        postings[term] = array('q', [recipe_id])
+        keys.add(term)
+        return
+    pos = bisect_left(ids, recipe_id)
+    if pos == len(ids) or ids[pos] != recipe_id:
+        ids.insert(pos, recipe_id)
+
+
+def _remove(postings, keys, term, recipe_id):
+    ids = postings.get(term)
+    if ids is None:
+        return
+    pos = bisect_left(ids, recipe_id)
+    if pos < len(ids) and ids[pos] == recipe_id:
+        del ids[pos]
+    if not ids:
+        del postings[term]
+        keys.remove(term)
+
+
+class IngredientIndex(SharedMemoryIndex):
+    """
+    Inverted index backing the `?ingredients=` filter.
+
+    Two posting maps are kept, both from a normalized term to a sorted
+    array of recipe ids: one keyed by full ingredient name and one keyed
+    by the words of each recipe's name and description. A query term
+    matches a recipe when it is a substring of one of its ingredient
+    names or of its name/description, which is exactly what the chained
+    `icontains` filters did; a SuffixTable per map finds the keys
+    containing a term without scanning them all. Terms spanning several words cannot be
+    answered from the word map and fall back to the ORM filter.
+
+    Writes are applied incrementally by the signal handlers.
+    """
+
+    version_key = INDEX_VERSION_KEY
+
+    def __init__(self):
+        super().__init__()
+        self._ingredients = {}
+        self._words = {}
+        self._ingredient_keys = SuffixTable()
+        self._word_keys = SuffixTable()
+        self._recipe_terms = {}
+
+    def load(self):
+        ingredients, words, recipe_terms = {}, {}, {}
+        for pk, name, description in Recipe.objects.order_by('pk').values_list('pk', 'name', 'description').iterator():
+            recipe_terms[pk] = (tokenize(name, description), set())
+            for word in recipe_terms[pk][0]:
+                words.setdefault(word, array('q')).append(pk)
+        for recipe_id, name in RecipeIngredient.objects.order_by('recipe_id').values_list('recipe_id', 'ingredient__name').iterator():
+            term = normalize(name)
+            recipe_terms.setdefault(recipe_id, (set(), set()))[1].add(term)
+            ids = ingredients.setdefault(term, array('q'))
+            if not ids or ids[-1] != recipe_id:
+                ids.append(recipe_id)
+
+        ingredient_keys, word_keys = SuffixTable(ingredients), SuffixTable(words)
+
+        with self._lock:
+            self._ingredients, self._words, self._recipe_terms = ingredients, words, recipe_terms
+            self._ingredient_keys, self._word_keys = ingredient_keys, word_keys
+
+    def update_recipe(self, recipe_id):
+        """Re-read one recipe's text and ingredient names and patch the postings"""
+        if not self._built:
+            self._bump_version()
+            return
+        row = Recipe.objects.filter(pk=recipe_id).values_list('name', 'description').first()
+        if row is None:
+            self.remove_recipe(recipe_id)
+            return
+        words = tokenize(*row)
+        ingredients = {
+            normalize(name) for name in
+            RecipeIngredient.objects.filter(recipe_id=recipe_id).values_list('ingredient__name', flat=True)
+        }
+        with self._lock:
+            old_words, old_ingredients = self._recipe_terms.get(recipe_id, (set(), set()))
+            for word in old_words - words:
+                _remove(self._words, self._word_keys, word, recipe_id)
+            for word in words - old_words:
+                _add(self._words, self._word_keys, word, recipe_id)
+            for term in old_ingredients - ingredients:
+                _remove(self._ingredients, self._ingredient_keys, term, recipe_id)
+            for term in ingredients - old_ingredients:
+                _add(self._ingredients, self._ingredient_keys, term, recipe_id)
+            self._recipe_terms[recipe_id] = (words, ingredients)
+        self._bump_version()
+
+    def remove_recipe(self, recipe_id):
+        if not self._built:
+            self._bump_version()
+            return
+        with self._lock:
+            words, ingredients = self._recipe_terms.pop(recipe_id, (set(), set()))
+            for word in words:
+                _remove(self._words, self._word_keys, word, recipe_id)
+            for term in ingredients:
+                _remove(self._ingredients, self._ingredient_keys, term, recipe_id)
+        self._bump_version()
+
+    def match(self, term):
+        """Return the set of recipe ids matching one term, or None if it cannot be answered"""
+        term = normalize(term)
+        if not WORD_RE.fullmatch(term):
+            return None
+        with self._lock:
+            ids = set()
+            for postings, keys in ((self._ingredients, self._ingredient_keys), (self._words, self._word_keys)):
+                for key in keys.containing(term):
+                    ids.update(postings[key])
+        return ids
+
+    def recipes_with_ingredient(self, term):
+        """Ids of recipes with an ingredient whose name contains term"""
+        self.ensure_built()
+        term = normalize(term)
+        ids = set()
+        with self._lock:
+            for key in self._ingredient_keys.containing(term):
+                ids.update(self._ingredients[key])
+        return ids
+
+    def filter_queryset(self, queryset, terms):
+        """Restrict queryset to recipes matching every term"""
+        self.ensure_built()
+        matched, fallback = [], []
+        for term in terms:
+            ids = self.match(term)
+            if ids is None:
+                fallback.append(term)
+            else:
+                matched.append(ids)
+
+        if matched:
+            matched.sort(key=len)
+            ids = matched[0].intersection(*matched[1:])
+            queryset = queryset.filter(id_in_set(sorted(ids)))
+        for term in fallback:
+            queryset = queryset.filter(pk__in=Recipe.objects.filter(
+                Q(recipe_ingredients__ingredient__name__icontains=term) |
+                Q(name__icontains=term) |
+                Q(description__icontains=term)
+            ).values('pk'))
+        return queryset
+
+
+def id_in_set(ids):
+    """`id IN (...)` that does not hit SQLite's bound-parameter limit on large sets"""
+    if connection.vendor == 'sqlite':
+        return Q(id__in=RawSQL('SELECT value FROM json_each(%s)', [json.dumps(ids)]))
+    return Q(id__in=ids)
+
+
+ingredient_index = IngredientIndex()
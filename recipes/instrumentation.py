@@ -0,0 +1,225 @@
+import logging
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from rest_framework.renderers import JSONRenderer
+
+logger = logging.getLogger('recipes.slow_requests')
+
+# Timings of the request being handled in this context, or None outside requests
+_current = ContextVar('recipes_request_timings', default=None)
+
+DURATION_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+QUERY_BUCKETS = [0, 1, 2, 3, 5, 10, 20, 50, 100]
+
+STACK_LIMIT = 12
+
+
+class RequestTimings:
+    """What one request spent where; filled in by the DB wrapper, timed() and the middleware"""
+
+    def __init__(self, capture_queries=False):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.phases = {'serialize': 0.0, 'render': 0.0}
+        self.active = set()
+        self.capture_queries = capture_queries
+        self.statements = []
+
+    def server_timing(self, route, total):
+        entries = [
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'serialize;dur={self.phases["serialize"] * 1000:.1f}',
+            f'render;dur={self.phases["render"] * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+            f'route;desc="{route}"',
+        ]
+        return ', '.join(entries)
+
+
+@contextmanager
+def measure_request(capture_queries=False):
+    timings = RequestTimings(capture_queries)
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed(phase):
+    """Add the time spent in this block to the current request's phase; nested blocks count once"""
+    timings = _current.get()
+    if timings is None or phase in timings.active:
+        yield
+        return
+    timings.active.add(phase)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.phases[phase] += time.perf_counter() - started
+        timings.active.discard(phase)
+
+
+def project_stack():
+    """The innermost STACK_LIMIT frames from project code, skipping Django and library internals"""
+    base = str(settings.BASE_DIR)
+    frames = []
+    for frame, lineno in traceback.walk_stack(None):
+        filename = frame.f_code.co_filename
+        if filename.startswith(base) and filename != __file__ and 'site-packages' not in filename:
+            frames.append((filename, lineno, frame.f_code.co_name))
+            if len(frames) == STACK_LIMIT:
+                break
+    return frames
+
+
+def record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        timings.queries += 1
+        timings.db_time += elapsed
+        if timings.capture_queries:
+            timings.statements.append((sql, params, elapsed, project_stack()))
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    # Installed on every connection, so ORM calls made from sync_to_async threads are counted too
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedRepresentationMixin:
+    """Count a serializer's to_representation() as the request's serialize phase"""
+
+    def to_representation(self, instance):
+        with timed('serialize'):
+            return super().to_representation(instance)
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSONRenderer that counts its work as the request's render phase"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('render'):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """
+    Per-process request metrics, exposed in the Prometheus text format.
+
+    Each worker process keeps its own numbers; scrape every worker (or run
+    one process per scrape target) to get the full picture.
+    """
+    HISTOGRAMS = [
+        ('recipes_http_request_duration_seconds', 'Request latency', DURATION_BUCKETS),
+        ('recipes_http_request_db_seconds', 'Time spent in SQL per request', DURATION_BUCKETS),
+        ('recipes_http_request_serialize_seconds', 'Time spent in serializers per request', DURATION_BUCKETS),
+        ('recipes_http_request_render_seconds', 'Time spent rendering per request', DURATION_BUCKETS),
+        ('recipes_http_request_queries', 'SQL queries per request', QUERY_BUCKETS),
+    ]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._histograms = {name: {} for name, _, _ in self.HISTOGRAMS}
+
+    def observe(self, route, method, status, timings, total):
+        values = {
+            'recipes_http_request_duration_seconds': total,
+            'recipes_http_request_db_seconds': timings.db_time,
+            'recipes_http_request_serialize_seconds': timings.phases['serialize'],
+            'recipes_http_request_render_seconds': timings.phases['render'],
+            'recipes_http_request_queries': timings.queries,
+        }
+        with self._lock:
+            key = (route, method, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            for name, _, buckets in self.HISTOGRAMS:
+                histogram = self._histograms[name].get(route)
+                if histogram is None:
+                    histogram = self._histograms[name][route] = Histogram(buckets)
+                histogram.observe(values[name])
+
+    def render(self):
+        lines = [
+            '# HELP recipes_http_requests_total Requests handled',
+            '# TYPE recipes_http_requests_total counter',
+        ]
+        with self._lock:
+            for (route, method, status), value in sorted(self._requests.items()):
+                lines.append(
+                    f'recipes_http_requests_total{{route="{route}",method="{method}",status="{status}"}} {value}'
+                )
+            for name, description, buckets in self.HISTOGRAMS:
+                lines += [f'# HELP {name} {description}', f'# TYPE {name} histogram']
+                for route, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(buckets + ['+Inf'], histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{route="{route}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_sum{{route="{route}"}} {histogram.sum}')
+                    lines.append(f'{name}_count{{route="{route}"}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+
+def slow_request_threshold():
+    """Seconds above which a request's SQL is logged, or None when the slow log is off"""
+    threshold = getattr(settings, 'RECIPES_SLOW_REQUEST_MS', None)
+    return threshold / 1000 if threshold is not None else None
+
+
+def log_slow_request(request, route, timings, total):
+    parts = [
+        f'Slow request {request.method} {request.get_full_path()} ({route}): '
+        f'{total * 1000:.1f}ms total, {timings.queries} queries in {timings.db_time * 1000:.1f}ms'
+    ]
+    for sql, params, elapsed, stack in timings.statements:
+        parts.append(f'-- {elapsed * 1000:.1f}ms {sql} {params!r:.200}')
+        parts += [f'     {filename}:{lineno} in {name}' for filename, lineno, name in stack]
+    logger.warning('\n'.join(parts))
+
+
+def finish_request(request, response, timings):
+    """Record a finished request: Server-Timing header, metrics and slow log"""
+    total = time.perf_counter() - timings.started
+    match = getattr(request, 'resolver_match', None)
+    route = match.view_name if match is not None else 'unmatched'
+    response['Server-Timing'] = timings.server_timing(route, total)
+    metrics.observe(route, request.method, response.status_code, timings, total)
+    threshold = slow_request_threshold()
+    if threshold is not None and total >= threshold:
+        log_slow_request(request, route, timings, total)
+    return response
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipes.importer import chunked
+from recipes.models import RecipeIngredient
+from recipes.quantities import parse_quantity
+from recipes.response_cache import bump_catalog_version
+
+
+class Command(BaseCommand):
+    help = 'Parse RecipeIngredient.quantity into the amount and unit columns for rows written before they existed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows parsed per transaction')
+
+    def handle(self, *args, **options):
+        rows = RecipeIngredient.objects.order_by('pk').values_list('pk', 'quantity', 'amount', 'unit')
+        checked = updated = 0
+        for chunk in chunked(rows.iterator(chunk_size=options['batch_size']), options['batch_size']):
+            # Quantities repeat a lot, so rows are updated per distinct parse
+            changed = {}
+            for pk, quantity, amount, unit in chunk:
+                parsed = parse_quantity(quantity)
+                if parsed != (amount, unit):
+                    changed.setdefault(parsed, []).append(pk)
+            with transaction.atomic():
+                for (amount, unit), pks in changed.items():
+                    RecipeIngredient.objects.filter(pk__in=pks).update(amount=amount, unit=unit)
+            checked += len(chunk)
+            updated += sum(len(pks) for pks in changed.values())
+        if updated:
+            # Shopping lists are cached per catalog version
+            bump_catalog_version()
+        unparsed = RecipeIngredient.objects.filter(amount__isnull=True).count()
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked} quantities, updated {updated}; {unparsed} have no numeric amount'
+        ))
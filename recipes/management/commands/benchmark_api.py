@@ -0,0 +1,239 @@
+import json
+import platform
+import random
+import re
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from rest_framework.settings import api_settings
+
+from recipes.models import Category, Ingredient, Recipe
+
+# Share of each request kind in the replayed traffic
+MIX = {
+    'list': 20,
+    'filter': 25,
+    'search': 15,
+    'detail': 25,
+    'stats': 5,
+    'featured': 10,
+}
+
+# Sent as the Host header by the in-process client; must be in ALLOWED_HOSTS
+HOST = 'localhost'
+
+QUERIES_PATTERN = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay a deterministic mix of list, filter, search, detail, stats and featured requests '
+        'and report throughput, latency percentiles and queries per request'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000, help='Requests to replay')
+        parser.add_argument('--warmup', type=int, default=50, help='Unrecorded requests sent first')
+        parser.add_argument('--concurrency', type=int, default=1, help='Requests in flight at once')
+        parser.add_argument('--seed', type=int, default=0, help='Same seed and catalog give the same requests')
+        parser.add_argument(
+            '--base-url',
+            help='Send requests to a running server, e.g. http://127.0.0.1:8000; '
+                 'defaults to the in-process test client',
+        )
+        parser.add_argument('--cached', action='store_true', help='Let requests hit the response cache')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.local = threading.local()
+        self.rng = random.Random(options['seed'])
+        self.slugs = list(Recipe.objects.order_by('pk').values_list('slug', flat=True)[:50000])
+        if not self.slugs:
+            raise CommandError('No recipes; run generate_catalog first.')
+        self.categories = list(Category.objects.order_by('name').values_list('name', flat=True))
+        self.ingredients = list(Ingredient.objects.order_by('name').values_list('name', flat=True))
+
+        kinds = list(MIX)
+        plan = [
+            self.rng.choices(kinds, [MIX[kind] for kind in kinds])[0]
+            for _ in range(options['warmup'] + options['requests'])
+        ]
+        plan = [(kind, getattr(self, f'{kind}_path')(), number) for number, kind in enumerate(plan)]
+        warmup, measured = plan[:options['warmup']], plan[options['warmup']:]
+
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            self.check_statuses(warmup, list(pool.map(self.send, warmup)))
+            started = time.perf_counter()
+            samples = list(pool.map(self.send, measured))
+            elapsed = time.perf_counter() - started
+        self.check_statuses(measured, samples)
+
+        results = self.summarize(samples, elapsed)
+        self.report(results)
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as handle:
+                self.compare(json.load(handle), results)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                json.dump(results, handle, indent=2)
+            self.stdout.write(f'Results written to {options["output"]}')
+
+    # Request builders
+
+    def list_path(self):
+        # The first 20 pages, or as many as a small catalog has
+        pages = min(20, -(-len(self.slugs) // api_settings.PAGE_SIZE))
+        return f'/api/recipes/?page={self.rng.randint(1, pages)}'
+
+    def filter_path(self):
+        rng = self.rng
+        params = {}
+        for flag in ('vegetarian', 'vegan', 'gluten_free'):
+            if rng.random() < 0.3:
+                params[flag] = 'true'
+        if rng.random() < 0.4:
+            params['max_time'] = rng.choice([15, 20, 30, 45, 60])
+        if rng.random() < 0.3:
+            params['difficulty'] = rng.choice(['easy', 'medium', 'hard'])
+        if self.categories and rng.random() < 0.3:
+            params['category'] = rng.choice(self.categories)
+        if self.ingredients and rng.random() < 0.3:
+            params['ingredients'] = ','.join(rng.sample(self.ingredients, rng.randint(1, 2)))
+        if rng.random() < 0.3:
+            params['ordering'] = rng.choice(['total_time', '-calories_per_serving', 'name'])
+        return '/api/recipes/?' + urlencode(params or {'vegan': 'true'})
+
+    def search_path(self):
+        words = [word for name in self.ingredients for word in name.split()] or ['salad']
+        terms = ' '.join(self.rng.sample(words, min(len(words), self.rng.randint(1, 2))))
+        return '/api/recipes/?' + urlencode({'search': terms})
+
+    def detail_path(self):
+        return f'/api/recipes/{self.rng.choice(self.slugs)}/'
+
+    def stats_path(self):
+        return '/api/stats/'
+
+    def featured_path(self):
+        return '/api/featured/'
+
+    # Sending
+
+    def send(self, item):
+        kind, path, number = item
+        if not self.options['cached']:
+            # A unique parameter per request keeps the response cache out of the measurement
+            path += ('&' if '?' in path else '?') + f'bench={number}'
+        started = time.perf_counter()
+        if self.options['base_url']:
+            status, server_timing = self.send_http(path)
+        else:
+            response = self.client().get(path, HTTP_ACCEPT='application/json')
+            status, server_timing = response.status_code, response.get('Server-Timing', '')
+        latency = time.perf_counter() - started
+        match = QUERIES_PATTERN.search(server_timing or '')
+        return kind, latency, status, int(match.group(1)) if match else None
+
+    def client(self):
+        # One test client per worker thread
+        if not hasattr(self.local, 'client'):
+            self.local.client = Client(HTTP_HOST=HOST)
+        return self.local.client
+
+    def check_statuses(self, plan, samples):
+        """Timings of failed requests are meaningless, so any non-2xx response stops the run"""
+        failed = [(path, status) for (_, path, _), (_, _, status, _) in zip(plan, samples) if not 200 <= status < 300]
+        if failed:
+            path, status = failed[0]
+            raise CommandError(f'{len(failed)} of {len(samples)} requests failed, e.g. {status} for {path}')
+
+    def send_http(self, path):
+        request = Request(self.options['base_url'].rstrip('/') + path, headers={'Accept': 'application/json'})
+        try:
+            with urlopen(request, timeout=30) as response:
+                response.read()
+                return response.status, response.headers.get('Server-Timing', '')
+        except HTTPError as exc:
+            return exc.code, exc.headers.get('Server-Timing', '')
+
+    # Reporting
+
+    def describe(self, samples, elapsed=None):
+        latencies = [latency * 1000 for _, latency, _, _ in samples]
+        queries = [count for _, _, _, count in samples if count is not None]
+        summary = {
+            'requests': len(samples),
+            'errors': sum(1 for _, _, status, _ in samples if status >= 400),
+            'p50_ms': round(statistics.median(latencies), 2),
+            'p95_ms': round(percentile(latencies, 0.95), 2),
+            'p99_ms': round(percentile(latencies, 0.99), 2),
+            'mean_ms': round(statistics.fmean(latencies), 2),
+            'queries_per_request': round(statistics.fmean(queries), 2) if queries else None,
+        }
+        if elapsed is not None:
+            summary['throughput_rps'] = round(len(samples) / elapsed, 1)
+        return summary
+
+    def summarize(self, samples, elapsed):
+        return {
+            'meta': {
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'recipes': Recipe.objects.count(),
+                'target': self.options['base_url'] or 'test-client',
+                'requests': self.options['requests'],
+                'concurrency': self.options['concurrency'],
+                'seed': self.options['seed'],
+                'cached': self.options['cached'],
+                'python': platform.python_version(),
+            },
+            'overall': self.describe(samples, elapsed),
+            'scenarios': {
+                kind: self.describe([sample for sample in samples if sample[0] == kind])
+                for kind in MIX if any(sample[0] == kind for sample in samples)
+            },
+        }
+
+    def report(self, results):
+        meta, overall = results['meta'], results['overall']
+        self.stdout.write(
+            f'{meta["requests"]} requests against {meta["target"]} ({meta["recipes"]} recipes), '
+            f'concurrency {meta["concurrency"]}: {overall["throughput_rps"]} req/s, {overall["errors"]} errors'
+        )
+        self.stdout.write(f'{"scenario":<10} {"n":>6} {"p50":>9} {"p95":>9} {"p99":>9} {"queries":>8}')
+        for kind, summary in [*results['scenarios'].items(), ('overall', overall)]:
+            queries = summary['queries_per_request']
+            self.stdout.write(
+                f'{kind:<10} {summary["requests"]:>6} {summary["p50_ms"]:>7.1f}ms {summary["p95_ms"]:>7.1f}ms '
+                f'{summary["p99_ms"]:>7.1f}ms {queries if queries is not None else "-":>8}'
+            )
+
+    def compare(self, previous, results):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Compared with {previous["meta"]["timestamp"]}'))
+        rows = [*results['scenarios'].items(), ('overall', results['overall'])]
+        for kind, summary in rows:
+            before = previous['scenarios'].get(kind) if kind != 'overall' else previous['overall']
+            if not before:
+                continue
+            changes = []
+            for field in ('p50_ms', 'p95_ms', 'p99_ms'):
+                if before[field]:
+                    change = (summary[field] - before[field]) / before[field] * 100
+                    changes.append(f'{field[:3]} {change:+.0f}%')
+            if summary['queries_per_request'] != before['queries_per_request']:
+                changes.append(f'queries {before["queries_per_request"]} -> {summary["queries_per_request"]}')
+            self.stdout.write(f'{kind:<10} ' + ', '.join(changes))
@@ -0,0 +1,136 @@
+import asyncio
+import io
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+
+from asgiref.sync import ThreadSensitiveContext
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+
+from recipes.models import Recipe
+
+HOST = 'localhost'
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare concurrent-request throughput of the recipe read endpoints through the WSGI '
+        'handler (sync views, fixed thread pool) and the ASGI handler (async views)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=400, help='Requests per endpoint and handler')
+        parser.add_argument('--concurrency', type=int, default=64, help='Requests in flight at once')
+        parser.add_argument('--threads', type=int, default=8, help='WSGI worker threads, as in a threaded server')
+        parser.add_argument(
+            '--client-delay', type=float, default=20.0,
+            help='Milliseconds a slow client takes to read each response',
+        )
+        parser.add_argument('--cached', action='store_true', help='Let requests hit the response cache')
+
+    def handle(self, *args, **options):
+        slug = Recipe.objects.order_by('pk').values_list('slug', flat=True).first()
+        if slug is None:
+            self.stderr.write('No recipes; run populate_recipes or import_recipes first.')
+            return
+        self.counter = count()
+        self.options = options
+        endpoints = ['/api/recipes/', f'/api/recipes/{slug}/', '/api/stats/', '/api/featured/']
+
+        wsgi, asgi = get_wsgi_application(), get_asgi_application()
+        self.stdout.write(
+            f'{options["requests"]} requests per endpoint, concurrency {options["concurrency"]}, '
+            f'{options["threads"]} WSGI threads, {options["client_delay"]:.0f}ms client delay'
+        )
+        for path in endpoints:
+            self.stdout.write(self.style.MIGRATE_HEADING(path))
+            for name, run in [('wsgi', self.run_wsgi), ('asgi', self.run_asgi)]:
+                elapsed, latencies, statuses = run(wsgi if name == 'wsgi' else asgi, path)
+                latencies = [latency * 1000 for latency in latencies]
+                self.stdout.write(
+                    f'  {name}: {len(latencies) / elapsed:7.1f} req/s  '
+                    f'p50 {statistics.median(latencies):6.1f}ms  p95 {percentile(latencies, 0.95):6.1f}ms  '
+                    f'statuses {sorted(set(statuses))}'
+                )
+
+    def query_string(self):
+        # A unique parameter per request keeps the response cache out of the measurement
+        return '' if self.options['cached'] else f'bench={next(self.counter)}'
+
+    def run_wsgi(self, application, path):
+        delay = self.options['client_delay'] / 1000
+
+        def request(started):
+            environ = {
+                'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': self.query_string(),
+                'SCRIPT_NAME': '', 'SERVER_NAME': HOST, 'SERVER_PORT': '80', 'HTTP_HOST': HOST,
+                'HTTP_ACCEPT': 'application/json', 'SERVER_PROTOCOL': 'HTTP/1.1',
+                'wsgi.version': (1, 0), 'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(),
+                'wsgi.errors': sys.stderr, 'wsgi.multithread': True, 'wsgi.multiprocess': False,
+                'wsgi.run_once': False,
+            }
+            status = []
+            body = application(environ, lambda code, headers, exc_info=None: status.append(code))
+            # The worker thread stays busy until the slow client has read the body
+            for _chunk in body:
+                time.sleep(delay)
+            body.close()
+            return time.perf_counter() - started, int(status[0].split()[0])
+
+        # Latency counts from when the request was issued, including the wait for a free thread
+        started = time.perf_counter()
+        with ThreadPoolExecutor(self.options['threads']) as pool:
+            results = list(pool.map(request, [started] * self.options['requests']))
+        return time.perf_counter() - started, [r[0] for r in results], [r[1] for r in results]
+
+    def run_asgi(self, application, path):
+        delay = self.options['client_delay'] / 1000
+
+        async def request(semaphore, started):
+            async with semaphore:
+                scope = {
+                    'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                    'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'root_path': '',
+                    'query_string': self.query_string().encode(),
+                    'headers': [(b'host', HOST.encode()), (b'accept', b'application/json')],
+                    'server': (HOST, 80), 'client': ('127.0.0.1', 0),
+                }
+                sent = asyncio.Event()
+                status, received = [], []
+
+                async def receive():
+                    if not received:
+                        received.append(True)
+                        return {'type': 'http.request', 'body': b'', 'more_body': False}
+                    await sent.wait()
+                    return {'type': 'http.disconnect'}
+
+                async def send(message):
+                    if message['type'] == 'http.response.start':
+                        status.append(message['status'])
+                    elif not message.get('more_body'):
+                        # A slow client only holds a coroutine, not a thread
+                        await asyncio.sleep(delay)
+                        sent.set()
+
+                async with ThreadSensitiveContext():
+                    await application(scope, receive, send)
+                return time.perf_counter() - started, status[0]
+
+        async def main():
+            semaphore = asyncio.Semaphore(self.options['concurrency'])
+            started = time.perf_counter()
+            return await asyncio.gather(*[request(semaphore, started) for _ in range(self.options['requests'])])
+
+        started = time.perf_counter()
+        results = asyncio.run(main())
+        return time.perf_counter() - started, [r[0] for r in results], [r[1] for r in results]
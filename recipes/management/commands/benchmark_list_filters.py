@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+from recipes.models import Recipe
+from recipes.views import LIST_DIETARY_PARAMS, RecipeListView
+
+# Filter and order combinations the list endpoint actually receives
+SCENARIOS = [
+    {},
+    {'vegetarian': 'true'},
+    {'vegan': 'true', 'gluten_free': 'true'},
+    {'vegetarian': 'true', 'max_time': '20'},
+    {'difficulty': 'easy'},
+    {'difficulty': 'hard', 'max_time': '30'},
+    {'vegan': 'true', 'ordering': 'total_time'},
+]
+
+
+def list_queryset(params):
+    """The queryset RecipeListView would paginate for these query params"""
+    view = RecipeListView()
+    view.request = Request(RequestFactory().get('/api/recipes/', params))
+    view.format_kwarg = None
+    return view.filter_queryset(view.get_queryset())
+
+
+def legacy_queryset(params):
+    """The same filters on the unpacked boolean columns, for comparison"""
+    queryset = list_queryset({key: value for key, value in params.items() if key not in LIST_DIETARY_PARAMS})
+    for param, field in LIST_DIETARY_PARAMS.items():
+        if params.get(param) == 'true':
+            queryset = queryset.filter(**{field: True})
+    return queryset
+
+
+def timed(queryset, repeat):
+    """Best-of-repeat milliseconds for one page plus its COUNT(*)"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        list(queryset.values_list('pk', flat=True)[:20])
+        queryset.count()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class Command(BaseCommand):
+    help = 'Show query plans and timings of the recipe list filters on the packed dietary_flags column'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Timing runs per query; the best is shown')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{Recipe.objects.count()} recipes')
+        for params in SCENARIOS:
+            query = '&'.join(f'{key}={value}' for key, value in params.items()) or '(no filters)'
+            queryset = list_queryset(params)
+            page = queryset.values_list('pk', flat=True)[:20]
+            self.stdout.write(self.style.MIGRATE_HEADING(query))
+            for line in page.explain().splitlines():
+                self.stdout.write(f'  {line}')
+            packed = timed(queryset, options['repeat'])
+            legacy = timed(legacy_queryset(params), options['repeat'])
+            self.stdout.write(f'  packed {packed:.2f}ms, boolean columns {legacy:.2f}ms')
@@ -0,0 +1,87 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from recipes.renderers import FastJSONRenderer, orjson
+from recipes.serializers import RecipeListSerializer
+from recipes.views import RecipeListView
+
+# Fieldsets the list clients ask for; None is the full serializer
+FIELDSETS = [
+    ('full', None),
+    ('card', 'name,slug,image,total_time,calories_per_serving'),
+    ('card+tags', 'name,slug,image,total_time,calories_per_serving,tags'),
+    ('no description', '-description'),
+]
+
+
+def page_params(fieldset):
+    params = {}
+    if fieldset and fieldset.startswith('-'):
+        params['omit'] = fieldset[1:]
+    elif fieldset:
+        params['fields'] = fieldset
+    return params
+
+
+def best_of(repeat, func):
+    """Best-of-repeat milliseconds of func() and its last result"""
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class Command(BaseCommand):
+    help = (
+        'Time loading, serializing and rendering a recipe list page with and without sparse fieldsets, '
+        'and FastJSONRenderer against DRF\'s JSONRenderer'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=20, help='Recipes per page')
+        parser.add_argument('--pages', type=int, default=10, help='Pages rendered per renderer timing')
+        parser.add_argument('--repeat', type=int, default=20, help='Timing runs per measurement; the best is shown')
+
+    def handle(self, *args, **options):
+        repeat, page_size = options['repeat'], options['page_size']
+        factory = RequestFactory()
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Sparse fieldsets, {page_size} recipes per page'))
+        self.stdout.write(f'{"fieldset":<16} {"load":>8} {"serialize":>10} {"render":>8} {"bytes":>8}')
+        pages = {}
+        for label, fieldset in FIELDSETS:
+            request = Request(factory.get('/api/recipes/', page_params(fieldset)))
+            view = RecipeListView(request=request, format_kwarg=None, args=(), kwargs={})
+            queryset = view.filter_queryset(view.get_queryset())
+
+            load, recipes = best_of(repeat, lambda: list(queryset.all()[:page_size]))
+            if not recipes:
+                raise CommandError('No recipes; run generate_catalog first.')
+            serialize, data = best_of(
+                repeat, lambda: RecipeListSerializer(recipes, many=True, context={'request': request}).data
+            )
+            render, content = best_of(repeat, lambda: JSONRenderer().render(data))
+            pages[label] = data
+            self.stdout.write(f'{label:<16} {load:>6.2f}ms {serialize:>8.2f}ms {render:>6.2f}ms {len(content):>8}')
+
+        count = options['pages']
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Renderers, {count} pages per run (orjson {"installed" if orjson else "not installed"})'
+        ))
+        for label, data in pages.items():
+            batch = [data] * count
+            default, expected = best_of(repeat, lambda: [JSONRenderer().render(page) for page in batch])
+            fast, actual = best_of(repeat, lambda: [FastJSONRenderer().render(page) for page in batch])
+            if actual != expected:
+                raise CommandError(f'FastJSONRenderer output differs from JSONRenderer for "{label}"')
+            self.stdout.write(
+                f'{label:<16} JSONRenderer {default:>7.2f}ms  FastJSONRenderer {fast:>7.2f}ms  '
+                f'({default / fast:.1f}x, identical bytes)'
+            )
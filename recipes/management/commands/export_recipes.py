@@ -0,0 +1,41 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.export import gzip_stream, iter_documents, parse_updated_since
+
+
+class Command(BaseCommand):
+    help = 'Export the recipe catalog as NDJSON, one detail document per line'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', nargs='?', default='-', help="Output file, or '-' for stdout")
+        parser.add_argument('--updated-since', help='Only export recipes changed at or after this ISO 8601 datetime')
+        parser.add_argument('--gzip', action='store_true', help='Gzip the output')
+
+    def handle(self, *args, **options):
+        updated_since = None
+        if options['updated_since']:
+            updated_since = parse_updated_since(options['updated_since'])
+            if updated_since is None:
+                raise CommandError('--updated-since must be an ISO 8601 datetime with a time zone')
+
+        count = 0
+
+        def lines():
+            nonlocal count
+            for line in iter_documents(updated_since=updated_since):
+                count += 1
+                yield line
+
+        chunks = gzip_stream(lines()) if options['gzip'] else lines()
+        if options['output'] == '-':
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            self.stderr.write(f'Exported {count} recipes')
+            return
+        with open(options['output'], 'wb') as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+        self.stdout.write(self.style.SUCCESS(f'Exported {count} recipes to {options["output"]}'))
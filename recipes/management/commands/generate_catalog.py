@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.importer import RecipeImporter
+from recipes.synthetic import generate_records
+
+
+class Command(BaseCommand):
+    help = 'Bulk insert a deterministic synthetic catalog for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=10000, help='Number of recipes to generate')
+        parser.add_argument('--seed', type=int, default=0, help='Same seed and size give the same catalog')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Recipes per transaction')
+        parser.add_argument(
+            '--skip-derived', action='store_true',
+            help='Do not build search rows, detail documents and similarity signatures; '
+                 'run the rebuild_* commands afterwards',
+        )
+
+    def handle(self, *args, **options):
+        if options['recipes'] < 1:
+            raise CommandError('--recipes must be positive')
+
+        importer = RecipeImporter(
+            batch_size=options['batch_size'],
+            refresh_derived=not options['skip_derived'],
+            log=self.stdout.write,
+        )
+        elapsed = importer.run(generate_records(options['recipes'], seed=options['seed']))
+
+        rate = importer.created / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {importer.created} recipes ({importer.skipped} already present) '
+            f'in {elapsed:.2f}s, {rate:.0f} recipes/s'
+        ))
+        if options['skip_derived'] and importer.created:
+            self.stdout.write(
+                'Run rebuild_search_index, rebuild_recipe_documents and rebuild_similarity_index to finish.'
+            )
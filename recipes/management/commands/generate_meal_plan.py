@@ -0,0 +1,37 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.meal_plans import MACROS, MealPlanUnavailable, generate_meal_plan, plan_document
+from recipes.nutrition import DIETARY_FLAGS
+
+
+class Command(BaseCommand):
+    help = 'Generate a multi-day meal plan from the recipe catalog and print it as JSON'
+
+    def add_arguments(self, parser):
+        for name in MACROS:
+            parser.add_argument(f'--{name}', type=float, help=f'Daily {name} target')
+        parser.add_argument('--days', type=int, default=7)
+        parser.add_argument('--meals-per-day', type=int, default=3)
+        for flag in DIETARY_FLAGS:
+            parser.add_argument(f'--{flag.replace("_", "-")}', action='store_true', dest=flag)
+        parser.add_argument('--avoid', action='append', default=[], help='Allergy or dislike (repeatable)')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        targets = {name: options[name] for name in MACROS if options[name] is not None}
+        if not targets:
+            raise CommandError('Pass at least one of ' + ', '.join(f'--{name}' for name in MACROS))
+        try:
+            plan = generate_meal_plan(
+                targets,
+                days=options['days'],
+                meals_per_day=options['meals_per_day'],
+                flags=[flag for flag in DIETARY_FLAGS if options[flag]],
+                avoid=options['avoid'],
+                seed=options['seed'],
+            )
+        except MealPlanUnavailable as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(json.dumps({'targets': targets, 'days': plan_document(plan)}, indent=2, default=str))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.importer import RecipeImporter, read_csv, read_jsonl
+
+
+class Command(BaseCommand):
+    help = 'Bulk import recipes from a JSONL or CSV catalog file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSONL file (one recipe per line) or CSV file')
+        parser.add_argument(
+            '--format', choices=['jsonl', 'csv'],
+            help='File format; guessed from the extension when omitted',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Recipes per transaction')
+        parser.add_argument(
+            '--skip-derived', action='store_true',
+            help='Do not build search rows, detail documents and similarity signatures; '
+                 'run the rebuild_* commands afterwards',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('csv' if path.endswith('.csv') else 'jsonl')
+        reader = read_csv if file_format == 'csv' else read_jsonl
+
+        importer = RecipeImporter(
+            batch_size=options['batch_size'],
+            refresh_derived=not options['skip_derived'],
+            log=self.stdout.write,
+        )
+        try:
+            elapsed = importer.run(reader(path))
+        except FileNotFoundError:
+            raise CommandError(f'File not found: {path}')
+        except (KeyError, ValueError) as exc:
+            raise CommandError(f'Invalid recipe record: {exc!r}')
+
+        rate = importer.created / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {importer.created} recipes ({importer.skipped} already present) '
+            f'in {elapsed:.2f}s, {rate:.0f} recipes/s'
+        ))
+        if options['skip_derived'] and importer.created:
+            self.stdout.write(
+                'Run rebuild_search_index, rebuild_recipe_documents and rebuild_similarity_index to finish the import.'
+            )
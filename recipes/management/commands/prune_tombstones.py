@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from recipes.changes import prune_tombstones, tombstone_retention
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete change-feed tombstones older than RECIPES_TOMBSTONE_RETENTION_DAYS; '
+        'clients with older sync tokens get a 410 and sync from scratch'
+    )
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(
+            f'Pruned {deleted} tombstones older than {tombstone_retention().days} days'
+        ))
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from recipes.documents import build_documents, schema_version
+from recipes.models import Recipe
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the precomputed recipe detail documents (run after changing RecipeDetailSerializer)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stale-only', action='store_true',
+            help='Only rebuild documents that are missing or were built with an older serializer schema',
+        )
+
+    def handle(self, *args, **options):
+        recipes = Recipe.objects.order_by('pk')
+        if options['stale_only']:
+            recipes = recipes.exclude(document__schema_version=schema_version())
+
+        started = time.perf_counter()
+        count = build_documents(recipes.values_list('pk', flat=True).iterator())
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Built {count} recipe documents in {elapsed:.2f}s'))
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from recipes.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the SQLite FTS5 index used by recipe search'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Full-text search requires the SQLite backend')
+
+        self.stdout.write('Rebuilding search index...')
+        started = time.perf_counter()
+        count = rebuild_index()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f'Indexed {count} recipes in {elapsed:.2f}s')
+        )
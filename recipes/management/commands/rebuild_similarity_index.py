@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.models import Recipe
+from recipes.similarity import np, similarity_index, update_signatures
+
+
+class Command(BaseCommand):
+    help = 'Recompute the MinHash signatures behind the similar-recipes endpoint'
+
+    def handle(self, *args, **options):
+        if np is None:
+            raise CommandError('Similar recipes require NumPy.')
+
+        started = time.perf_counter()
+        count = update_signatures(Recipe.objects.order_by('pk').values_list('pk', flat=True).iterator())
+        similarity_index.invalidate()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Built {count} recipe signatures in {elapsed:.2f}s'))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.models import RecipeStats
+from recipes.stats import STATS_PK, live_totals, recompute
+
+
+class Command(BaseCommand):
+    help = 'Recompute the materialized recipe stats record and verify it against live aggregates'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify-only', action='store_true',
+            help='Only compare the stored record with the live aggregates',
+        )
+
+    def handle(self, *args, **options):
+        stored = RecipeStats.objects.filter(pk=STATS_PK).values(
+            'total_recipes', 'total_time_sum', 'calories_sum',
+            'vegetarian_count', 'vegan_count',
+        ).first()
+        live = live_totals()
+
+        drift = [field for field in live if stored is None or stored[field] != live[field]]
+        for field in drift:
+            self.stdout.write(f'{field}: stored={stored[field] if stored else None!r} live={live[field]!r}')
+
+        if options['verify_only']:
+            if drift:
+                raise CommandError(f'Stats record is out of date ({len(drift)} fields differ)')
+            self.stdout.write(self.style.SUCCESS('Stats record matches live aggregates'))
+            return
+
+        recompute()
+        self.stdout.write(self.style.SUCCESS(
+            f'Recomputed stats for {live["total_recipes"]} recipes ({len(drift)} fields corrected)'
+        ))
@@ -0,0 +1,21 @@
+from django.db.models import Count
+from django.core.management.base import BaseCommand
+
+from recipes.models import Category
+from recipes.stats import recount_categories
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored Category.recipe_count counters from the recipe table'
+
+    def handle(self, *args, **options):
+        drifted = {
+            name: (stored, live) for name, stored, live in
+            Category.objects.annotate(live=Count('recipes')).values_list('name', 'recipe_count', 'live')
+            if stored != live
+        }
+        for name, (stored, live) in drifted.items():
+            self.stdout.write(f'{name}: stored={stored} live={live}')
+
+        recount_categories()
+        self.stdout.write(self.style.SUCCESS(f'Repaired {len(drifted)} category counters'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from recipes.models import Recipe, packed_dietary_flags
+
+
+class Command(BaseCommand):
+    help = 'Recompute the packed Recipe.dietary_flags column from the boolean flag columns'
+
+    def handle(self, *args, **options):
+        repaired = Recipe.objects.exclude(dietary_flags=packed_dietary_flags()).repack_dietary_flags()
+        self.stdout.write(self.style.SUCCESS(f'Repaired {repaired} recipes'))
@@ -0,0 +1,38 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from recipes.db import read_replicas, replica_path
+from recipes.response_cache import bump_catalog_version
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database into every read replica file'
+
+    def handle(self, *args, **options):
+        replicas = read_replicas()
+        if not replicas:
+            raise CommandError('No read replicas configured; set RECIPES_SQLITE_REPLICAS.')
+        primary = connections['default']
+        if primary.vendor != 'sqlite':
+            raise CommandError('Replica snapshots need a SQLite primary.')
+
+        primary.ensure_connection()
+        for alias in replicas:
+            path = replica_path(alias)
+            started = time.perf_counter()
+            # The backup API copies a consistent snapshot into the existing file,
+            # so readers with open connections see it on their next query
+            target = sqlite3.connect(path, timeout=30)
+            try:
+                primary.connection.backup(target)
+                target.execute('PRAGMA journal_mode = DELETE')
+            finally:
+                target.close()
+            self.stdout.write(f'{alias}: {path} in {time.perf_counter() - started:.2f}s')
+
+        # Cached responses may have been rendered from the previous snapshots
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(f'Refreshed {len(replicas)} replicas'))
@@ -0,0 +1,78 @@
+import time
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is only needed by meal planning
+    np = None
+
+# Runs in the meal_plans worker processes, so this module must not import
+# Django: under the spawn and forkserver start methods a worker imports it
+# fresh, without django.setup().
+
+
+def _day_error(totals, targets, scales):
+    """Summed squared relative error of day totals; works on one day or a column of candidates"""
+    return sum(((totals[name] - target) / scales[name]) ** 2 for name, target in targets.items())
+
+
+def optimize_plan(columns, targets, days, meals_per_day, time_budget, seed=0):
+    """
+    Pick `meals_per_day` candidate indexes for each of `days` days.
+
+    Runs in a worker process, on plain NumPy arrays only. A greedy pass
+    fills each slot with a recipe (among the few best) that moves the day
+    toward its target pro rata. Local search then replaces single meals
+    with the best unused candidate while that lowers the day's error,
+    until a full pass over the plan changes nothing or the time budget
+    runs out. No candidate is used twice unless the pool is smaller than
+    the plan.
+    """
+    deadline = time.perf_counter() + time_budget
+    rng = np.random.default_rng(seed)
+    count = len(next(iter(columns.values())))
+    scales = {name: max(abs(target), 1.0) for name, target in targets.items()}
+    used = np.zeros(count, dtype=bool)
+    plan = []
+
+    def pick(totals, goal, exclude_used=True, top=3):
+        error = _day_error({name: totals[name] + columns[name] for name in targets}, goal, scales)
+        if exclude_used and not used.all():
+            error = np.where(used, np.inf, error)
+        best = np.argsort(error)[:top]
+        best = best[np.isfinite(error[best])]
+        return int(rng.choice(best)) if len(best) else int(np.argmin(error))
+
+    for _ in range(days):
+        meals = []
+        totals = {name: 0.0 for name in targets}
+        for slot in range(meals_per_day):
+            goal = {name: target * (slot + 1) / meals_per_day for name, target in targets.items()}
+            index = pick(totals, goal)
+            used[index] = True
+            meals.append(index)
+            for name in targets:
+                totals[name] += columns[name][index]
+        plan.append(meals)
+
+    # Local search: swap one meal at a time for the best unused candidate
+    # while it helps; a pass without a swap is a local optimum
+    slots = [(day, slot) for day in range(days) for slot in range(meals_per_day)]
+    improved = True
+    while improved:
+        improved = False
+        for position in rng.permutation(len(slots)):
+            if time.perf_counter() >= deadline:
+                return plan
+            day, slot = slots[position]
+            current = plan[day][slot]
+            rest = {name: sum(columns[name][i] for i in plan[day]) - columns[name][current] for name in targets}
+            before = _day_error({name: rest[name] + columns[name][current] for name in targets}, targets, scales)
+            error = _day_error({name: rest[name] + columns[name] for name in targets}, targets, scales)
+            error = np.where(used, np.inf, error)
+            candidate = int(np.argmin(error))
+            if np.isfinite(error[candidate]) and error[candidate] < before:
+                used[current] = False
+                used[candidate] = True
+                plan[day][slot] = candidate
+                improved = True
+    return plan
@@ -0,0 +1,137 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from .ingredient_index import ingredient_index
+from .meal_optimizer import optimize_plan
+from .models import Recipe
+from .nutrition import np, nutrition_engine
+from .serializers import RecipeListSerializer
+
+MACROS = ['calories', 'protein', 'carbs', 'fat']
+
+# How many of the recipes closest to a per-meal target the optimizer gets to pick from
+CANDIDATE_POOL_SIZE = 2000
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+
+class MealPlanUnavailable(Exception):
+    pass
+
+
+def get_executor():
+    """The bounded pool shared by every meal-plan request in this process"""
+    global _executor, _slots
+    with _lock:
+        if _executor is None:
+            workers = getattr(settings, 'RECIPES_MEAL_PLAN_WORKERS', None) or min(4, os.cpu_count() or 1)
+            if _slots is None:
+                pending = getattr(settings, 'RECIPES_MEAL_PLAN_MAX_PENDING', None) or 2 * workers
+                _slots = threading.BoundedSemaphore(pending)
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        return _executor
+
+
+def discard_executor(executor):
+    """Drop a broken pool so the next request starts a fresh one"""
+    global _executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def submit(fn, *args):
+    """
+    Run fn in the pool, or raise MealPlanUnavailable when too many jobs are in flight.
+
+    A slot is held until the job finishes, not until its caller stops
+    waiting, so jobs abandoned on timeout still count against the bound.
+    A pool whose worker died is broken for good; it is discarded, and
+    the job fails with MealPlanUnavailable.
+    """
+    executor = get_executor()
+    slots = _slots
+    if not slots.acquire(blocking=False):
+        raise MealPlanUnavailable('Meal planner is busy, try again shortly.')
+    try:
+        future = executor.submit(fn, *args)
+    except BrokenProcessPool:
+        slots.release()
+        discard_executor(executor)
+        raise MealPlanUnavailable('Meal planner is restarting, try again shortly.')
+    except BaseException:
+        slots.release()
+        raise
+
+    def done(future):
+        slots.release()
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            discard_executor(executor)
+
+    future.add_done_callback(done)
+    return future
+
+
+def excluded_recipes(terms):
+    """Recipes with an ingredient matching any allergy or dislike"""
+    excluded = set()
+    for term in terms:
+        term = term.strip()
+        if term:
+            excluded |= ingredient_index.recipes_with_ingredient(term)
+    return excluded
+
+
+def generate_meal_plan(targets, days=7, meals_per_day=3, flags=(), avoid=(), seed=0):
+    """
+    Build a multi-day plan meeting daily `targets` (macro name -> amount).
+
+    Returns a list of days, each a list of recipe ids. The candidate pool
+    is chosen here with the nutrition engine; the optimization itself runs
+    in the process pool under the configured time budget.
+    """
+    if np is None:
+        raise MealPlanUnavailable('Meal planning requires NumPy.')
+    per_meal = {name: target / meals_per_day for name, target in targets.items()}
+    pool, _ = nutrition_engine.rank(per_meal, flags=flags, limit=CANDIDATE_POOL_SIZE, exclude=excluded_recipes(avoid))
+    if not pool:
+        return []
+    columns = nutrition_engine.column_values(pool, list(targets))
+
+    time_budget = getattr(settings, 'RECIPES_MEAL_PLAN_TIME_BUDGET', 0.25)
+    future = submit(optimize_plan, columns, targets, days, meals_per_day, time_budget, seed)
+    try:
+        plan = future.result(timeout=time_budget + getattr(settings, 'RECIPES_MEAL_PLAN_QUEUE_TIMEOUT', 2.0))
+    except FutureTimeout:
+        future.cancel()
+        raise MealPlanUnavailable('Meal planner is busy, try again shortly.')
+    except BrokenProcessPool:
+        raise MealPlanUnavailable('Meal planner is restarting, try again shortly.')
+    return [[pool[index] for index in meals] for meals in plan]
+
+
+def plan_document(plan):
+    """Expand a plan of recipe ids into days of serialized recipes with their totals"""
+    recipes = Recipe.objects.with_list_relations().in_bulk([pk for meals in plan for pk in meals])
+    days = []
+    for number, meals in enumerate(plan, 1):
+        day_recipes = [recipes[pk] for pk in meals if pk in recipes]
+        days.append({
+            'day': number,
+            'recipes': RecipeListSerializer(day_recipes, many=True).data,
+            'totals': {
+                'calories': sum(recipe.calories_per_serving for recipe in day_recipes),
+                'protein': round(sum(recipe.protein_grams for recipe in day_recipes), 1),
+                'carbs': round(sum(recipe.carbs_grams for recipe in day_recipes), 1),
+                'fat': round(sum(recipe.fat_grams for recipe in day_recipes), 1),
+            },
+        })
+    return days
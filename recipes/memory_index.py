@@ -0,0 +1,56 @@
+import threading
+
+from django.core.cache import cache
+
+from .db import use_primary
+
+
+class SharedMemoryIndex:
+    """
+    Base for per-process, in-memory read structures over the catalog.
+
+    Subclasses implement load() to read everything they need from the
+    database. Writes in this process patch the structure directly and bump
+    a version kept in the shared cache; a worker that sees a version it did
+    not produce reloads on its next query. That only works when the default
+    cache really is shared between workers, see recipes.checks.
+    """
+    version_key = None
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._version = None
+
+    def load(self):
+        raise NotImplementedError
+
+    def build(self):
+        # Read the version first so a write racing with load() triggers another reload
+        version = cache.get(self.version_key, 0)
+        # Load from the primary: a replica snapshot may predate the version
+        with use_primary():
+            self.load()
+        with self._lock:
+            self._version = version
+            self._built = True
+
+    def ensure_built(self):
+        if not self._built or cache.get(self.version_key, 0) != self._version:
+            self.build()
+
+    def invalidate(self):
+        with self._lock:
+            self._built = False
+        self._bump_version()
+
+    def _bump_version(self):
+        current = cache.get(self.version_key, 0)
+        if current != self._version:
+            # Another worker wrote since our last build, so our copy is stale anyway
+            self._built = False
+        try:
+            self._version = cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, current + 1, None)
+            self._version = current + 1
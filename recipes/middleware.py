@@ -0,0 +1,72 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.utils.deprecation import MiddlewareMixin
+
+from .db import read_from_replica
+from .instrumentation import finish_request, measure_request, slow_request_threshold
+
+
+class AsgiUrlconfMiddleware(MiddlewareMixin):
+    """Resolve requests that came in through the ASGI handler with settings.RECIPES_ASGI_URLCONF"""
+
+    def process_request(self, request):
+        urlconf = getattr(settings, 'RECIPES_ASGI_URLCONF', None)
+        if urlconf and isinstance(request, ASGIRequest):
+            request.urlconf = urlconf
+
+
+class ReadReplicaMiddleware:
+    """Serve safe requests under settings.RECIPES_READ_REPLICA_PATHS from a read replica"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def uses_replica(self, request):
+        return request.method in ('GET', 'HEAD') and request.path.startswith(
+            tuple(getattr(settings, 'RECIPES_READ_REPLICA_PATHS', []))
+        )
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with read_from_replica(self.uses_replica(request)):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with read_from_replica(self.uses_replica(request)):
+            return await self.get_response(request)
+
+
+class InstrumentationMiddleware:
+    """
+    Time every request: SQL (count and duration), serializers and rendering.
+
+    The numbers go out in a Server-Timing header and into the per-route
+    histograms served by the metrics view. When settings.RECIPES_SLOW_REQUEST_MS
+    is set, requests slower than that log their SQL with call stacks.
+    Goes first in MIDDLEWARE so the total covers the whole stack.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with measure_request(capture_queries=slow_request_threshold() is not None) as timings:
+            response = self.get_response(request)
+        return finish_request(request, response, timings)
+
+    async def __acall__(self, request):
+        with measure_request(capture_queries=slow_request_threshold() is not None) as timings:
+            response = await self.get_response(request)
+        return finish_request(request, response, timings)
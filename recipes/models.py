@@ -1,12 +1,15 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils.text import slugify
 from django.core.validators import MinValueValidator, MaxValueValidator
+from .quantities import parse_quantity
 
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True)
     emoji = models.CharField(max_length=10, default='🍽️')
+    recipe_count = models.PositiveIntegerField(default=0, editable=False, help_text="Maintained by recipe signals")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         verbose_name_plural = "Categories"
@@ -14,16 +17,13 @@ class Category(models.Model):
     
     def __str__(self):
         return self.name
-    
-    @property
-    def recipe_count(self):
-        return self.recipes.count()
 
 class Ingredient(models.Model):
     name = models.CharField(max_length=100, unique=True)
     emoji = models.CharField(max_length=10, default='🥗')
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         ordering = ['name']
@@ -31,6 +31,67 @@ class Ingredient(models.Model):
     def __str__(self):
         return self.name
 
+# Dietary flag field -> bit in Recipe.dietary_flags
+DIETARY_BITS = {
+    'is_vegetarian': 1,
+    'is_vegan': 2,
+    'is_gluten_free': 4,
+    'is_dairy_free': 8,
+}
+
+def pack_dietary_flags(values):
+    """Bitmask of the dietary flags set in a field -> value mapping"""
+    return sum(bit for field, bit in DIETARY_BITS.items() if values.get(field))
+
+def packed_dietary_flags():
+    """SQL expression computing dietary_flags from the boolean columns"""
+    return sum(
+        (models.Case(models.When(**{field: True}, then=models.Value(bit)), default=models.Value(0))
+         for field, bit in DIETARY_BITS.items()),
+        models.Value(0),
+    )
+
+class RecipeQuerySet(models.QuerySet):
+    def with_list_relations(self, fields=None):
+        """
+        Load everything RecipeListSerializer touches in a fixed number of queries.
+        
+        With a sparse fieldset in `fields`, relations whose fields are not
+        serialized are left out.
+        """
+        queryset = self
+        if fields is None or 'category' in fields:
+            queryset = queryset.select_related('category')
+        if fields is None or 'tags' in fields:
+            queryset = queryset.prefetch_related(
+                models.Prefetch('recipe_tags', queryset=Recipe_Tag.objects.select_related('tag'))
+            )
+        return queryset
+    
+    def with_detail_relations(self, fields=None):
+        """Load everything RecipeDetailSerializer touches in a fixed number of queries; see with_list_relations()"""
+        queryset = self.with_list_relations(fields)
+        if fields is None or 'recipe_ingredients' in fields:
+            queryset = queryset.prefetch_related(
+                models.Prefetch('recipe_ingredients', queryset=RecipeIngredient.objects.select_related('ingredient'))
+            )
+        if fields is None or 'steps' in fields:
+            queryset = queryset.prefetch_related('steps')
+        return queryset
+    
+    def with_dietary_flags(self, *fields):
+        """Recipes having every given flag, as an indexable IN over the few matching bitmasks"""
+        mask = sum(DIETARY_BITS[field] for field in fields)
+        if not mask:
+            return self
+        return self.filter(dietary_flags__in=[
+            value for value in range(sum(DIETARY_BITS.values()) + 1) if value & mask == mask
+        ])
+    
+    def repack_dietary_flags(self):
+        """Rewrite dietary_flags from the boolean columns, for rows changed by bulk updates"""
+        return self.update(dietary_flags=packed_dietary_flags())
+
 class Recipe(models.Model):
     DIFFICULTY_CHOICES = [
         ('easy', 'Easy'),
@@ -63,21 +124,46 @@ class Recipe(models.Model):
     is_vegan = models.BooleanField(default=False)
     is_gluten_free = models.BooleanField(default=False)
     is_dairy_free = models.BooleanField(default=False)
+    dietary_flags = models.PositiveSmallIntegerField(
+        default=0, editable=False, help_text="Packed is_* flags, see DIETARY_BITS; maintained in save()"
+    )
     
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_featured = models.BooleanField(default=False)
     
+    objects = RecipeQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        # Match the list endpoint's filter and order combinations
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='recipe_created_idx'),
+            models.Index(fields=['dietary_flags', '-created_at'], name='recipe_diet_created_idx'),
+            models.Index(fields=['dietary_flags', 'total_time'], name='recipe_diet_time_idx'),
+            models.Index(fields=['difficulty', '-created_at'], name='recipe_diff_created_idx'),
+            models.Index(fields=['difficulty', 'total_time'], name='recipe_diff_time_idx'),
+            # Keyset order of the change feed
+            models.Index(fields=['updated_at', 'id'], name='recipe_updated_idx'),
+        ]
     
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
         if not self.total_time:
             self.total_time = self.prep_time + self.cook_time
-        super().save(*args, **kwargs)
+        self.dietary_flags = pack_dietary_flags({field: getattr(self, field) for field in DIETARY_BITS})
+        update_fields = kwargs.get('update_fields')
+        if update_fields:
+            # auto_now only reaches the row when updated_at is saved, and the change feed relies on it
+            extra = {'updated_at'}
+            if set(update_fields) & set(DIETARY_BITS):
+                extra.add('dietary_flags')
+            kwargs['update_fields'] = set(update_fields) | extra
+        # Keep the denormalized counters written by post_save in the same transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
     
     def __str__(self):
         return self.name
@@ -87,10 +173,20 @@ class RecipeIngredient(models.Model):
     ingredient = models.ForeignKey(Ingredient, on_delete=models.CASCADE)
     quantity = models.CharField(max_length=50, help_text="e.g., '2 cups', '1 tbsp'")
     notes = models.CharField(max_length=200, blank=True, help_text="e.g., 'chopped', 'optional'")
+    # Parsed from quantity in save(); amount is null when quantity has no leading number
+    amount = models.FloatField(null=True, blank=True, editable=False)
+    unit = models.CharField(max_length=20, blank=True, editable=False, help_text="Normalized unit, see quantities.UNITS; blank for counted items")
     
     class Meta:
         unique_together = ['recipe', 'ingredient']
     
+    def save(self, *args, **kwargs):
+        self.amount, self.unit = parse_quantity(self.quantity)
+        update_fields = kwargs.get('update_fields')
+        if update_fields and 'quantity' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'amount', 'unit'}
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         return f"{self.quantity} {self.ingredient.name}"
     
@@ -118,6 +214,7 @@ class RecipeStep(models.Model):
 class RecipeTag(models.Model):
     name = models.CharField(max_length=50, unique=True)
     color = models.CharField(max_length=7, default='#10b981', help_text="Hex color code")
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def __str__(self):
         return self.name
@@ -127,4 +224,89 @@ class Recipe_Tag(models.Model):
     tag = models.ForeignKey(RecipeTag, on_delete=models.CASCADE)
     
     class Meta:
-        unique_together = ['recipe', 'tag']
\ No newline at end of file
+        unique_together = ['recipe', 'tag']
+
+class RecipeStats(models.Model):
+    """Catalog-wide totals behind /api/stats/, maintained incrementally by signals"""
+    total_recipes = models.PositiveIntegerField(default=0)
+    total_time_sum = models.BigIntegerField(default=0)
+    calories_sum = models.BigIntegerField(default=0)
+    vegetarian_count = models.PositiveIntegerField(default=0)
+    vegan_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name_plural = "Recipe stats"
+    
+    def __str__(self):
+        return f"{self.total_recipes} recipes"
+
+class RecipeDocument(models.Model):
+    """The rendered RecipeDetailSerializer output for one recipe, plain and gzipped"""
+    recipe = models.OneToOneField(Recipe, on_delete=models.CASCADE, primary_key=True, related_name='document')
+    content = models.BinaryField()
+    content_gzip = models.BinaryField()
+    schema_version = models.CharField(max_length=40, help_text="Changes whenever RecipeDetailSerializer's fields do")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Document for recipe {self.recipe_id}"
+
+class RecipeSignature(models.Model):
+    """MinHash signature of a recipe's ingredient and tag set, used for similar-recipe lookups"""
+    recipe = models.OneToOneField(Recipe, on_delete=models.CASCADE, primary_key=True, related_name='signature')
+    signature = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Signature for recipe {self.recipe_id}"
+
+class SearchDocumentField(models.TextField):
+    """The FTS5 table's hidden column named after the table, the left side of MATCH and bm25()"""
+
+@SearchDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+    
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+class BM25(models.Func):
+    """FTS5 relevance of the matched row; lower is better"""
+    function = 'bm25'
+    arity = 1
+    output_field = models.FloatField()
+
+class RecipeSearchDocument(models.Model):
+    """
+    Row of the SQLite FTS5 search table, created and filled by recipes.search.
+    
+    Not managed by migrations; it exists so ?search= can join the table
+    through the ORM. rowid is the recipe id.
+    """
+    recipe = models.OneToOneField(
+        Recipe, on_delete=models.DO_NOTHING, primary_key=True, db_column='rowid', related_name='search_document',
+    )
+    document = SearchDocumentField(db_column='recipes_recipe_fts')
+    
+    class Meta:
+        managed = False
+        db_table = 'recipes_recipe_fts'
+
+class Tombstone(models.Model):
+    """A deleted catalog row, kept so the change feed can tell syncing clients to drop it"""
+    KIND_CHOICES = [
+        ('recipe', 'Recipe'),
+        ('category', 'Category'),
+        ('ingredient', 'Ingredient'),
+        ('tag', 'Tag'),
+    ]
+    
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    def __str__(self):
+        return f"Deleted {self.kind} {self.object_id}"
@@ -0,0 +1,139 @@
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is only needed by the matching endpoint
+    np = None
+
+from .memory_index import SharedMemoryIndex
+from .models import DIETARY_BITS, Recipe
+
+NUTRITION_VERSION_KEY = 'recipes:nutrition_engine:version'
+
+# Column name -> Recipe field
+COLUMNS = {
+    'calories': 'calories_per_serving',
+    'protein': 'protein_grams',
+    'carbs': 'carbs_grams',
+    'fat': 'fat_grams',
+    'fiber': 'fiber_grams',
+    'time': 'total_time',
+}
+
+# Query param -> (Recipe field, bit in Recipe.dietary_flags)
+DIETARY_FLAGS = {
+    param: (field, DIETARY_BITS[field])
+    for param, field in [
+        ('vegetarian', 'is_vegetarian'),
+        ('vegan', 'is_vegan'),
+        ('gluten_free', 'is_gluten_free'),
+        ('dairy_free', 'is_dairy_free'),
+    ]
+}
+
+
+class NutritionEngine(SharedMemoryIndex):
+    """
+    Column arrays of every recipe's nutrition, time and dietary flags.
+
+    Ranking a macro target is a handful of vectorized NumPy operations over
+    the whole catalog: mask by ranges and flags, compute the relative
+    distance to the target, then partial-sort the best k. Edits to existing
+    recipes are patched in place; creates make the next query reload.
+    """
+    version_key = NUTRITION_VERSION_KEY
+
+    def __init__(self):
+        super().__init__()
+        self._ids = None
+        self._rows = {}
+        self._columns = {}
+        self._flags = None
+        self._alive = None
+
+    def load(self):
+        fields = list(COLUMNS.values()) + ['dietary_flags']
+        rows = list(Recipe.objects.order_by('pk').values_list('pk', *fields).iterator())
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        columns = {
+            name: np.fromiter((row[i] for row in rows), dtype=np.float64, count=len(rows))
+            for i, name in enumerate(COLUMNS, 1)
+        }
+        flags = np.fromiter((row[-1] for row in rows), dtype=np.uint8, count=len(rows))
+
+        with self._lock:
+            self._ids = ids
+            self._rows = {int(pk): row for row, pk in enumerate(ids)}
+            self._columns = columns
+            self._flags = flags
+            self._alive = np.ones(len(rows), dtype=bool)
+
+    def update_recipe(self, recipe_id):
+        if not self._built or recipe_id not in self._rows:
+            self.invalidate()
+            return
+        fields = list(COLUMNS.values()) + ['dietary_flags']
+        values = Recipe.objects.filter(pk=recipe_id).values_list(*fields).first()
+        if values is None:
+            self.remove_recipe(recipe_id)
+            return
+        with self._lock:
+            row = self._rows[recipe_id]
+            for i, name in enumerate(COLUMNS):
+                self._columns[name][row] = values[i]
+            self._flags[row] = values[-1]
+            self._alive[row] = True
+        self._bump_version()
+
+    def remove_recipe(self, recipe_id):
+        with self._lock:
+            if self._built and recipe_id in self._rows:
+                self._alive[self._rows[recipe_id]] = False
+        self._bump_version()
+
+    def column_values(self, recipe_ids, names):
+        """Return {name: array} for the given recipes, in the order given"""
+        self.ensure_built()
+        with self._lock:
+            rows = np.array([self._rows[pk] for pk in recipe_ids], dtype=np.int64)
+            return {name: self._columns[name][rows] for name in names}
+
+    def rank(self, targets, ranges=None, flags=(), limit=20, exclude=()):
+        """
+        Return (recipe ids, distances) of the `limit` recipes closest to `targets`.
+
+        `targets` maps column names to per-serving values, `ranges` maps
+        column names to (min, max) with None for an open end and `flags`
+        lists DIETARY_FLAGS keys every result must have. Recipe ids in
+        `exclude` are never returned. The distance is the root of the
+        summed squared relative errors, so calories do not outweigh grams.
+        """
+        self.ensure_built()
+        with self._lock:
+            mask = self._alive.copy()
+            for name, (low, high) in (ranges or {}).items():
+                column = self._columns[name]
+                if low is not None:
+                    mask &= column >= low
+                if high is not None:
+                    mask &= column <= high
+            required = sum(DIETARY_FLAGS[flag][1] for flag in flags)
+            if required:
+                mask &= (self._flags & required) == required
+            if len(exclude):
+                mask &= ~np.isin(self._ids, np.fromiter(exclude, dtype=np.int64, count=len(exclude)))
+
+            candidates = np.flatnonzero(mask)
+            if not len(candidates) or limit <= 0:
+                return [], []
+            distance = np.zeros(len(candidates))
+            for name, target in targets.items():
+                error = (self._columns[name][candidates] - target) / max(abs(target), 1.0)
+                distance += error * error
+            distance = np.sqrt(distance)
+
+            k = min(limit, len(candidates))
+            best = np.argpartition(distance, k - 1)[:k]
+            best = best[np.argsort(distance[best], kind='stable')]
+            return self._ids[candidates[best]].tolist(), distance[best].tolist()
+
+
+nutrition_engine = NutritionEngine()
@@ -0,0 +1,199 @@
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Paginator
+from django.db import connections
+from django.db.models import Max, Min, Q, QuerySet
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class RecipePageNumberPagination(PageNumberPagination):
+    """The default page number pagination, plus an async variant for the ASGI views"""
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        # Count up front so Paginator.page() only has to slice the queryset
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+        self.page.object_list = [obj async for obj in self.page.object_list]
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+
+        return list(self.page)
+
+
+class RecipeKeysetPagination(BasePagination):
+    """
+    Keyset pagination over (ordering field, id).
+
+    Each page is a range scan starting right after the last row of the
+    previous page, so there is no COUNT(*) and no OFFSET no matter how
+    deep the client pages. The `id` tiebreaker keeps the order stable for
+    fields with duplicate values such as `total_time` or `name`. A cursor
+    records the ordering it was made for and only works with that one.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return self.set_page([obj async for obj in self.page_queryset(queryset, request, view)])
+
+    def page_queryset(self, queryset, request, view=None):
+        """The lazy queryset of the requested page plus one row to detect a further page"""
+        self.request = request
+        self.field, self.descending = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request, queryset.model)
+        self.reverse = bool(self.cursor and self.cursor['r'])
+
+        # Walking backwards means flipping both the comparison and the sort
+        descending = self.descending != self.reverse
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(prefix + self.field, prefix + 'id')
+
+        if self.cursor is not None:
+            lookup = 'lt' if descending else 'gt'
+            value, pk = self.cursor['v'], self.cursor['id']
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': value}) |
+                Q(**{self.field: value, f'id__{lookup}': pk})
+            )
+
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        self.has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        # Going forward there is a next page only if we over-fetched;
+        # going backward we always came from a later page
+        if not self.page or (not self.reverse and not self.has_more):
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.page or self.cursor is None or (self.reverse and not self.has_more):
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_ordering(self, request, queryset, view):
+        """Return the primary ordering field and its direction"""
+        ordering = OrderingFilter().get_ordering(request, queryset, view) or ['-created_at']
+        field = ordering[0]
+        return field.lstrip('-'), field.startswith('-')
+
+    @property
+    def ordering(self):
+        return ('-' if self.descending else '') + self.field
+
+    def decode_cursor(self, request, model):
+        """The cursor param with `v` converted to the ordering field's type; NotFound when unusable"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            if cursor['o'] != self.ordering or cursor['v'] is None:
+                raise ValueError('Cursor made for another ordering')
+            value = model._meta.get_field(self.field).to_python(cursor['v'])
+            cursor = {'v': value, 'id': int(cursor['id']), 'r': bool(cursor.get('r'))}
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, obj, reverse):
+        value = getattr(obj, self.field)
+        if hasattr(value, 'isoformat'):
+            # DjangoJSONEncoder truncates to milliseconds, which would skip rows
+            value = value.isoformat()
+        payload = {'o': self.ordering, 'v': value, 'id': obj.pk}
+        if reverse:
+            payload['r'] = 1
+        encoded = b64encode(json.dumps(payload).encode('utf-8')).decode('ascii')
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, 'page')
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for admin changelists of large tables.
+
+    An unfiltered queryset is counted from an estimate instead of a full
+    COUNT(*): the planner's row count on PostgreSQL, and elsewhere the
+    span of the integer primary key, which only overshoots by the rows
+    deleted since. Small tables and filtered querysets are counted exactly.
+    """
+    exact_count_limit = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and not queryset.query.where:
+            estimate = estimated_row_count(queryset)
+            if estimate is not None and estimate > self.exact_count_limit:
+                return estimate
+        return super().count
+
+
+def estimated_row_count(queryset):
+    """Rough number of rows in the queryset's table, or None when there is no cheap estimate"""
+    model = queryset.model
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [model._meta.db_table])
+            row = cursor.fetchone()
+        # -1 until the table was first analyzed
+        return int(row[0]) if row and row[0] >= 0 else None
+    if model._meta.pk.get_internal_type() not in ('AutoField', 'BigAutoField'):
+        return None
+    span = model._default_manager.using(queryset.db).aggregate(low=Min('pk'), high=Max('pk'))
+    if span['low'] is None:
+        return 0
+    return span['high'] - span['low'] + 1
@@ -0,0 +1,77 @@
+import re
+from fractions import Fraction
+
+UNICODE_FRACTIONS = {
+    '½': '1/2', '⅓': '1/3', '⅔': '2/3', '¼': '1/4', '¾': '3/4',
+    '⅕': '1/5', '⅖': '2/5', '⅗': '3/5', '⅘': '4/5', '⅙': '1/6', '⅚': '5/6', '⅛': '1/8', '⅜': '3/8', '⅝': '5/8', '⅞': '7/8',
+}
+
+# Spelling -> (normalized unit, factor to it). Metric units fold into g
+# and ml; kitchen measures keep their own unit so a shopping list reads
+# "2 cup", not "473 ml". Size words count whole items, like no unit at all.
+# Other words are kept as written, see parse_quantity.
+UNITS = {
+    'g': ('g', 1), 'gram': ('g', 1), 'grams': ('g', 1), 'gr': ('g', 1),
+    'kg': ('g', 1000), 'kilogram': ('g', 1000), 'kilograms': ('g', 1000),
+    'mg': ('g', 0.001),
+    'ml': ('ml', 1), 'milliliter': ('ml', 1), 'milliliters': ('ml', 1), 'millilitre': ('ml', 1), 'millilitres': ('ml', 1),
+    'l': ('ml', 1000), 'liter': ('ml', 1000), 'liters': ('ml', 1000), 'litre': ('ml', 1000), 'litres': ('ml', 1000),
+    'oz': ('oz', 1), 'ounce': ('oz', 1), 'ounces': ('oz', 1),
+    'lb': ('lb', 1), 'lbs': ('lb', 1), 'pound': ('lb', 1), 'pounds': ('lb', 1),
+    'cup': ('cup', 1), 'cups': ('cup', 1),
+    'pint': ('pint', 1), 'pints': ('pint', 1), 'quart': ('quart', 1), 'quarts': ('quart', 1),
+    'gallon': ('gallon', 1), 'gallons': ('gallon', 1),
+    'tbsp': ('tbsp', 1), 'tbs': ('tbsp', 1), 'tablespoon': ('tbsp', 1), 'tablespoons': ('tbsp', 1),
+    'tsp': ('tsp', 1), 'teaspoon': ('tsp', 1), 'teaspoons': ('tsp', 1),
+    'clove': ('clove', 1), 'cloves': ('clove', 1),
+    'pinch': ('pinch', 1), 'pinches': ('pinch', 1),
+    'handful': ('handful', 1), 'handfuls': ('handful', 1),
+    'slice': ('slice', 1), 'slices': ('slice', 1),
+    'can': ('can', 1), 'cans': ('can', 1),
+    'bunch': ('bunch', 1), 'bunches': ('bunch', 1),
+    'sprig': ('sprig', 1), 'sprigs': ('sprig', 1),
+    'stick': ('stick', 1), 'sticks': ('stick', 1),
+    'package': ('package', 1), 'packages': ('package', 1), 'pkg': ('package', 1),
+    'small': ('', 1), 'medium': ('', 1), 'large': ('', 1), 'whole': ('', 1),
+}
+
+# Unknown unit words are cut to the max_length of RecipeIngredient.unit
+UNIT_LENGTH = 20
+
+# "2", "1.5", "1/2" and the mixed "1 1/2" or "1-1/2"
+NUMBER = r'\d+(?:\.\d+)?(?:(?:\s+|-)\d+/\d+|/\d+)?'
+
+# "1 1/2 cups", "200g", "2-3 tbsp": a number or range, then an optional unit word
+QUANTITY = re.compile(rf'^\s*(?P<low>{NUMBER})(?:\s*(?:-|–|to)\s*(?P<high>{NUMBER}))?\s*(?P<unit>[^\W\d_]+\.?)?', re.IGNORECASE)
+
+
+def parse_number(text):
+    """"2", "1.5", "1/2", "1 1/2" or "1-1/2" as a float"""
+    return float(sum(Fraction(part) for part in text.replace('-', ' ').split()))
+
+
+def parse_quantity(text):
+    """
+    Split a free-text quantity into (amount, unit).
+
+    The unit is normalized through UNITS and is '' for counted items
+    ("1 medium, diced", "2"). A word UNITS does not know is kept as the
+    unit, lowercased, so "3 stalks" is never summed with "3 cups" or with
+    counted items. A range counts as its larger end so the shopping list
+    does not come up short. Text without a leading number ("to taste")
+    gives (None, '').
+    """
+    text = (text or '').strip()
+    for char, replacement in UNICODE_FRACTIONS.items():
+        # "1½" reads as "1 1/2"
+        text = re.sub(rf'(\d)?{char}', lambda match: f'{match.group(1)} {replacement}' if match.group(1) else replacement, text)
+    match = QUANTITY.match(text)
+    if match is None:
+        return None, ''
+    try:
+        amount = max(parse_number(match.group(name)) for name in ('low', 'high') if match.group(name))
+    except (ValueError, ZeroDivisionError):
+        return None, ''
+    word = (match.group('unit') or '').rstrip('.').lower()
+    unit, factor = UNITS.get(word, (word[:UNIT_LENGTH], 1))
+    return amount * factor, unit
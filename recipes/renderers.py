@@ -0,0 +1,54 @@
+import re
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson only speeds rendering up
+    orjson = None
+
+from .instrumentation import TimedJSONRenderer, timed
+
+# orjson writes some floats differently from json.dumps: 1e+16 as 1e16
+# and 1e-05 as 0.00001. Output containing a digit followed by "e" or
+# "0.0000" (even inside a string) is rendered again by the default
+# encoder. The pattern starts with a literal so the scan stays fast.
+EXPONENT = re.compile(rb'e(?<=[0-9]e)')
+SMALL_FLOAT = b'0.0000'
+
+LINE_SEPARATOR, PARAGRAPH_SEPARATOR = '\u2028'.encode(), '\u2029'.encode()
+
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None else 0
+)
+
+
+class FastJSONRenderer(TimedJSONRenderer):
+    """
+    TimedJSONRenderer that encodes with orjson when it is installed.
+
+    The output is byte-for-byte what JSONRenderer produces with the
+    project's UNICODE_JSON / COMPACT_JSON settings. Dates, decimals and
+    other non-JSON types go through DRF's encoder, and anything orjson
+    cannot reproduce exactly (indented output, ints above 64 bits, the
+    number formats above) falls back to the default path. The one
+    difference: NaN and infinities, which JSONRenderer refuses under
+    STRICT_JSON, are written as null.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        with timed('render'):
+            try:
+                content = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+            except orjson.JSONEncodeError:
+                content = None
+            if content is None or SMALL_FLOAT in content or EXPONENT.search(content):
+                return super().render(data, accepted_media_type, renderer_context)
+            # Same escaping of the JavaScript line terminators as JSONRenderer
+            if LINE_SEPARATOR in content or PARAGRAPH_SEPARATOR in content:
+                content = content.replace(LINE_SEPARATOR, b'\\u2028').replace(PARAGRAPH_SEPARATOR, b'\\u2029')
+            return content
@@ -0,0 +1,156 @@
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+CATALOG_VERSION_KEY = 'recipes:catalog_version'
+
+STORED_HEADERS = ['Content-Encoding', 'Vary']
+
+
+def get_cache():
+    return caches[getattr(settings, 'RECIPES_API_CACHE', 'default')]
+
+
+def get_catalog_version():
+    cache = get_cache()
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Start from the clock so a lost key never reuses an old version's entries
+        version = int(time.time() * 1000)
+        cache.add(CATALOG_VERSION_KEY, version, None)
+        version = cache.get(CATALOG_VERSION_KEY, version)
+    return version
+
+
+async def aget_catalog_version():
+    cache = get_cache()
+    version = await cache.aget(CATALOG_VERSION_KEY)
+    if version is None:
+        version = int(time.time() * 1000)
+        await cache.aadd(CATALOG_VERSION_KEY, version, None)
+        version = await cache.aget(CATALOG_VERSION_KEY, version)
+    return version
+
+
+def bump_catalog_version():
+    """Invalidate every cached response by moving to a new catalog version"""
+    cache = get_cache()
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        return get_catalog_version()
+
+
+def cache_key(request, version):
+    query = '&'.join(f'{key}={value}' for key, values in sorted(request.GET.lists()) for value in sorted(values))
+    raw = '|'.join([
+        request.get_host(), request.path, query,
+        request.META.get('HTTP_ACCEPT', ''), request.META.get('HTTP_ACCEPT_ENCODING', ''),
+    ])
+    return f'recipes:response:{version}:{hashlib.sha1(raw.encode("utf-8")).hexdigest()}'
+
+
+def matches_etag(request, etag):
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    etags = [tag[2:] if tag.startswith('W/') else tag for tag in parse_etags(header)]
+    return '*' in etags or etag in etags
+
+
+def cache_timeout():
+    return getattr(settings, 'RECIPES_API_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def cached_response(request, entry):
+    """Rebuild a response from a cache entry, as a 304 when the client has it"""
+    if matches_etag(request, entry['etag']):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(entry['content'], content_type=entry['content_type'])
+    for header, value in entry['headers'].items():
+        response[header] = value
+    response['ETag'] = entry['etag']
+    return response
+
+
+def cache_entry(response):
+    """Return the cache entry for a freshly rendered response, or None if it must not be cached"""
+    if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+        response.render()
+    # Only cache JSON; the browsable API embeds per-user markup
+    if response.status_code != 200 or not response.get('Content-Type', '').startswith('application/json'):
+        return None
+    return {
+        'etag': '"{}"'.format(hashlib.sha1(response.content).hexdigest()),
+        'content': response.content,
+        'content_type': response['Content-Type'],
+        'headers': {header: response[header] for header in STORED_HEADERS if response.has_header(header)},
+    }
+
+
+def finish_response(request, response, entry):
+    response['ETag'] = entry['etag']
+    if matches_etag(request, entry['etag']):
+        not_modified = HttpResponseNotModified()
+        not_modified['ETag'] = entry['etag']
+        return not_modified
+    return response
+
+
+def cache_api_response(view_func):
+    """
+    Cache the rendered JSON of a read-only API view under the catalog version.
+
+    Model signals bump the version on every write, so entries never need
+    to be invalidated one by one. Responses carry a strong ETag and a
+    matching If-None-Match is answered with 304 straight from the cache,
+    without running the view. Works on sync and async views.
+    """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return await view_func(request, *args, **kwargs)
+
+            cache = get_cache()
+            key = cache_key(request, await aget_catalog_version())
+            entry = await cache.aget(key)
+            if entry is not None:
+                return cached_response(request, entry)
+
+            response = await view_func(request, *args, **kwargs)
+            entry = cache_entry(response)
+            if entry is None:
+                return response
+            await cache.aset(key, entry, cache_timeout())
+            return finish_response(request, response, entry)
+
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return view_func(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = cache_key(request, get_catalog_version())
+        entry = cache.get(key)
+        if entry is not None:
+            return cached_response(request, entry)
+
+        response = view_func(request, *args, **kwargs)
+        entry = cache_entry(response)
+        if entry is None:
+            return response
+        cache.set(key, entry, cache_timeout())
+        return finish_response(request, response, entry)
+
+    return wrapper
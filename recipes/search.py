@@ -0,0 +1,114 @@
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from rest_framework import filters
+
+from .models import BM25, Recipe, RecipeIngredient, RecipeSearchDocument, RecipeStep
+
+FTS_TABLE = RecipeSearchDocument._meta.db_table
+
+CHUNK_SIZE = 500
+
+
+def fts_available(using=DEFAULT_DB_ALIAS):
+    """True when the database is SQLite and the FTS table exists"""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False
+    if getattr(connection, '_recipes_fts_ready', None) is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            connection._recipes_fts_ready = cursor.fetchone() is not None
+    return connection._recipes_fts_ready
+
+
+def create_table(using=DEFAULT_DB_ALIAS):
+    """Create the FTS5 table; rowid is the recipe id"""
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "name, description, category, ingredients, steps, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+    connection._recipes_fts_ready = True
+
+
+def _documents(recipe_ids):
+    ingredients, steps = {}, {}
+    for recipe_id, name in (RecipeIngredient.objects.filter(recipe_id__in=recipe_ids)
+                            .values_list('recipe_id', 'ingredient__name')):
+        ingredients.setdefault(recipe_id, []).append(name)
+    for recipe_id, instruction in (RecipeStep.objects.filter(recipe_id__in=recipe_ids)
+                                   .order_by('step_number').values_list('recipe_id', 'instruction')):
+        steps.setdefault(recipe_id, []).append(instruction)
+    for pk, name, description, category in (Recipe.objects.filter(pk__in=recipe_ids)
+                                            .values_list('pk', 'name', 'description', 'category__name')):
+        yield (pk, name, description, category,
+               ' '.join(ingredients.get(pk, [])), '\n'.join(steps.get(pk, [])))
+
+
+def index_recipes(recipe_ids):
+    """Replace the FTS rows of the given recipes with their current content"""
+    if not fts_available():
+        return
+    recipe_ids = list(recipe_ids)
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(recipe_ids), CHUNK_SIZE):
+            chunk = recipe_ids[start:start + CHUNK_SIZE]
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(pk,) for pk in chunk])
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, description, category, ingredients, steps) '
+                'VALUES (%s, %s, %s, %s, %s, %s)',
+                list(_documents(chunk)),
+            )
+
+
+def remove_recipes(recipe_ids):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(pk,) for pk in recipe_ids])
+
+
+def rebuild_index():
+    """Drop and refill the whole index; returns the number of recipes indexed"""
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+        create_table()
+        recipe_ids = list(Recipe.objects.order_by('pk').values_list('pk', flat=True))
+        index_recipes(recipe_ids)
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+    return len(recipe_ids)
+
+
+def match_expression(terms):
+    """Turn search terms into an FTS5 query: every term must match as a prefix"""
+    return ' '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+class RecipeFullTextSearchFilter(filters.SearchFilter):
+    """
+    `?search=` backed by the FTS5 index.
+
+    Every term is matched as a word prefix across name, description,
+    category, ingredient names and step instructions. Unless the client
+    asks for an explicit `?ordering=`, results come back by BM25
+    relevance. Falls back to the LIKE based SearchFilter when the index
+    is not available. Must run after OrderingFilter so the relevance
+    ordering is not overwritten.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not fts_available(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        # A plain join to the FTS table, so MATCH and bm25() run once per query
+        queryset = queryset.filter(search_document__document__match=match_expression(terms))
+        if request.query_params.get('ordering'):
+            return queryset
+        ordering = queryset.query.order_by
+        return queryset.annotate(search_rank=BM25('search_document__document')).order_by('search_rank', *ordering)
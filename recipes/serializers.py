@@ -1,14 +1,77 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import ForeignKey
 from rest_framework import serializers
+from .instrumentation import TimedRepresentationMixin
 from .models import Recipe, Category, Ingredient, RecipeIngredient, RecipeStep, RecipeTag
 
-class CategorySerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """
+    Let clients choose the fields they get with `?fields=name,image` or drop
+    some with `?omit=description`.
+
+    Both take comma separated field names and unknown names are a 400.
+    Serializers read the params from context['request']; views use
+    sparse_fields() and model_columns() to load only what is sent.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None:
+            selected = self.sparse_fields(getattr(request, 'query_params', request.GET))
+            if selected is not None:
+                for name in list(self.fields):
+                    if name not in selected:
+                        self.fields.pop(name)
+
+    @classmethod
+    def sparse_fields(cls, params):
+        """The field names picked by the query params, or None when they ask for every field"""
+        fields, omit = params.get(cls.fields_query_param), params.get(cls.omit_query_param)
+        if not fields and not omit:
+            return None
+        available = cls.Meta.fields
+        selected = set(available)
+        for param, value in ((cls.fields_query_param, fields), (cls.omit_query_param, omit)):
+            if not value:
+                continue
+            names = {name.strip() for name in value.split(',') if name.strip()}
+            unknown = sorted(names - set(available))
+            if unknown:
+                raise serializers.ValidationError({param: f'Unknown field(s): {", ".join(unknown)}.'})
+            selected = selected & names if param == cls.fields_query_param else selected - names
+        return selected
+
+    @classmethod
+    def model_columns(cls, fields):
+        """ORM paths for QuerySet.only() covering the given fields; relations and method fields add none"""
+        model = cls.Meta.model
+        declared = cls().fields
+        columns = []
+        for name in fields:
+            source = declared[name].source
+            if source == '*':
+                continue
+            path = source.split('.')
+            try:
+                field = model._meta.get_field(path[0])
+            except FieldDoesNotExist:
+                # Properties and other plain attributes are not columns
+                continue
+            if field.concrete and (len(path) == 1 or isinstance(field, ForeignKey)):
+                columns.append('__'.join(path))
+        return columns
+
+class CategorySerializer(TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     recipe_count = serializers.ReadOnlyField()
     
     class Meta:
         model = Category
         fields = ['id', 'name', 'description', 'emoji', 'recipe_count']
 
-class IngredientSerializer(serializers.ModelSerializer):
+class IngredientSerializer(TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Ingredient
         fields = ['id', 'name', 'emoji', 'description']
@@ -29,9 +92,9 @@ class RecipeStepSerializer(serializers.ModelSerializer):
 class RecipeTagSerializer(serializers.ModelSerializer):
     class Meta:
         model = RecipeTag
-        fields = ['name', 'color']
+        fields = ['id', 'name', 'color']
 
-class RecipeListSerializer(serializers.ModelSerializer):
+class RecipeListSerializer(TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     category = serializers.CharField(source='category.name', read_only=True)
     tags = serializers.SerializerMethodField()
     
@@ -48,7 +111,7 @@ class RecipeListSerializer(serializers.ModelSerializer):
     def get_tags(self, obj):
         return [tag.tag.name for tag in obj.recipe_tags.all()]
 
-class RecipeDetailSerializer(serializers.ModelSerializer):
+class RecipeDetailSerializer(TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     category = serializers.CharField(source='category.name', read_only=True)
     recipe_ingredients = RecipeIngredientSerializer(many=True, read_only=True)
     steps = RecipeStepSerializer(many=True, read_only=True)
@@ -0,0 +1,40 @@
+from django.db.models import Case, Count, F, FloatField, Q, Sum, Value, When
+
+from .models import RecipeIngredient
+
+
+def shopping_list_items(multipliers):
+    """
+    Total amount per ingredient and unit over recipes, in one GROUP BY query.
+
+    `multipliers` maps recipe id -> how many times the recipe is cooked;
+    the factor goes into the SUM as a CASE on recipe_id. An ingredient
+    used with different units gets one item per unit. Rows whose quantity
+    had no number add nothing to `amount` and are counted in `unmeasured`,
+    so "salt, to taste" still makes the list.
+    """
+    factor = Case(
+        *(When(recipe_id=pk, then=Value(float(multiplier))) for pk, multiplier in multipliers.items()),
+        output_field=FloatField(),
+    )
+    groups = (
+        RecipeIngredient.objects
+        .filter(recipe_id__in=list(multipliers))
+        .values('ingredient_id', 'ingredient__name', 'ingredient__emoji', 'unit')
+        .annotate(
+            total=Sum(F('amount') * factor),
+            recipes=Count('recipe_id'),
+            unmeasured=Count('pk', filter=Q(amount__isnull=True)),
+        )
+        .order_by('ingredient__name', 'unit')
+    )
+    return [
+        {
+            'ingredient': {'id': group['ingredient_id'], 'name': group['ingredient__name'], 'emoji': group['ingredient__emoji']},
+            'unit': group['unit'],
+            'amount': round(group['total'], 3) if group['total'] is not None else None,
+            'recipes': group['recipes'],
+            'unmeasured': group['unmeasured'],
+        }
+        for group in groups
+    ]
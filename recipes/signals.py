@@ -0,0 +1,164 @@
+from django.db import connections, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import documents, search, similarity, stats
+from .autocomplete import autocomplete_index
+from .response_cache import bump_catalog_version
+from .ingredient_index import ingredient_index
+from .nutrition import nutrition_engine
+from .models import Category, Ingredient, Recipe, RecipeIngredient, RecipeStep, RecipeTag, Recipe_Tag, Tombstone
+
+
+def refresh_recipes(recipe_ids):
+    """Rebuild the per-recipe derived data (search rows, documents, signatures) once the write commits"""
+    def refresh():
+        ids = list(recipe_ids)
+        search.index_recipes(ids)
+        documents.build_documents(ids)
+        similarity.update_signatures(ids)
+    transaction.on_commit(refresh)
+
+
+def touch_recipes(recipes):
+    """Move updated_at of recipes whose serialized form changed through a related row, for the change feed"""
+    recipes.update(updated_at=timezone.now())
+
+
+def record_tombstone(kind, object_id):
+    Tombstone.objects.create(kind=kind, object_id=object_id)
+
+
+def refresh_autocomplete(kind, ids):
+    """Re-read rows of one autocomplete section (names, popularity) once the write commits"""
+    ids = [pk for pk in ids if pk is not None]
+    transaction.on_commit(lambda: autocomplete_index.refresh(kind, ids))
+
+
+@receiver(pre_save, sender=Recipe)
+def recipe_pre_save(sender, instance, **kwargs):
+    # Remember the stored values so the stats record can move by the difference
+    instance._stats_old = None
+    if instance.pk:
+        instance._stats_old = Recipe.objects.filter(pk=instance.pk).values(*stats.TRACKED_FIELDS).first()
+
+
+def move_recipe_count(old_category_id, new_category_id):
+    """Shift one recipe between the stored Category.recipe_count counters"""
+    if old_category_id == new_category_id:
+        return
+    # The count is part of the serialized category, so it moves updated_at too
+    now = timezone.now()
+    if old_category_id is not None:
+        Category.objects.filter(pk=old_category_id).update(recipe_count=F('recipe_count') - 1, updated_at=now)
+    if new_category_id is not None:
+        Category.objects.filter(pk=new_category_id).update(recipe_count=F('recipe_count') + 1, updated_at=now)
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_saved(sender, instance, **kwargs):
+    old = getattr(instance, '_stats_old', None)
+    move_recipe_count(old['category_id'] if old else None, instance.category_id)
+    stats.apply_change(old, stats.recipe_values(instance))
+    transaction.on_commit(lambda: ingredient_index.update_recipe(instance.pk))
+    transaction.on_commit(lambda: nutrition_engine.update_recipe(instance.pk))
+    refresh_autocomplete('recipes', [instance.pk])
+    if old is None or old['category_id'] != instance.category_id:
+        refresh_autocomplete('categories', [old['category_id'] if old else None, instance.category_id])
+    refresh_recipes([instance.pk])
+
+
+@receiver(post_delete, sender=Recipe)
+def recipe_deleted(sender, instance, **kwargs):
+    move_recipe_count(instance.category_id, None)
+    stats.apply_change(stats.recipe_values(instance), None)
+    recipe_id = instance.pk
+    # Also runs for every recipe cascading from a deleted category
+    record_tombstone('recipe', recipe_id)
+    transaction.on_commit(lambda: ingredient_index.remove_recipe(recipe_id))
+    transaction.on_commit(lambda: nutrition_engine.remove_recipe(recipe_id))
+    transaction.on_commit(lambda: similarity.similarity_index.remove_recipe(recipe_id))
+    transaction.on_commit(lambda: search.remove_recipes([recipe_id]))
+    transaction.on_commit(lambda: autocomplete_index.remove('recipes', [recipe_id]))
+    refresh_autocomplete('categories', [instance.category_id])
+
+
+@receiver(post_save, sender=RecipeIngredient)
+@receiver(post_delete, sender=RecipeIngredient)
+def recipe_ingredient_changed(sender, instance, **kwargs):
+    recipe_id = instance.recipe_id
+    touch_recipes(Recipe.objects.filter(pk=recipe_id))
+    transaction.on_commit(lambda: ingredient_index.update_recipe(recipe_id))
+    refresh_autocomplete('ingredients', [instance.ingredient_id])
+    refresh_recipes([recipe_id])
+
+
+@receiver(post_save, sender=RecipeStep)
+@receiver(post_delete, sender=RecipeStep)
+@receiver(post_save, sender=Recipe_Tag)
+@receiver(post_delete, sender=Recipe_Tag)
+def recipe_child_changed(sender, instance, **kwargs):
+    touch_recipes(Recipe.objects.filter(pk=instance.recipe_id))
+    if sender is Recipe_Tag:
+        refresh_autocomplete('tags', [instance.tag_id])
+    refresh_recipes([instance.recipe_id])
+
+
+@receiver(post_save, sender=Ingredient)
+def ingredient_saved(sender, instance, created, **kwargs):
+    refresh_autocomplete('ingredients', [instance.pk])
+    # A rename changes the terms of every recipe using it
+    if not created:
+        transaction.on_commit(ingredient_index.invalidate)
+        touch_recipes(Recipe.objects.filter(recipe_ingredients__ingredient=instance))
+        refresh_recipes(RecipeIngredient.objects.filter(ingredient=instance).values_list('recipe_id', flat=True))
+
+
+@receiver(post_save, sender=RecipeTag)
+def tag_saved(sender, instance, created, **kwargs):
+    refresh_autocomplete('tags', [instance.pk])
+    if not created:
+        touch_recipes(Recipe.objects.filter(recipe_tags__tag=instance))
+        refresh_recipes(Recipe_Tag.objects.filter(tag=instance).values_list('recipe_id', flat=True))
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, created, **kwargs):
+    refresh_autocomplete('categories', [instance.pk])
+    if not created:
+        touch_recipes(instance.recipes.all())
+        refresh_recipes(instance.recipes.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    record_tombstone('category', instance.pk)
+    refresh_autocomplete('categories', [instance.pk])
+
+
+@receiver(post_delete, sender=Ingredient)
+def ingredient_deleted(sender, instance, **kwargs):
+    record_tombstone('ingredient', instance.pk)
+    refresh_autocomplete('ingredients', [instance.pk])
+
+
+@receiver(post_delete, sender=RecipeTag)
+def tag_deleted(sender, instance, **kwargs):
+    record_tombstone('tag', instance.pk)
+    refresh_autocomplete('tags', [instance.pk])
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def catalog_changed(sender, **kwargs):
+    # Any write to the recipes app moves cached API responses to a new version
+    if sender._meta.app_label == 'recipes':
+        transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_migrate)
+def create_search_table(sender, using, **kwargs):
+    if sender.name == 'recipes' and connections[using].vendor == 'sqlite':
+        search.create_table(using)
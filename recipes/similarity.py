@@ -0,0 +1,154 @@
+import hashlib
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is only needed for similar recipes
+    np = None
+
+from .memory_index import SharedMemoryIndex
+from .models import Recipe, Recipe_Tag, RecipeIngredient, RecipeSignature
+
+SIMILARITY_VERSION_KEY = 'recipes:similarity_index:version'
+
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+PRIME = (1 << 31) - 1
+CHUNK_SIZE = 1000
+
+if np is not None:
+    # Fixed seed: signatures stored by one process must be comparable in every other
+    _rng = np.random.default_rng(20240601)
+    PERM_A = _rng.integers(1, PRIME, NUM_PERM, dtype=np.uint64)
+    PERM_B = _rng.integers(0, PRIME, NUM_PERM, dtype=np.uint64)
+
+
+def _feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little') % PRIME
+
+
+def minhash(features):
+    """NUM_PERM-long uint32 MinHash signature of a set of feature strings"""
+    hashes = np.fromiter((_feature_hash(feature) for feature in features), dtype=np.uint64, count=len(features))
+    permuted = (np.outer(hashes, PERM_A) + PERM_B) % PRIME
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def band_keys(signature):
+    """One bucket key per LSH band; recipes sharing any key are candidates"""
+    return [
+        (band, hashlib.blake2b(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes(), digest_size=8).digest())
+        for band in range(BANDS)
+    ]
+
+
+def recipe_features(recipe_ids):
+    """Map recipe id -> {'i:<ingredient id>', 't:<tag id>'}"""
+    features = {pk: set() for pk in recipe_ids}
+    for recipe_id, ingredient_id in RecipeIngredient.objects.filter(recipe_id__in=recipe_ids).values_list('recipe_id', 'ingredient_id'):
+        features[recipe_id].add(f'i:{ingredient_id}')
+    for recipe_id, tag_id in Recipe_Tag.objects.filter(recipe_id__in=recipe_ids).values_list('recipe_id', 'tag_id'):
+        features[recipe_id].add(f't:{tag_id}')
+    return features
+
+
+def update_signatures(recipe_ids):
+    """Recompute and store the signatures of the given recipes; returns how many were written"""
+    if np is None:
+        return 0
+    recipe_ids = list(recipe_ids)
+    written = 0
+    for start in range(0, len(recipe_ids), CHUNK_SIZE):
+        chunk = recipe_ids[start:start + CHUNK_SIZE]
+        existing = set(Recipe.objects.filter(pk__in=chunk).values_list('pk', flat=True))
+        signatures, empty = {}, []
+        for pk, features in recipe_features([pk for pk in chunk if pk in existing]).items():
+            if features:
+                signatures[pk] = minhash(features)
+            else:
+                empty.append(pk)
+        RecipeSignature.objects.filter(recipe_id__in=empty).delete()
+        RecipeSignature.objects.bulk_create(
+            [RecipeSignature(recipe_id=pk, signature=signature.tobytes()) for pk, signature in signatures.items()],
+            update_conflicts=True, unique_fields=['recipe'], update_fields=['signature', 'updated_at'],
+        )
+        similarity_index.update(signatures, removed=empty + [pk for pk in chunk if pk not in existing])
+        written += len(signatures)
+    return written
+
+
+class SimilarityIndex(SharedMemoryIndex):
+    """
+    LSH buckets over the stored MinHash signatures.
+
+    A recipe's candidates are the recipes sharing at least one band
+    bucket with it; only those are scored, by the fraction of equal
+    signature entries (an estimate of the Jaccard similarity of their
+    ingredient and tag sets). The catalog is never scanned per query.
+    """
+    version_key = SIMILARITY_VERSION_KEY
+
+    def __init__(self):
+        super().__init__()
+        self._signatures = {}
+        self._buckets = {}
+
+    def load(self):
+        signatures, buckets = {}, {}
+        for pk, raw in RecipeSignature.objects.values_list('recipe_id', 'signature').iterator():
+            signature = np.frombuffer(bytes(raw), dtype=np.uint32)
+            signatures[pk] = signature
+            for key in band_keys(signature):
+                buckets.setdefault(key, set()).add(pk)
+        with self._lock:
+            self._signatures, self._buckets = signatures, buckets
+
+    def _discard(self, pk):
+        signature = self._signatures.pop(pk, None)
+        if signature is not None:
+            for key in band_keys(signature):
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.discard(pk)
+                    if not bucket:
+                        del self._buckets[key]
+
+    def update(self, signatures, removed=()):
+        """Patch the buckets with freshly computed signatures"""
+        if not self._built:
+            self._bump_version()
+            return
+        with self._lock:
+            for pk in removed:
+                self._discard(pk)
+            for pk, signature in signatures.items():
+                self._discard(pk)
+                self._signatures[pk] = signature
+                for key in band_keys(signature):
+                    self._buckets.setdefault(key, set()).add(pk)
+        self._bump_version()
+
+    def remove_recipe(self, recipe_id):
+        self.update({}, removed=[recipe_id])
+
+    def similar(self, recipe_id, limit=10):
+        """Return [(recipe id, estimated similarity)] for the closest recipes, best first"""
+        self.ensure_built()
+        with self._lock:
+            signature = self._signatures.get(recipe_id)
+            if signature is None:
+                return []
+            candidates = set()
+            for key in band_keys(signature):
+                candidates |= self._buckets.get(key, set())
+            candidates.discard(recipe_id)
+            if not candidates:
+                return []
+            candidates = sorted(candidates)
+            matrix = np.stack([self._signatures[pk] for pk in candidates])
+        scores = (matrix == signature).mean(axis=1)
+        best = np.argsort(-scores, kind='stable')[:limit]
+        return [(candidates[i], float(scores[i])) for i in best]
+
+
+similarity_index = SimilarityIndex()
@@ -0,0 +1,114 @@
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Category, Recipe, RecipeStats
+
+STATS_PK = 1
+
+TRACKED_FIELDS = ['category_id', 'total_time', 'calories_per_serving', 'is_vegetarian', 'is_vegan']
+
+
+def contribution(values):
+    """What one recipe adds to the running totals"""
+    return {
+        'total_recipes': 1,
+        'total_time_sum': values['total_time'],
+        'calories_sum': values['calories_per_serving'],
+        'vegetarian_count': int(values['is_vegetarian']),
+        'vegan_count': int(values['is_vegan']),
+    }
+
+
+def recipe_values(recipe):
+    return {field: getattr(recipe, field) for field in TRACKED_FIELDS}
+
+
+def apply_change(old=None, new=None):
+    """
+    Move the totals from a recipe's old values (None if created) to its new ones (None if deleted).
+
+    Per-category counts are not kept here: they live in the
+    Category.recipe_count column the recipe signals maintain.
+    """
+    delta = {}
+    for values, sign in ((old, -1), (new, 1)):
+        if values is None:
+            continue
+        for field, amount in contribution(values).items():
+            delta[field] = delta.get(field, 0) + sign * amount
+
+    updates = {field: F(field) + amount for field, amount in delta.items() if amount}
+    with transaction.atomic():
+        if not RecipeStats.objects.filter(pk=STATS_PK).exists():
+            # First write ever, or the record was wiped: rebuild reflects this change already
+            recompute()
+            return
+        if updates:
+            RecipeStats.objects.filter(pk=STATS_PK).update(**updates)
+
+
+def live_totals():
+    """Compute the record's fields straight from the recipe table"""
+    totals = Recipe.objects.aggregate(
+        total_recipes=Count('pk'),
+        total_time_sum=Sum('total_time'),
+        calories_sum=Sum('calories_per_serving'),
+        vegetarian_count=Count('pk', filter=Q(is_vegetarian=True)),
+        vegan_count=Count('pk', filter=Q(is_vegan=True)),
+    )
+    return {field: value or 0 for field, value in totals.items()}
+
+
+def recount_categories():
+    """Reset every stored Category.recipe_count from the recipe table in one UPDATE"""
+    counts = (
+        Recipe.objects.filter(category=OuterRef('pk'))
+        .order_by().values('category').annotate(count=Count('pk')).values('count')
+    )
+    # Categories are few, so all of them are resent by the change feed rather than diffing counts
+    Category.objects.update(
+        recipe_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0), updated_at=timezone.now(),
+    )
+
+
+def recompute():
+    """Rebuild the stats record from scratch"""
+    totals = live_totals()
+    RecipeStats.objects.update_or_create(pk=STATS_PK, defaults=totals)
+    return totals
+
+
+def category_counts():
+    return Category.objects.order_by('name').values('name', 'recipe_count')
+
+
+def get_stats():
+    """Return the /api/stats/ payload from the materialized record and the category counters"""
+    stats = RecipeStats.objects.filter(pk=STATS_PK).first()
+    if stats is None:
+        recompute()
+        stats = RecipeStats.objects.get(pk=STATS_PK)
+    return stats_payload(stats, list(category_counts()))
+
+
+async def aget_stats():
+    """Async counterpart of get_stats for the ASGI views"""
+    stats = await RecipeStats.objects.filter(pk=STATS_PK).afirst()
+    if stats is None:
+        await sync_to_async(recompute)()
+        stats = await RecipeStats.objects.aget(pk=STATS_PK)
+    return stats_payload(stats, [entry async for entry in category_counts()])
+
+
+def stats_payload(stats, categories):
+    total = stats.total_recipes
+    return {
+        'total_recipes': total,
+        'avg_time_minutes': round(stats.total_time_sum / total) if total else 0,
+        'avg_calories': round(stats.calories_sum / total) if total else 0,
+        'vegetarian_percentage': round((stats.vegetarian_count / total) * 100) if total else 0,
+        'categories': categories,
+    }
@@ -0,0 +1,140 @@
+import random
+
+# Category -> (dish words, prep range, cook range)
+CATEGORIES = {
+    'Salads': (['Salad', 'Slaw', 'Tabbouleh', 'Panzanella'], (5, 20), (0, 15)),
+    'Smoothies': (['Smoothie', 'Shake', 'Lassi', 'Juice'], (3, 10), (0, 0)),
+    'Soups': (['Soup', 'Stew', 'Broth', 'Chowder', 'Bisque'], (10, 30), (15, 90)),
+    'Bowls': (['Bowl', 'Buddha Bowl', 'Poke Bowl', 'Grain Bowl'], (10, 25), (10, 40)),
+    'Snacks': (['Bites', 'Bars', 'Dip', 'Chips', 'Energy Balls'], (5, 20), (0, 30)),
+    'Wraps': (['Wrap', 'Burrito', 'Pita', 'Lettuce Cups'], (10, 20), (0, 20)),
+}
+
+# Ingredient -> (emoji, is animal product, is dairy, has gluten)
+PANTRY = {
+    'tomatoes': ('🍅', False, False, False), 'cucumber': ('🥒', False, False, False),
+    'spinach': ('🥬', False, False, False), 'avocado': ('🥑', False, False, False),
+    'quinoa': ('🌾', False, False, False), 'chickpeas': ('🫘', False, False, False),
+    'banana': ('🍌', False, False, False), 'berries': ('🫐', False, False, False),
+    'mango': ('🥭', False, False, False), 'feta cheese': ('🧀', False, True, False),
+    'olive oil': ('🫒', False, False, False), 'lemon': ('🍋', False, False, False),
+    'greek yogurt': ('🥛', False, True, False), 'honey': ('🍯', True, False, False),
+    'almonds': ('🌰', False, False, False), 'kale': ('🥬', False, False, False),
+    'apple': ('🍎', False, False, False), 'carrots': ('🥕', False, False, False),
+    'bell peppers': ('🫑', False, False, False), 'onion': ('🧅', False, False, False),
+    'garlic': ('🧄', False, False, False), 'ginger': ('🫚', False, False, False),
+    'brown rice': ('🍚', False, False, False), 'lentils': ('🫘', False, False, False),
+    'black beans': ('🫘', False, False, False), 'sweet potato': ('🍠', False, False, False),
+    'broccoli': ('🥦', False, False, False), 'mushrooms': ('🍄', False, False, False),
+    'tofu': ('🧈', False, False, False), 'tempeh': ('🟫', False, False, False),
+    'chicken breast': ('🍗', True, False, False), 'salmon': ('🐟', True, False, False),
+    'tuna': ('🐟', True, False, False), 'shrimp': ('🦐', True, False, False),
+    'eggs': ('🥚', True, False, False), 'turkey': ('🦃', True, False, False),
+    'whole wheat tortilla': ('🌯', False, False, True), 'pita bread': ('🫓', False, False, True),
+    'oats': ('🌾', False, False, True), 'couscous': ('🌾', False, False, True),
+    'parmesan': ('🧀', False, True, False), 'milk': ('🥛', False, True, False),
+    'almond milk': ('🥛', False, False, False), 'coconut milk': ('🥥', False, False, False),
+    'peanut butter': ('🥜', False, False, False), 'chia seeds': ('🌱', False, False, False),
+    'flax seeds': ('🌱', False, False, False), 'walnuts': ('🌰', False, False, False),
+    'cashews': ('🌰', False, False, False), 'pumpkin seeds': ('🎃', False, False, False),
+    'basil': ('🌿', False, False, False), 'cilantro': ('🌿', False, False, False),
+    'parsley': ('🌿', False, False, False), 'mint': ('🌿', False, False, False),
+    'cumin': ('🧂', False, False, False), 'turmeric': ('🧂', False, False, False),
+    'paprika': ('🧂', False, False, False), 'black pepper': ('🧂', False, False, False),
+    'sea salt': ('🧂', False, False, False), 'lime': ('🍋', False, False, False),
+    'orange': ('🍊', False, False, False), 'pineapple': ('🍍', False, False, False),
+    'strawberries': ('🍓', False, False, False), 'blueberries': ('🫐', False, False, False),
+    'zucchini': ('🥒', False, False, False), 'eggplant': ('🍆', False, False, False),
+    'cauliflower': ('🥦', False, False, False), 'cabbage': ('🥬', False, False, False),
+    'corn': ('🌽', False, False, False), 'peas': ('🫛', False, False, False),
+    'edamame': ('🫛', False, False, False), 'soy sauce': ('🥢', False, False, True),
+    'tahini': ('🥣', False, False, False), 'hummus': ('🥣', False, False, False),
+    'maple syrup': ('🍁', False, False, False), 'dates': ('🌴', False, False, False),
+    'cocoa powder': ('🍫', False, False, False), 'vegetable broth': ('🍲', False, False, False),
+    'chicken broth': ('🍲', True, False, False), 'goat cheese': ('🧀', False, True, False),
+}
+
+VEGETARIAN_ANIMAL_PRODUCTS = {'honey', 'eggs'}
+
+TAGS = [
+    'quick', 'healthy', 'mediterranean', 'protein-rich', 'low-carb', 'high-fiber', 'meal-prep',
+    'kid-friendly', 'one-pot', 'budget', 'spicy', 'comfort-food', 'summer', 'winter', 'asian',
+    'mexican', 'breakfast', 'post-workout', 'heart-healthy', 'low-sodium',
+]
+
+ADJECTIVES = [
+    'Zesty', 'Roasted', 'Crunchy', 'Creamy', 'Spicy', 'Smoky', 'Herby', 'Golden', 'Rainbow',
+    'Tangy', 'Hearty', 'Fresh', 'Green', 'Sunny', 'Rustic', 'Glazed', 'Charred', 'Citrus',
+]
+
+STEP_VERBS = ['Rinse', 'Chop', 'Dice', 'Slice', 'Whisk', 'Toss', 'Simmer', 'Roast', 'Blend', 'Saute', 'Season']
+UNITS = ['1 cup', '1/2 cup', '2 tbsp', '1 tbsp', '1 tsp', '200g', '100g', '2 cloves', '1 handful', '1 pinch']
+DIFFICULTIES = ['easy'] * 6 + ['medium'] * 3 + ['hard']
+
+
+def generate_records(count, seed=0):
+    """
+    Yield `count` recipe records shaped for RecipeImporter.
+
+    The same (count, seed) always yields the same catalog. Ingredient use
+    follows a Zipf-like curve so a few staples appear in most recipes, as
+    in real catalogs; recipes get 4-14 ingredients, 3-10 steps and 1-5
+    tags, and dietary flags follow from the ingredients used.
+    """
+    rng = random.Random(seed)
+    ingredients = list(PANTRY)
+    weights = [1 / (rank + 1) for rank in range(len(ingredients))]
+    categories = list(CATEGORIES)
+
+    for number in range(count):
+        category = rng.choice(categories)
+        dishes, prep_range, cook_range = CATEGORIES[category]
+        chosen = []
+        for name in rng.choices(ingredients, weights, k=rng.randint(4, 14)):
+            if name not in chosen:
+                chosen.append(name)
+        animal = any(PANTRY[name][1] for name in chosen)
+        meat = any(PANTRY[name][1] and name not in VEGETARIAN_ANIMAL_PRODUCTS for name in chosen)
+        dairy = any(PANTRY[name][2] for name in chosen)
+        gluten = any(PANTRY[name][3] for name in chosen)
+
+        prep_time = rng.randint(*prep_range)
+        cook_time = rng.randint(*cook_range)
+        protein = round(rng.uniform(3, 45), 1)
+        carbs = round(rng.uniform(5, 90), 1)
+        fat = round(rng.uniform(1, 35), 1)
+        main = chosen[0].title()
+        yield {
+            'name': f'{rng.choice(ADJECTIVES)} {main} {rng.choice(dishes)} {number + 1}',
+            'description': (
+                f'A {category.lower()[:-1]} built around {chosen[0]} and {chosen[-1]}, '
+                f'ready in {prep_time + cook_time} minutes.'
+            ),
+            'image': f'https://images.example.com/recipes/{seed}-{number + 1}.jpg',
+            'category': category,
+            'prep_time': prep_time,
+            'cook_time': cook_time,
+            'difficulty': rng.choice(DIFFICULTIES),
+            'servings': rng.randint(1, 6),
+            'calories_per_serving': int(protein * 4 + carbs * 4 + fat * 9),
+            'protein_grams': protein,
+            'carbs_grams': carbs,
+            'fat_grams': fat,
+            'fiber_grams': round(rng.uniform(0, 15), 1),
+            'is_vegetarian': not meat,
+            'is_vegan': not animal and not dairy,
+            'is_gluten_free': not gluten,
+            'is_dairy_free': not dairy,
+            'is_featured': rng.random() < 0.002,
+            'ingredients': [
+                {'name': name, 'emoji': PANTRY[name][0], 'quantity': rng.choice(UNITS)} for name in chosen
+            ],
+            'steps': [
+                {
+                    'instruction': f'{rng.choice(STEP_VERBS)} the {rng.choice(chosen)}.',
+                    'time_minutes': rng.randint(0, 15),
+                }
+                for _ in range(rng.randint(3, 10))
+            ],
+            'tags': rng.sample(TAGS, rng.randint(1, 5)),
+        }
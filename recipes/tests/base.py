@@ -0,0 +1,38 @@
+from django.core.cache import caches
+from django.test import TestCase
+
+from recipes.autocomplete import autocomplete_index
+from recipes.bulk import set_featured
+from recipes.importer import RecipeImporter
+from recipes.ingredient_index import ingredient_index
+from recipes.models import Recipe
+from recipes.nutrition import nutrition_engine
+from recipes.similarity import similarity_index
+from recipes.synthetic import generate_records
+
+INDEXES = [ingredient_index, nutrition_engine, similarity_index, autocomplete_index]
+
+
+class CatalogTestCase(TestCase):
+    """
+    TestCase over a small deterministic synthetic catalog.
+
+    The catalog goes in through RecipeImporter, so the derived data
+    (documents, search rows, signatures, stats) exists as in production.
+    Caches and the in-memory indexes are reset before every test, since
+    they outlive the rolled back transaction.
+    """
+    catalog_size = 40
+
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            RecipeImporter().run(generate_records(cls.catalog_size, seed=1))
+            featured = Recipe.objects.order_by('pk').values_list('pk', flat=True)[:5]
+            set_featured(Recipe.objects.filter(pk__in=list(featured)), True)
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        for index in INDEXES:
+            index.invalidate()
@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db.models import Count
+
+from recipes.bulk import recategorize, set_featured
+from recipes.models import Category, Recipe
+from recipes.pagination import EstimatedCountPaginator
+
+from .base import CatalogTestCase
+
+
+class BulkActionTests(CatalogTestCase):
+
+    def test_set_featured(self):
+        self.client.get('/api/featured/')
+        recipes = Recipe.objects.filter(is_featured=False).order_by('pk')[:2]
+        pks = list(recipes.values_list('pk', flat=True))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(set_featured(Recipe.objects.filter(pk__in=pks), True), 2)
+        self.assertEqual(set_featured(Recipe.objects.filter(pk__in=pks), True), 0)
+
+        # The cached response and the stored documents follow
+        self.assertEqual(len(self.client.get('/api/featured/').json()), 7)
+        slug = Recipe.objects.get(pk=pks[0]).slug
+        self.assertTrue(self.client.get(f'/api/recipes/{slug}/').json()['is_featured'])
+
+    def test_recategorize(self):
+        target = Category.objects.order_by('pk').first()
+        moved = Recipe.objects.exclude(category=target).order_by('pk')[:3]
+        slug = moved[0].slug
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(recategorize(Recipe.objects.filter(pk__in=[recipe.pk for recipe in moved]), target), 3)
+
+        self.assertEqual(
+            dict(Category.objects.values_list('pk', 'recipe_count')),
+            dict(Category.objects.annotate(live=Count('recipes')).values_list('pk', 'live')),
+        )
+        self.assertEqual(self.client.get(f'/api/recipes/{slug}/').json()['category'], target.name)
+
+
+class EstimatedCountPaginatorTests(CatalogTestCase):
+
+    @mock.patch.object(EstimatedCountPaginator, 'exact_count_limit', 10)
+    def test_estimates_unfiltered_tables(self):
+        first, last = Recipe.objects.order_by('pk')[0], Recipe.objects.order_by('-pk')[0]
+        Recipe.objects.order_by('pk')[1].delete()
+        # The pk span overshoots by the deleted row
+        self.assertEqual(EstimatedCountPaginator(Recipe.objects.order_by('pk'), 20).count, last.pk - first.pk + 1)
+        vegan = Recipe.objects.filter(is_vegan=True).order_by('pk')
+        self.assertEqual(EstimatedCountPaginator(vegan, 20).count, vegan.count())
+
+    def test_small_tables_are_counted_exactly(self):
+        Recipe.objects.order_by('pk')[1].delete()
+        self.assertEqual(EstimatedCountPaginator(Recipe.objects.order_by('pk'), 20).count, Recipe.objects.count())
+
+
+class RecipeAdminTests(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+
+    def test_changelists(self):
+        for url in ('/admin/recipes/recipe/', '/admin/recipes/ingredient/', '/admin/recipes/recipetag/'):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_move_to_category_action(self):
+        target = Category.objects.order_by('pk').first()
+        pks = list(Recipe.objects.exclude(category=target).values_list('pk', flat=True)[:2])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/admin/recipes/recipe/', {
+                'action': 'move_to_category', 'category': target.pk, '_selected_action': pks,
+            }, follow=True)
+        self.assertContains(response, f'2 recipes moved to {target.name}.')
+        self.assertEqual(Recipe.objects.filter(pk__in=pks, category=target).count(), 2)
+
+    def test_move_to_category_needs_a_category(self):
+        pks = list(Recipe.objects.values_list('pk', flat=True)[:1])
+        response = self.client.post('/admin/recipes/recipe/', {
+            'action': 'move_to_category', '_selected_action': pks,
+        }, follow=True)
+        self.assertContains(response, 'Pick the category to move the recipes to.')
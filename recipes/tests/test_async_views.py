@@ -0,0 +1,41 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.test import AsyncClient
+
+from recipes.models import Recipe
+
+from .base import CatalogTestCase
+
+
+class AsyncViewsTests(CatalogTestCase):
+    """The async views answer like their sync counterparts"""
+
+    async_client_class = AsyncClient
+
+    async def assertSameAsSync(self, method, url, status):
+        # Each client must get its own response, not the other's cached one
+        caches['api'].clear()
+        response = await getattr(self.async_client, method)(url)
+        caches['api'].clear()
+        sync = await sync_to_async(getattr(self.client, method))(url)
+        self.assertEqual(response.status_code, status)
+        self.assertEqual(sync.status_code, status)
+        self.assertEqual(response['Content-Type'], sync['Content-Type'])
+        self.assertEqual(response.json(), sync.json())
+        return response
+
+    async def test_errors(self):
+        for method, url, status in [
+            ('get', '/api/recipes/no-such-recipe/', 404),
+            ('get', '/api/recipes/?fields=bogus', 400),
+            ('post', '/api/stats/', 405),
+        ]:
+            with self.subTest(url=url):
+                response = await self.assertSameAsSync(method, url, status)
+                self.assertEqual(response['Content-Type'], 'application/json')
+
+    async def test_list_and_detail(self):
+        slug = await Recipe.objects.order_by('pk').values_list('slug', flat=True).afirst()
+        for url in ('/api/recipes/?ordering=name', f'/api/recipes/{slug}/', '/api/featured/', '/api/stats/'):
+            with self.subTest(url=url):
+                await self.assertSameAsSync('get', url, 200)
@@ -0,0 +1,56 @@
+from django.test import SimpleTestCase
+
+from recipes.autocomplete import normalize, word_keys
+from recipes.models import Ingredient, Recipe
+
+from .base import CatalogTestCase
+
+
+class NormalizeTests(SimpleTestCase):
+
+    def test_normalize(self):
+        self.assertEqual(normalize('  Jalapeño  POPPERS '), 'jalapeno poppers')
+        self.assertEqual(normalize(None), '')
+
+    def test_word_keys(self):
+        self.assertEqual(word_keys('quinoa stir-fry'), ['quinoa stir-fry', 'stir-fry', 'fry'])
+
+
+class AutocompleteTests(CatalogTestCase):
+
+    def suggest(self, **params):
+        response = self.client.get('/api/autocomplete/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return response.json()
+
+    def test_matches_any_word_start(self):
+        recipe = Recipe.objects.order_by('pk').first()
+        last_word = recipe.name.split()[-1]
+        names = [entry['name'] for entry in self.suggest(q=last_word[:3].upper(), types='recipes', limit=20)['recipes']]
+        self.assertTrue(names)
+        self.assertTrue(all(
+            any(word.lower().startswith(last_word[:3].lower()) for word in name.replace('-', ' ').split())
+            for name in names
+        ))
+
+    def test_sections_and_limit(self):
+        data = self.suggest(q='a', types='ingredients,tags', limit=2)
+        self.assertEqual(set(data), {'query', 'ingredients', 'tags'})
+        self.assertLessEqual(len(data['ingredients']), 2)
+        self.assertEqual(set(self.suggest(q='a')), {'query', 'recipes', 'ingredients', 'categories', 'tags'})
+
+    def test_empty_query(self):
+        data = self.suggest(q='')
+        self.assertEqual(data['recipes'], [])
+
+    def test_accents_and_live_updates(self):
+        self.suggest(q='x')
+        with self.captureOnCommitCallbacks(execute=True):
+            ingredient = Ingredient.objects.create(name='Jalapeño Zest')
+        self.assertEqual([entry['id'] for entry in self.suggest(q='jalapeno', types='ingredients')['ingredients']],
+                         [ingredient.pk])
+        self.assertEqual(len(self.suggest(q='zes', types='ingredients')['ingredients']), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            ingredient.delete()
+        self.assertEqual(self.suggest(q='jalapeno', types='ingredients')['ingredients'], [])
@@ -0,0 +1,30 @@
+import json
+
+from recipes.models import Recipe
+
+from .base import CatalogTestCase
+
+
+class RecipeBatchTests(CatalogTestCase):
+
+    def post(self, body):
+        return self.client.post('/api/batch/recipes/', json.dumps(body), content_type='application/json')
+
+    def test_slugs_in_request_order(self):
+        slugs = list(Recipe.objects.order_by('-pk').values_list('slug', flat=True)[:3])
+        response = self.client.get('/api/batch/recipes/', {'slugs': ','.join(slugs + ['nope'])})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([document['slug'] for document in data['results'][:3]], slugs)
+        self.assertIsNone(data['results'][3])
+        self.assertEqual(data['missing'], ['nope'])
+
+    def test_post_ids(self):
+        ids = list(Recipe.objects.order_by('pk').values_list('pk', flat=True)[:2])
+        data = self.post({'ids': ids}).json()
+        self.assertEqual([document['id'] for document in data['results']], ids)
+
+    def test_invalid_bodies(self):
+        for body in ([1, 2], 'slugs', {'ids': ['a']}, {'ids': 7}, {'slugs': ['a'], 'ids': [1]}):
+            with self.subTest(body=body):
+                self.assertEqual(self.post(body).status_code, 400)
@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+
+from recipes.management.commands import benchmark_api
+from recipes.models import Recipe
+
+from .base import CatalogTestCase
+
+
+class InlineExecutor:
+    """Runs the benchmark's requests on the test thread, which alone sees the test transaction"""
+
+    def __init__(self, workers):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def map(self, fn, items):
+        return map(fn, items)
+
+
+@mock.patch.object(benchmark_api, 'ThreadPoolExecutor', InlineExecutor)
+class BenchmarkApiTests(CatalogTestCase):
+
+    def test_in_process_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+            call_command('benchmark_api', requests=30, warmup=5, seed=1, output=path, stdout=StringIO())
+            with open(path, encoding='utf-8') as handle:
+                results = json.load(handle)
+        self.assertEqual(results['overall']['requests'], 30)
+        self.assertEqual(results['overall']['errors'], 0)
+        self.assertIsNotNone(results['overall']['queries_per_request'])
+
+    @override_settings(ALLOWED_HOSTS=['localhost'])
+    def test_failed_requests_stop_the_run(self):
+        with mock.patch.object(benchmark_api, 'HOST', 'not-allowed.example'), \
+                self.assertRaisesMessage(CommandError, 'requests failed, e.g. 400'):
+            call_command('benchmark_api', requests=10, warmup=5, stdout=StringIO())
+
+
+class GenerateCatalogTests(CatalogTestCase):
+
+    def test_generates_recipes(self):
+        before = Recipe.objects.count()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('generate_catalog', recipes=10, seed=2, stdout=StringIO())
+        self.assertEqual(Recipe.objects.count(), before + 10)
@@ -0,0 +1,27 @@
+from django.test import override_settings
+
+from recipes.models import Recipe
+
+from .base import CatalogTestCase
+
+
+@override_settings(RECIPES_SYNC_SETTLE_SECONDS=0)
+class CatalogChangesTests(CatalogTestCase):
+
+    def test_pages_through_catalog(self):
+        slugs, params = [], {'limit': 15}
+        while True:
+            data = self.client.get('/api/changes/', params).json()
+            slugs += [recipe['slug'] for recipe in data['recipes']]
+            params['since'] = data['sync_token']
+            if not data['has_more']:
+                break
+        self.assertCountEqual(slugs, Recipe.objects.values_list('slug', flat=True))
+
+    def test_invalid_params(self):
+        for params in ({'limit': 'nan'}, {'limit': 'inf'}, {'limit': 0}, {'since': 'garbage'},
+                       {'updated_since': '2026-13-45T00:00:00Z'}, {'updated_since': '2026-01-01T00:00:00'}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/changes/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(list(response.json()), list(params))
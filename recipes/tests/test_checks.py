@@ -0,0 +1,39 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from recipes.checks import check_caches_reach_commands, check_shared_caches, require_shared_caches
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+SHARED = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/tmp/recipes-test-cache'}
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+
+    @override_settings(RECIPES_WORKERS=1, CACHES={'default': LOCMEM, 'api': LOCMEM})
+    def test_single_worker_may_use_locmem(self):
+        self.assertEqual(check_shared_caches(), [])
+
+    @override_settings(RECIPES_WORKERS=4, CACHES={'default': LOCMEM, 'api': SHARED})
+    def test_index_versions_need_a_shared_cache(self):
+        self.assertEqual([error.id for error in check_shared_caches()], ['recipes.E001'])
+        with self.assertRaises(ImproperlyConfigured):
+            require_shared_caches()
+
+    @override_settings(RECIPES_WORKERS=4, CACHES={'default': SHARED, 'api': LOCMEM})
+    def test_response_cache_needs_a_shared_cache(self):
+        self.assertEqual([error.id for error in check_shared_caches()], ['recipes.E002'])
+        with self.assertRaises(ImproperlyConfigured):
+            require_shared_caches()
+
+    @override_settings(RECIPES_WORKERS=4, CACHES={'default': SHARED, 'api': SHARED})
+    def test_shared_caches_pass(self):
+        self.assertEqual(check_shared_caches(), [])
+        require_shared_caches()
+
+    @override_settings(RECIPES_WORKERS=1, CACHES={'default': LOCMEM, 'api': SHARED})
+    def test_deploy_warns_about_commands(self):
+        self.assertEqual([warning.id for warning in check_caches_reach_commands()], ['recipes.W001'])
+
+    @override_settings(RECIPES_WORKERS=1, CACHES={'default': LOCMEM, 'api': LOCMEM})
+    def test_deploy_warns_about_both_caches(self):
+        self.assertEqual([warning.id for warning in check_caches_reach_commands()], ['recipes.W001', 'recipes.W002'])
@@ -0,0 +1,72 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from recipes.db import ReadReplicaRouter, read_from_replica, replica_path, use_primary
+from recipes.middleware import ReadReplicaMiddleware
+from recipes.models import Recipe
+
+
+class SqlitePragmaTests(TestCase):
+
+    def test_pragmas_applied(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA cache_size')
+            self.assertEqual(cursor.fetchone()[0], -64 * 1024)
+
+
+@override_settings(RECIPES_READ_REPLICAS=['replica_1'])
+class ReadReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.router = ReadReplicaRouter()
+        patcher = mock.patch('recipes.db.connections', {'default': mock.Mock(in_atomic_block=False)})
+        self.connections = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads(self):
+        self.assertIsNone(self.router.db_for_read(Recipe))
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_read(Recipe), 'replica_1')
+            # Only the recipes app is replicated
+            self.assertIsNone(self.router.db_for_read(User))
+            with use_primary():
+                self.assertIsNone(self.router.db_for_read(Recipe))
+        with read_from_replica(enabled=False):
+            self.assertIsNone(self.router.db_for_read(Recipe))
+
+    def test_reads_in_a_transaction_stay_on_the_primary(self):
+        self.connections['default'].in_atomic_block = True
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_read(Recipe), 'default')
+
+    def test_writes_go_to_the_primary(self):
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_write(Recipe), 'default')
+        self.assertFalse(self.router.allow_migrate('replica_1', 'recipes'))
+        self.assertIsNone(self.router.allow_migrate('default', 'recipes'))
+
+    def test_middleware_uses_replica_for_safe_api_requests(self):
+        seen = []
+        middleware = ReadReplicaMiddleware(lambda request: seen.append(self.router.db_for_read(Recipe)))
+        factory = RequestFactory()
+        for request in (factory.get('/api/recipes/'), factory.post('/api/recipes/'), factory.get('/admin/')):
+            middleware(request)
+        self.assertEqual(seen, ['replica_1', None, None])
+
+
+class ReplicaPathTests(SimpleTestCase):
+
+    def test_file_uri(self):
+        with mock.patch('recipes.db.connections', mock.Mock(databases={'replica_1': {'NAME': 'file:/srv/replica.sqlite3?mode=ro'}})):
+            self.assertEqual(replica_path('replica_1'), '/srv/replica.sqlite3')
+
+    @override_settings(RECIPES_READ_REPLICAS=[])
+    def test_snapshot_needs_replicas(self):
+        with self.assertRaisesMessage(CommandError, 'No read replicas configured'):
+            call_command('snapshot_replicas')
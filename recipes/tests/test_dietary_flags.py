@@ -0,0 +1,45 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import F
+
+from recipes.models import DIETARY_BITS, Recipe, packed_dietary_flags
+
+from .base import CatalogTestCase
+
+
+class DietaryFlagsTests(CatalogTestCase):
+
+    def assertPacked(self):
+        self.assertFalse(Recipe.objects.exclude(dietary_flags=packed_dietary_flags()).exists())
+
+    def test_imported_recipes_are_packed(self):
+        self.assertPacked()
+
+    def test_save_packs_flags(self):
+        recipe = Recipe.objects.filter(is_vegan=False).first()
+        recipe.is_vegan = True
+        recipe.save(update_fields=['is_vegan'])
+        recipe.refresh_from_db()
+        self.assertTrue(recipe.dietary_flags & DIETARY_BITS['is_vegan'])
+        self.assertPacked()
+
+    def test_filter_matches_boolean_columns(self):
+        for fields in (['is_vegetarian'], ['is_vegan', 'is_gluten_free'], list(DIETARY_BITS)):
+            with self.subTest(fields=fields):
+                self.assertCountEqual(
+                    Recipe.objects.with_dietary_flags(*fields).values_list('pk', flat=True),
+                    Recipe.objects.filter(**{field: True for field in fields}).values_list('pk', flat=True),
+                )
+
+    def test_list_filter(self):
+        response = self.client.get('/api/recipes/', {'vegan': 'true', 'gluten_free': 'true'})
+        self.assertEqual(response.json()['count'], Recipe.objects.filter(is_vegan=True, is_gluten_free=True).count())
+
+    def test_repair_after_bulk_update(self):
+        Recipe.objects.update(is_gluten_free=~F('is_gluten_free'))
+        self.assertTrue(Recipe.objects.exclude(dietary_flags=packed_dietary_flags()).exists())
+        out = StringIO()
+        call_command('repair_dietary_flags', stdout=out)
+        self.assertIn(f'Repaired {Recipe.objects.count()} recipes', out.getvalue())
+        self.assertPacked()
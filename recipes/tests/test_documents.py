@@ -0,0 +1,41 @@
+import json
+from unittest import mock
+
+from recipes import documents
+from recipes.models import Recipe, RecipeDocument
+from recipes.serializers import RecipeStepSerializer
+
+from .base import CatalogTestCase
+
+
+class SchemaVersionTests(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        documents.schema_version.cache_clear()
+        self.addCleanup(documents.schema_version.cache_clear)
+
+    def test_stored_document_matches_the_serializer(self):
+        recipe = Recipe.objects.with_detail_relations().order_by('pk').first()
+        content, _ = documents.stored_document(recipe.slug)
+        self.assertEqual(json.loads(content), json.loads(documents.render_json(recipe)))
+
+    def test_nested_serializer_change_moves_the_version(self):
+        before = documents.schema_version()
+        documents.schema_version.cache_clear()
+        with mock.patch.object(RecipeStepSerializer.Meta, 'fields', ['step_number', 'instruction']):
+            self.assertNotEqual(documents.schema_version(), before)
+
+    def test_document_schema_constant_moves_the_version(self):
+        before = documents.schema_version()
+        documents.schema_version.cache_clear()
+        with mock.patch.object(documents, 'DOCUMENT_SCHEMA', documents.DOCUMENT_SCHEMA + 1):
+            self.assertNotEqual(documents.schema_version(), before)
+
+    def test_documents_of_another_schema_are_not_served(self):
+        recipe = Recipe.objects.order_by('pk').first()
+        RecipeDocument.objects.update(schema_version='stale')
+        self.assertIsNone(documents.stored_document(recipe.slug))
+        response = self.client.get(f'/api/recipes/{recipe.slug}/')
+        expected = documents.render_json(Recipe.objects.with_detail_relations().get(pk=recipe.pk))
+        self.assertEqual(response.json(), json.loads(expected))
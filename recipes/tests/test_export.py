@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from recipes.models import Recipe
+
+from .base import CatalogTestCase
+
+
+class ExportTests(CatalogTestCase):
+
+    def export(self, **params):
+        response = self.client.get('/api/export/recipes/', params)
+        return response, [json.loads(line) for line in b''.join(response.streaming_content).splitlines() if line]
+
+    def test_full_export(self):
+        response, documents = self.export()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(documents), Recipe.objects.count())
+
+    def test_updated_since(self):
+        recipe = Recipe.objects.order_by('pk').first()
+        since = timezone.now()
+        Recipe.objects.filter(pk=recipe.pk).update(updated_at=since)
+        _, documents = self.export(updated_since=since.isoformat())
+        self.assertEqual([document['slug'] for document in documents], [recipe.slug])
+
+    def test_invalid_updated_since(self):
+        for value in ('yesterday', '2026-13-45T00:00:00Z', '2026-01-01T00:00:00'):
+            with self.subTest(value=value):
+                response = self.client.get('/api/export/recipes/', {'updated_since': value})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('updated_since', response.json())
+
+    def test_command(self):
+        recipe = Recipe.objects.order_by('pk').first()
+        since = timezone.now()
+        Recipe.objects.filter(pk=recipe.pk).update(updated_at=since)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'export.ndjson')
+            call_command('export_recipes', path, updated_since=since.isoformat(), stdout=StringIO())
+            with open(path) as handle:
+                self.assertEqual([json.loads(line)['slug'] for line in handle], [recipe.slug])
+
+    def test_command_invalid_updated_since(self):
+        for value in ('yesterday', '2026-13-45T00:00:00Z', '2026-01-01T00:00:00'):
+            with self.subTest(value=value), self.assertRaisesMessage(CommandError, 'time zone'):
+                call_command('export_recipes', os.devnull, updated_since=value)
@@ -0,0 +1,63 @@
+from django.db.models import Count
+
+from recipes.models import Recipe
+
+from .base import CatalogTestCase
+
+
+class RecipeFacetsTests(CatalogTestCase):
+
+    def facets(self, **params):
+        response = self.client.get('/api/facets/recipes/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def category_counts(self, recipes):
+        return dict(recipes.values_list('category__name').annotate(count=Count('pk')))
+
+    def difficulty_counts(self, recipes):
+        return {value: recipes.filter(difficulty=value).count() for value, _ in Recipe.DIFFICULTY_CHOICES}
+
+    def test_unfiltered(self):
+        with self.assertNumQueries(1):
+            data = self.facets()
+        self.assertEqual(data['total'], Recipe.objects.count())
+        self.assertEqual({entry['name']: entry['count'] for entry in data['categories']},
+                         self.category_counts(Recipe.objects.all()))
+        self.assertEqual([entry['count'] for entry in data['max_time']],
+                         [Recipe.objects.filter(total_time__lte=entry['value']).count() for entry in data['max_time']])
+        self.assertEqual([entry['count'] for entry in data['dietary']],
+                         [Recipe.objects.filter(**{field: True}).count()
+                          for field in ('is_vegetarian', 'is_vegan', 'is_gluten_free')])
+
+    def test_facets_ignore_their_own_filter(self):
+        recipe = Recipe.objects.select_related('category').order_by('pk').first()
+        category, difficulty = recipe.category.name, recipe.difficulty
+        with self.assertNumQueries(3):
+            data = self.facets(category=category, difficulty=difficulty)
+
+        in_category = Recipe.objects.filter(category__name__icontains=category)
+        with_difficulty = Recipe.objects.filter(difficulty=difficulty)
+        self.assertEqual(data['total'], in_category.filter(difficulty=difficulty).count())
+        self.assertEqual({entry['name']: entry['count'] for entry in data['categories']},
+                         self.category_counts(with_difficulty))
+        self.assertEqual({entry['value']: entry['count'] for entry in data['difficulty']},
+                         self.difficulty_counts(in_category))
+        self.assertEqual([entry['count'] for entry in data['max_time']],
+                         [in_category.filter(difficulty=difficulty, total_time__lte=entry['value']).count()
+                          for entry in data['max_time']])
+
+    def test_dietary_counts_refine(self):
+        data = self.facets(vegetarian='true')
+        vegetarian = Recipe.objects.filter(is_vegetarian=True)
+        self.assertEqual(data['total'], vegetarian.count())
+        self.assertEqual([entry['count'] for entry in data['dietary']], [
+            vegetarian.count(), vegetarian.filter(is_vegan=True).count(), vegetarian.filter(is_gluten_free=True).count(),
+        ])
+
+    def test_with_search(self):
+        category = Recipe.objects.select_related('category').order_by('pk').first().category.name
+        searched = self.facets(search=category.lower())
+        data = self.facets(search=category.lower(), category=category)
+        self.assertEqual(data['categories'], searched['categories'])
+        self.assertLessEqual(data['total'], searched['total'])
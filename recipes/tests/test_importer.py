@@ -0,0 +1,45 @@
+from django.core.cache import caches
+from django.test import TestCase
+
+from recipes import stats
+from recipes.importer import RecipeImporter
+from recipes.models import Category, Recipe, RecipeDocument
+from recipes.response_cache import CATALOG_VERSION_KEY, get_cache
+from recipes.synthetic import generate_records
+
+
+def failing_after(records, count):
+    for number, record in enumerate(records):
+        if number == count:
+            raise RuntimeError('feed broke')
+        yield record
+
+
+class RecipeImporterTests(TestCase):
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+
+    def test_import_builds_derived_data(self):
+        RecipeImporter(batch_size=10).run(generate_records(25, seed=3))
+        self.assertEqual(Recipe.objects.count(), 25)
+        self.assertEqual(RecipeDocument.objects.count(), 25)
+        self.assertEqual(stats.get_stats()['total_recipes'], 25)
+        self.assertEqual(sum(Category.objects.values_list('recipe_count', flat=True)), 25)
+
+    def test_rerun_skips_existing_recipes(self):
+        RecipeImporter().run(generate_records(5, seed=3))
+        importer = RecipeImporter()
+        importer.run(generate_records(5, seed=3))
+        self.assertEqual((importer.created, importer.skipped), (0, 5))
+
+    def test_failure_still_finishes_committed_chunks(self):
+        version = get_cache().get(CATALOG_VERSION_KEY)
+        importer = RecipeImporter(batch_size=10)
+        with self.assertRaises(RuntimeError):
+            importer.run(failing_after(generate_records(25, seed=3), 20))
+        self.assertEqual(importer.created, 20)
+        self.assertEqual(stats.get_stats()['total_recipes'], 20)
+        self.assertEqual(sum(Category.objects.values_list('recipe_count', flat=True)), 20)
+        self.assertNotEqual(get_cache().get(CATALOG_VERSION_KEY), version)
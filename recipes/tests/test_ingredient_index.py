@@ -0,0 +1,55 @@
+from django.db.models import Q
+from django.test import SimpleTestCase
+
+from recipes.ingredient_index import SuffixTable, ingredient_index
+from recipes.models import Ingredient, Recipe, RecipeIngredient
+
+from .base import CatalogTestCase
+
+
+class SuffixTableTests(SimpleTestCase):
+
+    def test_containing(self):
+        table = SuffixTable(['olive oil', 'oil', 'oats', 'coconut milk'])
+        self.assertEqual(table.containing('oil'), {'olive oil', 'oil'})
+        self.assertEqual(table.containing('o'), {'olive oil', 'oil', 'oats', 'coconut milk'})
+        self.assertEqual(table.containing('milk'), {'coconut milk'})
+        self.assertEqual(table.containing('rice'), set())
+
+    def test_add_and_remove(self):
+        table = SuffixTable(['oil'])
+        table.add('soil')
+        self.assertEqual(table.containing('oil'), {'oil', 'soil'})
+        table.remove('oil')
+        self.assertEqual(table.containing('oil'), {'soil'})
+        self.assertEqual(len(table.suffixes), len('soil'))
+
+
+class IngredientIndexTests(CatalogTestCase):
+
+    def assertMatchesOrm(self, term):
+        expected = set(Recipe.objects.filter(
+            Q(recipe_ingredients__ingredient__name__icontains=term) |
+            Q(name__icontains=term) |
+            Q(description__icontains=term)
+        ).values_list('pk', flat=True))
+        ingredient_index.ensure_built()
+        self.assertEqual(ingredient_index.match(term), expected, term)
+
+    def test_matches_icontains(self):
+        for term in ('oil', 'OLIVE', 'ea', 'nut', 'zzz'):
+            self.assertMatchesOrm(term)
+
+    def test_incremental_update(self):
+        ingredient_index.ensure_built()
+        recipe = Recipe.objects.order_by('pk').first()
+        ingredient = Ingredient.objects.create(name='Sumac Zzyzx')
+        with self.captureOnCommitCallbacks(execute=True):
+            RecipeIngredient.objects.create(recipe=recipe, ingredient=ingredient, quantity='1 tsp')
+        self.assertEqual(ingredient_index.match('zzyz'), {recipe.pk})
+        self.assertEqual(ingredient_index.recipes_with_ingredient('sumac'), {recipe.pk})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.delete()
+        self.assertEqual(ingredient_index.match('zzyz'), set())
+        self.assertMatchesOrm('oil')
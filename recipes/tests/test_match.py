@@ -0,0 +1,27 @@
+from unittest import skipIf
+
+from recipes.nutrition import np
+
+from .base import CatalogTestCase
+
+
+@skipIf(np is None, 'Recipe matching requires NumPy.')
+class MatchRecipesTests(CatalogTestCase):
+
+    def match(self, **params):
+        return self.client.get('/api/match/recipes/', {'target_calories': 1800, **params})
+
+    def test_ranked_by_distance(self):
+        response = self.match(meals_per_day=3, limit=5)
+        self.assertEqual(response.status_code, 200)
+        distances = [result['distance'] for result in response.json()['results']]
+        self.assertEqual(len(distances), 5)
+        self.assertEqual(distances, sorted(distances))
+
+    def test_invalid_numbers(self):
+        for params in ({'limit': 'inf'}, {'limit': 'nan'}, {'limit': '2.5'}, {'limit': 0},
+                       {'target_calories': 'nan'}, {'max_time': 'inf'}, {'meals_per_day': '-inf'}):
+            with self.subTest(params=params):
+                response = self.match(**params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(list(response.json()), list(params))
@@ -0,0 +1,118 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import mock, skipIf
+
+from django.test import SimpleTestCase
+
+from recipes import meal_plans
+from recipes.meal_optimizer import optimize_plan
+from recipes.meal_plans import MealPlanUnavailable
+from recipes.nutrition import np
+
+from .base import CatalogTestCase
+
+
+def thread_pool(pending):
+    """Run plans in threads, so tests need no worker processes"""
+    return mock.patch.multiple(meal_plans, _executor=ThreadPoolExecutor(2), _slots=threading.BoundedSemaphore(pending))
+
+
+def process_pool(method):
+    executor = ProcessPoolExecutor(1, mp_context=multiprocessing.get_context(method))
+    return executor, mock.patch.multiple(meal_plans, _executor=executor, _slots=threading.BoundedSemaphore(2))
+
+
+def crash(*args):
+    os._exit(1)
+
+
+@skipIf(np is None, 'Meal planning requires NumPy.')
+class OptimizePlanTests(SimpleTestCase):
+
+    def test_stops_once_converged(self):
+        rng = np.random.default_rng(1)
+        columns = {'calories': rng.uniform(100, 900, 200), 'protein': rng.uniform(5, 60, 200)}
+        started = time.perf_counter()
+        plan = optimize_plan(columns, {'calories': 1800, 'protein': 90}, days=7, meals_per_day=3, time_budget=30)
+        self.assertLess(time.perf_counter() - started, 5)
+        self.assertEqual([len(meals) for meals in plan], [3] * 7)
+        picked = [index for meals in plan for index in meals]
+        self.assertEqual(len(picked), len(set(picked)))
+
+
+class SubmitTests(SimpleTestCase):
+
+    def test_bounds_jobs_in_flight(self):
+        release = threading.Event()
+        with thread_pool(pending=1):
+            future = meal_plans.submit(release.wait)
+            with self.assertRaises(MealPlanUnavailable):
+                meal_plans.submit(release.wait)
+            release.set()
+            future.result()
+            meal_plans.submit(int).result()
+
+    @skipIf(np is None, 'Meal planning requires NumPy.')
+    def test_spawned_workers(self):
+        # A spawned worker imports the optimizer without django.setup()
+        executor, patch = process_pool('spawn')
+        columns = {'calories': np.array([400.0, 600.0, 800.0])}
+        with patch:
+            plan = meal_plans.submit(optimize_plan, columns, {'calories': 1000}, 1, 2, 0.1).result(timeout=60)
+        executor.shutdown()
+        self.assertCountEqual(plan[0], [0, 1])
+
+    def test_broken_pool_is_replaced(self):
+        executor, patch = process_pool('fork')
+        with patch:
+            future = meal_plans.submit(crash)
+            with self.assertRaises(meal_plans.BrokenProcessPool):
+                future.result(timeout=30)
+            deadline = time.monotonic() + 5
+            while meal_plans._executor is executor and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertIsNone(meal_plans._executor)
+            with mock.patch.object(meal_plans, 'ProcessPoolExecutor', lambda max_workers: ThreadPoolExecutor(max_workers)):
+                self.assertEqual(meal_plans.submit(int, 3).result(), 3)
+            self.assertEqual(meal_plans._slots._value, 2)
+
+    def test_submit_to_broken_pool(self):
+        executor, patch = process_pool('fork')
+        with patch:
+            with self.assertRaises(meal_plans.BrokenProcessPool):
+                executor.submit(crash).result(timeout=30)
+            with self.assertRaises(MealPlanUnavailable):
+                meal_plans.submit(int)
+            self.assertIsNone(meal_plans._executor)
+
+
+@skipIf(np is None, 'Meal planning requires NumPy.')
+class MealPlanViewTests(CatalogTestCase):
+
+    def test_plan(self):
+        with thread_pool(pending=2):
+            response = self.client.get('/api/meal-plans/', {'target_calories': 1800, 'days': 2, 'meals_per_day': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([len(day['recipes']) for day in response.json()['days']], [2, 2])
+
+    def test_broken_pool(self):
+        with process_pool('fork')[1], mock.patch.object(meal_plans, 'optimize_plan', crash):
+            response = self.client.get('/api/meal-plans/', {'target_calories': 1800})
+        self.assertEqual(response.status_code, 503)
+
+    def test_busy(self):
+        with thread_pool(pending=1):
+            meal_plans._slots.acquire()
+            response = self.client.get('/api/meal-plans/', {'target_calories': 1800})
+        self.assertEqual(response.status_code, 503)
+
+    def test_invalid_params(self):
+        for params in ({'days': 0}, {'days': 'inf'}, {'days': 'nan'}, {'days': 15}, {'days': '2.5'},
+                       {'meals_per_day': 0}, {'meals_per_day': 'inf'}, {'seed': 'nan'}, {'seed': -1}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/meal-plans/', {'target_calories': 1800, **params})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(list(response.json()), list(params))
@@ -0,0 +1,34 @@
+import importlib
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import clear_url_caches
+
+from fast_health_api import urls
+
+
+class MetricsEndpointTests(SimpleTestCase):
+
+    def route_metrics(self, **settings):
+        """Rebuild the root URLconf under the given settings"""
+        with override_settings(**settings):
+            importlib.reload(urls)
+        clear_url_caches()
+        self.addCleanup(clear_url_caches)
+        self.addCleanup(importlib.reload, urls)
+
+    def test_not_routed_by_default(self):
+        self.route_metrics(DEBUG=False, RECIPES_METRICS_ENABLED=False)
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+    def test_enabled(self):
+        self.route_metrics(DEBUG=False, RECIPES_METRICS_ENABLED=True)
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+
+    @override_settings(RECIPES_METRICS_TOKEN='s3cret')
+    def test_token(self):
+        self.route_metrics(DEBUG=False, RECIPES_METRICS_ENABLED=True)
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret').status_code, 200)
@@ -0,0 +1,58 @@
+import json
+from base64 import b64encode
+from urllib.parse import parse_qs, urlsplit
+
+from recipes.models import Recipe
+
+from .base import CatalogTestCase
+
+
+def cursor_of(link):
+    return parse_qs(urlsplit(link).query)['cursor'][0]
+
+
+def make_cursor(**payload):
+    return b64encode(json.dumps(payload).encode()).decode()
+
+
+class KeysetPaginationTests(CatalogTestCase):
+
+    def get(self, **params):
+        return self.client.get('/api/recipes/', {'pagination': 'cursor', **params})
+
+    def test_walks_every_recipe_once(self):
+        for ordering in ('-created_at', 'total_time', 'name'):
+            with self.subTest(ordering=ordering):
+                slugs, params = [], {'ordering': ordering}
+                while True:
+                    data = self.get(**params).json()
+                    slugs += [recipe['slug'] for recipe in data['results']]
+                    if not data['next']:
+                        break
+                    params['cursor'] = cursor_of(data['next'])
+                self.assertEqual(len(slugs), len(set(slugs)))
+                self.assertCountEqual(slugs, Recipe.objects.values_list('slug', flat=True))
+
+    def test_previous_page(self):
+        first = self.get(ordering='total_time').json()
+        second = self.get(ordering='total_time', cursor=cursor_of(first['next'])).json()
+        back = self.get(ordering='total_time', cursor=cursor_of(second['previous'])).json()
+        self.assertEqual(back['results'], first['results'])
+
+    def test_cursor_of_another_ordering(self):
+        first = self.get(ordering='total_time').json()
+        response = self.get(ordering='name', cursor=cursor_of(first['next']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_malformed_cursors(self):
+        for ordering, cursor in [
+            ('total_time', 'garbage'),
+            ('total_time', b64encode(b'[1, 2]').decode()),
+            ('total_time', make_cursor(v=5, id=1)),
+            ('total_time', make_cursor(o='total_time', v='abc', id=1)),
+            ('total_time', make_cursor(o='total_time', v=None, id=1)),
+            ('total_time', make_cursor(o='total_time', v=5, id='x')),
+            ('-created_at', make_cursor(o='-created_at', v='2026-13-45T00:00:00Z', id=1)),
+        ]:
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.get(ordering=ordering, cursor=cursor).status_code, 404)
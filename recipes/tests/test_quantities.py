@@ -0,0 +1,45 @@
+from django.test import SimpleTestCase
+
+from recipes.quantities import parse_quantity
+
+
+class ParseQuantityTests(SimpleTestCase):
+
+    def assertParses(self, cases):
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(parse_quantity(text), expected)
+
+    def test_numbers(self):
+        self.assertParses([
+            ('2', (2.0, '')),
+            ('1.5 cups', (1.5, 'cup')),
+            ('1/2 cup', (0.5, 'cup')),
+            ('1 1/2 cups', (1.5, 'cup')),
+            ('1-1/2 cups', (1.5, 'cup')),
+            ('1½ cups', (1.5, 'cup')),
+            ('200g', (200.0, 'g')),
+            ('1 kg', (1000.0, 'g')),
+            ('to taste', (None, '')),
+            ('', (None, '')),
+        ])
+
+    def test_ranges_take_the_larger_end(self):
+        self.assertParses([
+            ('2-3 tbsp', (3.0, 'tbsp')),
+            ('3-2 tbsp', (3.0, 'tbsp')),
+            ('1 to 2 cups', (2.0, 'cup')),
+            ('1/2-3/4 cup', (0.75, 'cup')),
+        ])
+
+    def test_units(self):
+        self.assertParses([
+            ('1 medium, diced', (1.0, '')),
+            ('2 large', (2.0, '')),
+            ('1 gallon', (1.0, 'gallon')),
+            ('2 sprigs', (2.0, 'sprig')),
+            ('1 stick', (1.0, 'stick')),
+            ('1 package', (1.0, 'package')),
+            ('3 Stalks.', (3.0, 'stalks')),
+            ('1 tomato', (1.0, 'tomato')),
+        ])
@@ -0,0 +1,75 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from recipes.models import Recipe
+from recipes.pagination import RecipePageNumberPagination
+
+from .base import CatalogTestCase
+
+
+class QueryCountTests(CatalogTestCase):
+    """
+    The read endpoints run a fixed number of queries however many rows
+    they return; a serializer touching an unprefetched relation shows up
+    here as a count growing with the page size.
+    """
+
+    def get(self, url, queries):
+        with self.assertNumQueries(queries):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def test_recipe_list(self):
+        # COUNT, the page joined to its category, then the tags prefetch
+        response = self.get('/api/recipes/', 3)
+        self.assertEqual(len(response.json()['results']), 20)
+
+    def test_recipe_list_page_size_does_not_matter(self):
+        counts = []
+        for page_size in (5, 40):
+            caches['api'].clear()
+            with mock.patch.object(RecipePageNumberPagination, 'page_size', page_size), \
+                    CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/recipes/')
+            self.assertEqual(len(response.json()['results']), page_size)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_recipe_list_filtered(self):
+        self.get('/api/recipes/?vegetarian=true&max_time=60&ordering=total_time', 3)
+
+    def test_recipe_detail_from_stored_document(self):
+        recipe = Recipe.objects.order_by('pk').first()
+        response = self.get(f'/api/recipes/{recipe.slug}/', 1)
+        self.assertEqual(response.json()['slug'], recipe.slug)
+
+    def test_recipe_detail_serialized(self):
+        # A sparse fieldset bypasses the stored document
+        recipe = Recipe.objects.order_by('pk').first()
+        response = self.get(f'/api/recipes/{recipe.slug}/?fields=name,recipe_ingredients,steps,tags', 4)
+        self.assertEqual(set(response.json()), {'name', 'recipe_ingredients', 'steps', 'tags'})
+
+    def test_categories(self):
+        self.get('/api/categories/', 1)
+
+    def test_ingredients(self):
+        self.get('/api/ingredients/', 2)
+
+    def test_stats(self):
+        # The stats record, then the category counters
+        response = self.get('/api/stats/', 2)
+        self.assertEqual(response.json()['total_recipes'], self.catalog_size)
+
+    def test_featured(self):
+        response = self.get('/api/featured/', 2)
+        self.assertEqual(len(response.json()), 5)
+
+    def test_cached_response_runs_no_queries(self):
+        self.client.get('/api/recipes/')
+        self.get('/api/recipes/', 0)
+        caches['api'].clear()
+        self.get('/api/recipes/', 3)
@@ -0,0 +1,45 @@
+from unittest import mock
+
+from django.apps import apps
+
+from recipes import search, signals
+from recipes.models import Recipe
+
+from .base import CatalogTestCase
+
+
+class FullTextSearchTests(CatalogTestCase):
+
+    def search(self, query):
+        response = self.client.get('/api/recipes/', {'search': query})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_matches_word_prefixes_across_fields(self):
+        recipe = Recipe.objects.order_by('pk').first()
+        prefix = recipe.name.split()[1].lower()[:4]
+        results = self.search(prefix)
+        expected = Recipe.objects.filter(search_document__document__match=f'"{prefix}"*')
+        self.assertEqual(results['count'], expected.count())
+        self.assertTrue(expected.filter(pk=recipe.pk).exists())
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.search('zzzzunknown')['count'], 0)
+
+    def test_relevance_order_unless_ordering_is_given(self):
+        ranked = self.client.get('/api/recipes/', {'search': 'the'}).json()['results']
+        by_name = self.client.get('/api/recipes/', {'search': 'the', 'ordering': 'name'}).json()['results']
+        self.assertEqual([recipe['name'] for recipe in by_name], sorted(recipe['name'] for recipe in by_name))
+        self.assertCountEqual(
+            [recipe['id'] for recipe in ranked],
+            list(Recipe.objects.filter(search_document__document__match='"the"*')
+                 .annotate(rank=search.BM25('search_document__document'))
+                 .order_by('rank', '-created_at').values_list('pk', flat=True)[:20]),
+        )
+
+    def test_search_table_is_created_on_the_migrated_database(self):
+        replica = mock.Mock(vendor='sqlite')
+        with mock.patch('recipes.search.create_table') as create_table, \
+                mock.patch.object(signals, 'connections', {'replica': replica}):
+            signals.create_search_table(sender=apps.get_app_config('recipes'), using='replica')
+        create_table.assert_called_once_with('replica')
@@ -0,0 +1,30 @@
+import json
+
+from recipes.models import Ingredient, Recipe, RecipeIngredient
+
+from .base import CatalogTestCase
+
+
+class ShoppingListTests(CatalogTestCase):
+
+    def test_sums_amounts_per_unit(self):
+        first, second = Recipe.objects.order_by('pk')[:2]
+        oil = Ingredient.objects.create(name='Test oil')
+        RecipeIngredient.objects.create(recipe=first, ingredient=oil, quantity='1-1/2 tbsp')
+        RecipeIngredient.objects.create(recipe=second, ingredient=oil, quantity='1 tbsp')
+        RecipeIngredient.objects.create(recipe=second, ingredient=Ingredient.objects.create(name='Test salt'), quantity='to taste')
+
+        response = self.client.get('/api/shopping-list/', {'recipes': f'{first.slug}:2,{second.slug},nope'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['missing'], ['nope'])
+        items = {item['ingredient']['name']: item for item in data['items']}
+        self.assertEqual((items['Test oil']['amount'], items['Test oil']['unit']), (4.0, 'tbsp'))
+        self.assertEqual((items['Test salt']['amount'], items['Test salt']['unmeasured']), (None, 1))
+
+    def test_invalid_requests(self):
+        slug = Recipe.objects.values_list('slug', flat=True).first()
+        for body in ([slug], 'recipes', {'recipes': [slug]}, {'recipes': {slug: 'nan'}}, {'recipes': {slug: 0}}, {'recipes': {}}):
+            with self.subTest(body=body):
+                response = self.client.post('/api/shopping-list/', json.dumps(body), content_type='application/json')
+                self.assertEqual(response.status_code, 400)
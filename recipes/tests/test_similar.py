@@ -0,0 +1,35 @@
+from unittest import skipIf
+
+from recipes.models import Recipe
+from recipes.similarity import np, similarity_index
+
+from .base import CatalogTestCase
+
+
+@skipIf(np is None, 'Similar recipes require NumPy.')
+class SimilarRecipesTests(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # The first recipe with a near neighbour in the small catalog
+        self.recipe = next(recipe for recipe in Recipe.objects.order_by('pk') if similarity_index.similar(recipe.pk))
+        self.url = f'/api/recipes/{self.recipe.slug}/similar/'
+
+    def test_similar(self):
+        response = self.client.get(self.url, {'limit': 3})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()
+        self.assertTrue(0 < len(results) <= 3)
+        self.assertNotIn(self.recipe.slug, [result['slug'] for result in results])
+        scores = [result['similarity'] for result in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_unknown_recipe(self):
+        self.assertEqual(self.client.get('/api/recipes/nope/similar/').status_code, 404)
+
+    def test_invalid_limit(self):
+        for limit in ('-1', '0', '0.5', 'inf', 'nan', 'ten'):
+            with self.subTest(limit=limit):
+                response = self.client.get(self.url, {'limit': limit})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(list(response.json()), ['limit'])
@@ -0,0 +1,67 @@
+import datetime
+import decimal
+import uuid
+
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+
+from recipes.models import Recipe
+from recipes.renderers import FastJSONRenderer, orjson
+from recipes.serializers import RecipeListSerializer
+
+from .base import CatalogTestCase
+
+
+class FastJSONRendererTests(SimpleTestCase):
+
+    def test_same_bytes_as_json_renderer(self):
+        samples = [
+            {'name': 'Açaí bowl 🍓', 'calories': 410, 'protein': 12.5, 'tags': ['vegan', 'quick']},
+            {'created_at': datetime.datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc)},
+            {'date': datetime.date(2026, 1, 2), 'price': decimal.Decimal('1.10'), 'id': uuid.UUID(int=7)},
+            {'big': 10 ** 16 + 0.0, 'small': 0.00001, 'huge_int': 2 ** 70, 'negative': -0.5},
+            {'text': 'line\u2028break\u2029end', 'quote': '"</script>"', 'none': None, 'flag': True},
+            [1, 'two', [3.0, {'four': 4}]],
+            {1: 'non-string key'},
+        ]
+        for data in samples:
+            with self.subTest(data=data):
+                self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_uses_orjson(self):
+        if orjson is None:
+            self.skipTest('orjson is not installed')
+        content = FastJSONRenderer().render({'a': [1, 2.5, 'x']})
+        self.assertEqual(content, orjson.dumps({'a': [1, 2.5, 'x']}))
+
+
+class SparseFieldsetTests(CatalogTestCase):
+
+    def test_list_fields(self):
+        results = self.client.get('/api/recipes/', {'fields': 'name,slug,category'}).json()['results']
+        self.assertEqual(set(results[0]), {'name', 'slug', 'category'})
+
+    def test_list_omit(self):
+        results = self.client.get('/api/recipes/', {'omit': 'description,tags'}).json()['results']
+        self.assertEqual(set(results[0]), set(RecipeListSerializer.Meta.fields) - {'description', 'tags'})
+
+    def test_detail_fields(self):
+        slug = Recipe.objects.values_list('slug', flat=True).first()
+        data = self.client.get(f'/api/recipes/{slug}/', {'fields': 'name,steps'}).json()
+        self.assertEqual(set(data), {'name', 'steps'})
+
+    def test_unknown_field(self):
+        response = self.client.get('/api/recipes/', {'fields': 'name,bogus'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('bogus', response.json()['fields'])
+
+    def test_sparse_list_skips_the_tags_prefetch(self):
+        # COUNT and the page, without the tags prefetch
+        with self.assertNumQueries(2):
+            self.client.get('/api/recipes/', {'fields': 'name,slug'})
+
+    def test_model_columns(self):
+        self.assertEqual(
+            sorted(RecipeListSerializer.model_columns(['name', 'category', 'tags'])),
+            ['category__name', 'name'],
+        )
@@ -0,0 +1,50 @@
+from django.db.models import Count
+
+from recipes import stats
+from recipes.models import Category, Recipe
+
+from .base import CatalogTestCase
+
+
+class StatsTests(CatalogTestCase):
+
+    def assertMatchesLive(self):
+        payload = self.client.get('/api/stats/').json()
+        live = stats.live_totals()
+        self.assertEqual(payload['total_recipes'], live['total_recipes'])
+        self.assertEqual(payload['categories'], [
+            {'name': name, 'recipe_count': count}
+            for name, count in Category.objects.annotate(count=Count('recipes')).order_by('name').values_list('name', 'count')
+        ])
+
+    def test_initial_totals(self):
+        self.assertMatchesLive()
+
+    def test_recipe_moved_between_categories(self):
+        recipe = Recipe.objects.order_by('pk').first()
+        other = Category.objects.exclude(pk=recipe.category_id).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.category = other
+            recipe.save()
+        self.assertMatchesLive()
+
+    def test_recipe_deleted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Recipe.objects.order_by('pk').first().delete()
+        self.assertMatchesLive()
+
+    def test_category_renamed_and_deleted(self):
+        category = Category.objects.order_by('pk').first()
+        with self.captureOnCommitCallbacks(execute=True):
+            category.name = 'Renamed'
+            category.save()
+        self.assertMatchesLive()
+        with self.captureOnCommitCallbacks(execute=True):
+            category.delete()
+        self.assertMatchesLive()
+
+    def test_stats_record_is_rebuilt_when_missing(self):
+        stats.RecipeStats.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            Recipe.objects.order_by('pk').first().delete()
+        self.assertEqual(stats.RecipeStats.objects.get().total_recipes, self.catalog_size - 1)
@@ -4,8 +4,17 @@ from . import views
 urlpatterns = [
     path('recipes/', views.RecipeListView.as_view(), name='recipe-list'),
     path('recipes/<slug:slug>/', views.RecipeDetailView.as_view(), name='recipe-detail'),
+    path('recipes/<slug:slug>/similar/', views.similar_recipes, name='recipe-similar'),
     path('categories/', views.CategoryListView.as_view(), name='category-list'),
     path('ingredients/', views.IngredientListView.as_view(), name='ingredient-list'),
     path('stats/', views.recipe_stats, name='recipe-stats'),
     path('featured/', views.featured_recipes, name='featured-recipes'),
+    path('batch/recipes/', views.recipe_batch, name='recipe-batch'),
+    path('export/recipes/', views.export_recipes, name='recipe-export'),
+    path('facets/recipes/', views.RecipeFacetsView.as_view(), name='recipe-facets'),
+    path('match/recipes/', views.match_recipes, name='recipe-match'),
+    path('shopping-list/', views.shopping_list, name='shopping-list'),
+    path('meal-plans/', views.meal_plan, name='meal-plan'),
+    path('changes/', views.catalog_changes, name='catalog-changes'),
+    path('autocomplete/', views.autocomplete, name='autocomplete'),
 ]
\ No newline at end of file
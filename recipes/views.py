@@ -1,102 +1,536 @@
+import math
+
 from rest_framework import generics, filters
 from rest_framework.decorators import api_view
+from rest_framework.exceptions import APIException, NotFound, ValidationError
 from rest_framework.response import Response
-from django.db.models import Q, Avg, Count
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, StreamingHttpResponse
+from django.utils.crypto import constant_time_compare
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import require_safe
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Recipe, Category, Ingredient
+from .autocomplete import SOURCES as AUTOCOMPLETE_SECTIONS, autocomplete_index
+from .changes import DEFAULT_LIMIT as CHANGES_LIMIT, MAX_LIMIT as MAX_CHANGES_LIMIT
+from .changes import InvalidSyncToken, SyncTokenExpired, change_feed, decode_token
+from .documents import accepts_gzip, document_response, load_documents, stored_document
+from .export import gzip_stream, iter_documents, parse_updated_since
+from .facets import facet_counts
+from .ingredient_index import ingredient_index
+from .instrumentation import metrics as request_metrics
+from .meal_plans import MACROS, MealPlanUnavailable, generate_meal_plan, plan_document
+from .nutrition import DIETARY_FLAGS, np, nutrition_engine
+from .pagination import RecipeKeysetPagination, RecipePageNumberPagination
+from .renderers import FastJSONRenderer
+from .response_cache import cache_api_response
+from .search import RecipeFullTextSearchFilter
+from .shopping import shopping_list_items
+from .stats import get_stats
+from .similarity import np as similarity_np, similarity_index
 from .serializers import (
     RecipeListSerializer, RecipeDetailSerializer, 
     CategorySerializer, IngredientSerializer
 )
 
+# Dietary query params RecipeListView accepts
+LIST_DIETARY_PARAMS = {
+    'vegetarian': 'is_vegetarian',
+    'vegan': 'is_vegan',
+    'gluten_free': 'is_gluten_free',
+}
+
+def sparse_queryset(queryset, serializer_class, fields, *columns):
+    """Load only the columns a sparse fieldset serializes, plus `columns`; unchanged when fields is None"""
+    if fields is None:
+        return queryset
+    return queryset.only(*serializer_class.model_columns(fields), *columns)
+
+def filter_recipe_list(queryset, params, skip=None):
+    """Apply RecipeListView's filter query params; the facet counts share them and `skip` one"""
+    # Filter by category
+    category = params.get('category', None)
+    if category and category != 'all' and skip != 'category':
+        queryset = queryset.filter(category__name__icontains=category)
+    
+    # Filter by max time
+    max_time = params.get('max_time', None)
+    if max_time and skip != 'max_time':
+        try:
+            queryset = queryset.filter(total_time__lte=int(max_time))
+        except ValueError:
+            pass
+    
+    # Filter by difficulty
+    difficulty = params.get('difficulty', None)
+    if difficulty and skip != 'difficulty':
+        queryset = queryset.filter(difficulty=difficulty)
+    
+    # Filter by ingredients
+    ingredients = params.get('ingredients', None)
+    if ingredients:
+        ingredient_list = [ing.strip() for ing in ingredients.split(',') if ing.strip()]
+        queryset = ingredient_index.filter_queryset(queryset, ingredient_list)
+    
+    # Filter by dietary preferences, served from the packed dietary_flags column
+    return queryset.with_dietary_flags(*[
+        field for param, field in LIST_DIETARY_PARAMS.items() if params.get(param) == 'true'
+    ])
+
+@method_decorator(cache_api_response, name='dispatch')
 class RecipeListView(generics.ListAPIView):
-    queryset = Recipe.objects.all()
+    queryset = Recipe.objects.with_list_relations()
     serializer_class = RecipeListSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = RecipePageNumberPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, RecipeFullTextSearchFilter]
     search_fields = ['name', 'description', 'category__name']
     ordering_fields = ['created_at', 'total_time', 'calories_per_serving', 'name']
     ordering = ['-created_at']
     
+    @property
+    def paginator(self):
+        """Use keyset pagination when the client opts in with ?pagination=cursor or sends a cursor"""
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if params.get('pagination') == 'cursor' or 'cursor' in params:
+                self._paginator = RecipeKeysetPagination()
+            else:
+                self._paginator = self.pagination_class() if self.pagination_class else None
+        return self._paginator
+    
     def get_queryset(self):
-        queryset = Recipe.objects.select_related('category').all()
-        
-        # Filter by category
-        category = self.request.query_params.get('category', None)
-        if category and category != 'all':
-            queryset = queryset.filter(category__name__icontains=category)
-        
-        # Filter by max time
-        max_time = self.request.query_params.get('max_time', None)
-        if max_time:
-            try:
-                queryset = queryset.filter(total_time__lte=int(max_time))
-            except ValueError:
-                pass
-        
-        # Filter by difficulty
-        difficulty = self.request.query_params.get('difficulty', None)
-        if difficulty:
-            queryset = queryset.filter(difficulty=difficulty)
-        
-        # Filter by ingredients
-        ingredients = self.request.query_params.get('ingredients', None)
-        if ingredients:
-            ingredient_list = [ing.strip() for ing in ingredients.split(',') if ing.strip()]
-            for ingredient in ingredient_list:
-                queryset = queryset.filter(
-                    Q(recipe_ingredients__ingredient__name__icontains=ingredient) |
-                    Q(name__icontains=ingredient) |
-                    Q(description__icontains=ingredient)
-                ).distinct()
-        
-        # Filter by dietary preferences
-        if self.request.query_params.get('vegetarian') == 'true':
-            queryset = queryset.filter(is_vegetarian=True)
-        if self.request.query_params.get('vegan') == 'true':
-            queryset = queryset.filter(is_vegan=True)
-        if self.request.query_params.get('gluten_free') == 'true':
-            queryset = queryset.filter(is_gluten_free=True)
-        
-        return queryset
+        # Sparse fieldsets skip unused relations and columns; the sortable
+        # columns stay loaded for keyset cursors
+        fields = self.get_serializer_class().sparse_fields(self.request.query_params)
+        queryset = sparse_queryset(
+            Recipe.objects.with_list_relations(fields), self.get_serializer_class(), fields, *self.ordering_fields
+        )
+        return filter_recipe_list(queryset, self.request.query_params)
+
+class RecipeFacetsView(RecipeListView):
+    """
+    Counts per category, difficulty, dietary flag and max_time bucket for
+    the recipes RecipeListView would list with the same query params.
+    Category, difficulty and max_time are counted with their own filter
+    left out, one more grouped query each when that filter is set.
+    The cached dispatch is inherited, so the counts expire with the list.
+    """
+    pagination_class = None
+    
+    def get_queryset(self, skip=None):
+        return filter_recipe_list(Recipe.objects.all(), self.request.query_params, skip)
+    
+    def list(self, request, *args, **kwargs):
+        unfiltered = {
+            name: self.filter_queryset(self.get_queryset(skip=name))
+            for name in ('category', 'difficulty', 'max_time') if request.query_params.get(name)
+        }
+        return Response(facet_counts(self.filter_queryset(self.get_queryset()), LIST_DIETARY_PARAMS, unfiltered))
 
+@method_decorator(cache_api_response, name='dispatch')
 class RecipeDetailView(generics.RetrieveAPIView):
-    queryset = Recipe.objects.all()
+    queryset = Recipe.objects.with_detail_relations()
     serializer_class = RecipeDetailSerializer
     lookup_field = 'slug'
+    
+    def get_queryset(self):
+        fields = self.get_serializer_class().sparse_fields(self.request.query_params)
+        return sparse_queryset(Recipe.objects.with_detail_relations(fields), self.get_serializer_class(), fields)
+    
+    def retrieve(self, request, *args, **kwargs):
+        # Serve the materialized document when the client wants the full JSON
+        sparse = self.get_serializer_class().sparse_fields(request.query_params) is not None
+        if request.accepted_renderer.format == 'json' and not sparse:
+            document = stored_document(kwargs[self.lookup_field])
+            if document is not None:
+                return document_response(request, *document)
+        return super().retrieve(request, *args, **kwargs)
 
+@method_decorator(cache_api_response, name='dispatch')
 class CategoryListView(generics.ListAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    # The whole list is small and the client expects a plain array
+    pagination_class = None
+    
+    def get_queryset(self):
+        fields = self.get_serializer_class().sparse_fields(self.request.query_params)
+        return sparse_queryset(super().get_queryset(), self.get_serializer_class(), fields)
 
+@method_decorator(cache_api_response, name='dispatch')
 class IngredientListView(generics.ListAPIView):
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
+    
+    def get_queryset(self):
+        fields = self.get_serializer_class().sparse_fields(self.request.query_params)
+        return sparse_queryset(super().get_queryset(), self.get_serializer_class(), fields)
+
+MAX_BATCH_SIZE = 200
+
+
+@cache_api_response
+@api_view(['GET', 'POST'])
+def recipe_batch(request):
+    """
+    Get many recipe detail documents in one round-trip.
+
+    Pass either `slugs` or `ids`, as a comma separated query param or as a
+    JSON list in a POST body. Results follow the request order; unknown
+    recipes are `null` in `results` and listed in `missing`.
+    """
+    source = request.data if request.method == 'POST' else request.query_params
+    if not isinstance(source, dict):
+        raise ValidationError({'detail': 'Expected a JSON object.'})
+    lookups = [key for key in ('slugs', 'ids') if source.get(key)]
+    if len(lookups) != 1:
+        raise ValidationError({'detail': 'Pass exactly one of "slugs" or "ids".'})
+    lookup = lookups[0]
+
+    values = source.get(lookup)
+    if isinstance(values, str):
+        values = [value.strip() for value in values.split(',') if value.strip()]
+    if not isinstance(values, list):
+        raise ValidationError({lookup: 'Expected a list.'})
+    if len(values) > MAX_BATCH_SIZE:
+        raise ValidationError({lookup: f'At most {MAX_BATCH_SIZE} recipes per request.'})
+    if lookup == 'ids':
+        try:
+            values = [int(value) for value in values]
+        except (TypeError, ValueError):
+            raise ValidationError({'ids': 'Expected integer ids.'})
+    else:
+        values = [str(value) for value in values]
+
+    documents = load_documents('slug' if lookup == 'slugs' else 'pk', list(dict.fromkeys(values)))
+    missing = [value for value in values if value not in documents]
+    # Documents are already rendered JSON, so splice the bytes instead of re-parsing them
+    content = b''.join([
+        b'{"results":[',
+        b','.join(documents.get(value, b'null') for value in values),
+        b'],"missing":',
+        FastJSONRenderer().render(missing),
+        b'}',
+    ])
+    return HttpResponse(content, content_type='application/json')
+
+MAX_MULTIPLIER = 100
+
+
+@cache_api_response
+@api_view(['GET', 'POST'])
+def shopping_list(request):
+    """
+    Ingredient totals for cooking a set of recipes.
+
+    `recipes` maps slugs to servings multipliers: `slug:2,other-slug` as a
+    query param (the multiplier defaults to 1) or a JSON object in a POST
+    body. Amounts are summed per ingredient and unit in the database from
+    the parsed RecipeIngredient quantities; unknown slugs are listed in
+    `missing`.
+    """
+    source = request.data if request.method == 'POST' else request.query_params
+    if not isinstance(source, dict):
+        raise ValidationError({'detail': 'Expected a JSON object.'})
+    entries = source.get('recipes')
+    if isinstance(entries, str):
+        pairs = [entry.strip().partition(':') for entry in entries.split(',') if entry.strip()]
+        entries = [(slug.strip(), value.strip() or 1) for slug, _, value in pairs]
+    elif isinstance(entries, dict):
+        entries = list(entries.items())
+    else:
+        raise ValidationError({'recipes': 'Expected "slug:multiplier" pairs or an object of slug -> multiplier.'})
+    if not entries:
+        raise ValidationError({'recipes': 'Pass at least one recipe.'})
+    if len(entries) > MAX_BATCH_SIZE:
+        raise ValidationError({'recipes': f'At most {MAX_BATCH_SIZE} recipes per request.'})
+
+    multipliers = {}
+    for slug, value in entries:
+        try:
+            multiplier = float(value)
+        except (TypeError, ValueError):
+            raise ValidationError({'recipes': f'Multiplier of "{slug}" is not a number.'})
+        if not 0 < multiplier <= MAX_MULTIPLIER:
+            raise ValidationError({'recipes': f'Multipliers must be above 0 and at most {MAX_MULTIPLIER}.'})
+        # Listing a recipe twice cooks it twice
+        multipliers[str(slug)] = multipliers.get(str(slug), 0) + multiplier
+
+    recipes = Recipe.objects.filter(slug__in=list(multipliers)).values_list('pk', 'slug', 'name')
+    found = {slug: (pk, name) for pk, slug, name in recipes}
+    return Response({
+        'recipes': [
+            {'id': found[slug][0], 'slug': slug, 'name': found[slug][1], 'multiplier': multiplier}
+            for slug, multiplier in multipliers.items() if slug in found
+        ],
+        'missing': [slug for slug in multipliers if slug not in found],
+        'items': shopping_list_items({found[slug][0]: multiplier for slug, multiplier in multipliers.items() if slug in found})
+        if found else [],
+    })
+
+MAX_MATCH_RESULTS = 100
+
+
+class ServiceUnavailable(APIException):
+    status_code = 503
+    default_detail = 'Service temporarily unavailable, try again later.'
+    default_code = 'service_unavailable'
 
+
+class Gone(APIException):
+    status_code = 410
+    default_detail = 'The requested resource is no longer available.'
+    default_code = 'gone'
+
+
+def _float_param(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        value = float(value)
+    except ValueError:
+        raise ValidationError({name: 'Expected a number.'})
+    if not math.isfinite(value):
+        raise ValidationError({name: 'Expected a finite number.'})
+    return value
+
+
+def _int_param(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: 'Expected an integer.'})
+
+
+def _datetime_param(params, name):
+    """An ISO 8601 datetime param with a time zone"""
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    parsed = parse_updated_since(value)
+    if parsed is None:
+        raise ValidationError({name: 'Expected an ISO 8601 datetime with a time zone.'})
+    return parsed
+
+
+@cache_api_response
+@api_view(['GET'])
+def match_recipes(request):
+    """
+    Rank recipes by closeness to a macro target.
+
+    Targets (`target_calories`, `target_protein`, `target_carbs`,
+    `target_fat`) are daily values split across `meals_per_day` (default
+    1). `min_*`/`max_*` bound calories, protein, carbs, fat and fiber,
+    `max_time` bounds the total time and the diet flags work as in the
+    recipe list.
+    """
+    if np is None:
+        raise ServiceUnavailable('Recipe matching requires NumPy.')
+    params = request.query_params
+
+    meals_per_day = _float_param(params, 'meals_per_day') or 1
+    if meals_per_day <= 0:
+        raise ValidationError({'meals_per_day': 'Must be positive.'})
+    targets = {}
+    for name in ('calories', 'protein', 'carbs', 'fat'):
+        value = _float_param(params, f'target_{name}')
+        if value is not None:
+            targets[name] = value / meals_per_day
+    if not targets:
+        raise ValidationError({'detail': 'Pass at least one of target_calories, target_protein, target_carbs or target_fat.'})
+
+    ranges = {}
+    for name in ('calories', 'protein', 'carbs', 'fat', 'fiber'):
+        low, high = _float_param(params, f'min_{name}'), _float_param(params, f'max_{name}')
+        if low is not None or high is not None:
+            ranges[name] = (low, high)
+    max_time = _float_param(params, 'max_time')
+    if max_time is not None:
+        ranges['time'] = (None, max_time)
+    flags = [flag for flag in DIETARY_FLAGS if params.get(flag) == 'true']
+    limit = _int_param(params, 'limit')
+    if limit is None:
+        limit = 20
+    elif limit < 1:
+        raise ValidationError({'limit': 'Must be positive.'})
+    limit = min(limit, MAX_MATCH_RESULTS)
+
+    ids, distances = nutrition_engine.rank(targets, ranges, flags, limit)
+    fields = RecipeListSerializer.sparse_fields(params)
+    recipes = sparse_queryset(Recipe.objects.with_list_relations(fields), RecipeListSerializer, fields).in_bulk(ids)
+    results = []
+    for pk, distance in zip(ids, distances):
+        if pk in recipes:
+            data = RecipeListSerializer(recipes[pk], context={'request': request}).data
+            data['distance'] = round(distance, 4)
+            results.append(data)
+    return Response({'targets': targets, 'results': results})
+
+@cache_api_response
+@api_view(['GET'])
+def meal_plan(request):
+    """
+    Generate a multi-day meal plan from the catalog.
+
+    Takes daily `target_calories`, `target_protein`, `target_carbs` and
+    `target_fat`, `days` (1-14, default 7), `meals_per_day` (1-6, default
+    3), the diet flags of the recipe list, comma separated `allergies` and
+    `dislikes` matched against ingredient names, and an optional `seed`.
+    """
+    params = request.query_params
+    targets = {}
+    for name in MACROS:
+        value = _float_param(params, f'target_{name}')
+        if value is not None:
+            targets[name] = value
+    if not targets:
+        raise ValidationError({'detail': 'Pass at least one of target_calories, target_protein, target_carbs or target_fat.'})
+    days = _int_param(params, 'days')
+    days = 7 if days is None else days
+    meals_per_day = _int_param(params, 'meals_per_day')
+    meals_per_day = 3 if meals_per_day is None else meals_per_day
+    if not 1 <= days <= 14:
+        raise ValidationError({'days': 'Must be between 1 and 14.'})
+    if not 1 <= meals_per_day <= 6:
+        raise ValidationError({'meals_per_day': 'Must be between 1 and 6.'})
+    seed = _int_param(params, 'seed') or 0
+    if seed < 0:
+        raise ValidationError({'seed': 'Must not be negative.'})
+    flags = [flag for flag in DIETARY_FLAGS if params.get(flag) == 'true']
+    avoid = params.get('allergies', '').split(',') + params.get('dislikes', '').split(',')
+
+    try:
+        plan = generate_meal_plan(
+            targets, days=days, meals_per_day=meals_per_day, flags=flags, avoid=avoid,
+            seed=seed,
+        )
+    except MealPlanUnavailable as exc:
+        raise ServiceUnavailable(str(exc))
+    return Response({'targets': targets, 'days': plan_document(plan)})
+
+@cache_api_response
+@api_view(['GET'])
+def similar_recipes(request, slug):
+    """Get the recipes whose ingredients and tags overlap most with this one"""
+    if similarity_np is None:
+        raise ServiceUnavailable('Similar recipes require NumPy.')
+    recipe_id = Recipe.objects.filter(slug=slug).values_list('pk', flat=True).first()
+    if recipe_id is None:
+        raise NotFound()
+    limit = _int_param(request.query_params, 'limit')
+    if limit is None:
+        limit = 10
+    elif limit < 1:
+        raise ValidationError({'limit': 'Must be positive.'})
+    limit = min(limit, MAX_MATCH_RESULTS)
+
+    matches = similarity_index.similar(recipe_id, limit)
+    fields = RecipeListSerializer.sparse_fields(request.query_params)
+    recipes = sparse_queryset(Recipe.objects.with_list_relations(fields), RecipeListSerializer, fields)
+    recipes = recipes.in_bulk([pk for pk, _ in matches])
+    results = []
+    for pk, score in matches:
+        if pk in recipes:
+            data = RecipeListSerializer(recipes[pk], context={'request': request}).data
+            data['similarity'] = round(score, 4)
+            results.append(data)
+    return Response(results)
+
+@cache_api_response
 @api_view(['GET'])
 def recipe_stats(request):
     """Get overall recipe statistics"""
-    stats = {
-        'total_recipes': Recipe.objects.count(),
-        'avg_time_minutes': Recipe.objects.aggregate(avg_time=Avg('total_time'))['avg_time'] or 0,
-        'avg_calories': Recipe.objects.aggregate(avg_cal=Avg('calories_per_serving'))['avg_cal'] or 0,
-        'vegetarian_percentage': 0,
-        'categories': Category.objects.annotate(recipe_count=Count('recipes')).values('name', 'recipe_count')
-    }
-    
-    total_recipes = stats['total_recipes']
-    if total_recipes > 0:
-        vegetarian_count = Recipe.objects.filter(is_vegetarian=True).count()
-        stats['vegetarian_percentage'] = round((vegetarian_count / total_recipes) * 100)
-    
-    # Round averages
-    stats['avg_time_minutes'] = round(stats['avg_time_minutes'])
-    stats['avg_calories'] = round(stats['avg_calories'])
-    
-    return Response(stats)
+    return Response(get_stats())
 
+@cache_api_response
 @api_view(['GET'])
 def featured_recipes(request):
     """Get featured recipes"""
-    recipes = Recipe.objects.filter(is_featured=True)[:8]
-    serializer = RecipeListSerializer(recipes, many=True)
-    return Response(serializer.data)
\ No newline at end of file
+    fields = RecipeListSerializer.sparse_fields(request.query_params)
+    recipes = sparse_queryset(Recipe.objects.with_list_relations(fields), RecipeListSerializer, fields)
+    serializer = RecipeListSerializer(recipes.filter(is_featured=True)[:8], many=True, context={'request': request})
+    return Response(serializer.data)
+
+@api_view(['GET'])
+def export_recipes(request):
+    """Stream the full catalog as NDJSON, one recipe detail document per line"""
+    updated_since = _datetime_param(request.query_params, 'updated_since')
+    lines = iter_documents(updated_since=updated_since)
+    if accepts_gzip(request):
+        response = StreamingHttpResponse(gzip_stream(lines), content_type='application/x-ndjson')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = StreamingHttpResponse(lines, content_type='application/x-ndjson')
+    response['Vary'] = 'Accept-Encoding'
+    return response
+
+@api_view(['GET'])
+def catalog_changes(request):
+    """
+    Sync a local copy of the catalog.
+
+    The first call takes no params and starts sending the whole catalog.
+    Pass the returned `sync_token` as `since` on the next call to get only
+    the recipes, categories, ingredients and tags changed since, plus the
+    ids deleted under `deleted`. Keep calling while `has_more` is true.
+    `updated_since` (an ISO 8601 datetime) can replace `since` for the
+    first incremental call. Tokens older than the tombstone retention get
+    a 410, after which the client starts over without `since`.
+    """
+    params = request.query_params
+    since, since_id = None, None
+    if params.get('since'):
+        try:
+            since, since_id = decode_token(params['since'])
+        except InvalidSyncToken:
+            raise ValidationError({'since': 'Invalid sync token.'})
+    else:
+        since = _datetime_param(params, 'updated_since')
+    limit = _int_param(params, 'limit')
+    if limit is None:
+        limit = CHANGES_LIMIT
+    elif limit < 1:
+        raise ValidationError({'limit': 'Must be positive.'})
+    limit = min(limit, MAX_CHANGES_LIMIT)
+
+    try:
+        return Response(change_feed(since, since_id, limit))
+    except SyncTokenExpired:
+        raise Gone('Sync token expired; sync again without "since".')
+
+@require_safe
+def autocomplete(request):
+    """
+    Suggest recipe, ingredient, category and tag names for a search box.
+
+    `q` matches the start of any word of a name, case and accent
+    insensitively. `types` (comma separated: recipes, ingredients,
+    categories, tags) picks the sections and `limit` (1-20, default 5)
+    caps each. Answered from the in-memory prefix index as a plain Django
+    view, since it is called on every keystroke.
+    """
+    kinds = [kind for kind in request.GET.get('types', '').split(',') if kind in AUTOCOMPLETE_SECTIONS]
+    try:
+        limit = int(request.GET.get('limit') or 5)
+    except ValueError:
+        limit = 5
+    query = request.GET.get('q', '')
+    data = {'query': query, **autocomplete_index.suggest(query, kinds, limit)}
+    return HttpResponse(FastJSONRenderer().render(data), content_type='application/json')
+
+def metrics(request):
+    """
+    Per-endpoint request metrics of this process, in the Prometheus text format.
+
+    Only routed when DEBUG or RECIPES_METRICS_ENABLED is on. When
+    RECIPES_METRICS_TOKEN is set, the scraper must send it as a bearer token.
+    """
+    token = getattr(settings, 'RECIPES_METRICS_TOKEN', None)
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+    return HttpResponse(request_metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')